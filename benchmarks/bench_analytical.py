@@ -0,0 +1,18 @@
+"""Generación de la solución analítica (campo espacio-tiempo completo)."""
+import numpy as np
+from src.physics import analytical_solution
+
+U, DX, DT = 10, 500, 30
+
+class TimeAnalyticalField:
+    """Campo (Nt, Nx) por broadcasting en una sola llamada."""
+    params = [["gauss", "rectg"], [(101, 101), (1000, 1001), (100, 100001)]]
+    param_names = ["profile", "shape"]
+
+    def setup(self, profile, shape):
+        Nt, Nx = shape
+        self.x = np.arange(Nx) * DX
+        self.T = np.arange(Nt) * DT
+
+    def time_field(self, profile, shape):
+        analytical_solution(self.x, self.T, U, DX, len(self.x), profile, 10)
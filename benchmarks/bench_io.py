@@ -0,0 +1,48 @@
+"""Escritura y lectura de NetCDF según el nivel de compresión."""
+import os
+import shutil
+import tempfile
+import numpy as np
+from src.data_handling import EncodingPolicy, create_dataset, load_dataset, save_dataset
+from src.physics import analytical_solution
+
+U, DX, DT = 10, 500, 30
+
+def _history(Nt, Nx):
+    return analytical_solution(np.arange(Nx) * DX, np.arange(Nt) * DT, U, DX, Nx, "gauss", 10)
+
+class TimeCreateDataset:
+    params = [[(101, 101), (1000, 10001)]]
+    param_names = ["shape"]
+
+    def setup(self, shape):
+        self.M = _history(*shape)
+        self.T = np.arange(shape[0]) * DT
+
+    def time_create(self, shape):
+        create_dataset(self.M, shape[1], DX, self.T)
+
+class TimeSaveLoad:
+    """Throughput de save_dataset/load_dataset; `track_*` registra los bytes en disco."""
+    params = [[0, 1, 4, 9], [(101, 101), (1000, 10001)]]
+    param_names = ["complevel", "shape"]
+
+    def setup(self, complevel, shape):
+        self.dir = tempfile.mkdtemp(prefix="bench_io_")
+        self.ds = create_dataset(_history(*shape), shape[1], DX, np.arange(shape[0]) * DT)
+        self.policy = EncodingPolicy(complevel=complevel)
+        self.path = save_dataset(self.ds, "saved", self.dir, self.policy)
+
+    def teardown(self, complevel, shape):
+        shutil.rmtree(self.dir, ignore_errors=True)
+
+    def time_save(self, complevel, shape):
+        save_dataset(self.ds, "written", self.dir, self.policy)
+
+    def time_load(self, complevel, shape):
+        with load_dataset("saved", self.dir) as ds:
+            ds.load()
+
+    def track_bytes(self, complevel, shape):
+        return os.path.getsize(self.path)
+    track_bytes.unit = "bytes"
@@ -0,0 +1,61 @@
+"""Costo por cuadro de los gráficos 3-D y de la animación con recorte."""
+import glob
+import os
+import shutil
+import tempfile
+import matplotlib
+matplotlib.use("Agg")
+import numpy as np
+from src.data_handling import create_dataset, extrude_y
+from src.physics import analytical_solution
+from src.visualization import SurfaceRenderer, plot_3d_surface
+
+U, DX, DT, NX = 10, 500, 30, 101
+
+def _frames(Nt):
+    M = analytical_solution(np.arange(NX) * DX, np.arange(Nt) * DT, U, DX, NX, "gauss", 10)
+    return create_dataset(M, NX, DX, np.arange(Nt) * DT)
+
+class TimeSurfacePlot:
+    """Un cuadro con figura nueva (plot_3d_surface) frente a la figura reutilizada."""
+
+    def setup(self):
+        self.dir = tempfile.mkdtemp(prefix="bench_render_")
+        self.frame = extrude_y(_frames(1).isel(time=0))
+        self.renderer = SurfaceRenderer("Euler Backward")
+
+    def teardown(self):
+        self.renderer.close()
+        shutil.rmtree(self.dir, ignore_errors=True)
+
+    def time_plot_3d_surface(self):
+        plot_3d_surface(self.frame, "Euler Backward", 0, DT, 0.6,
+                        save_path=os.path.join(self.dir, "frame.png"))
+
+    def time_renderer_frame(self):
+        self.renderer.draw(self.frame, 0, DT, 0.6)
+        self.renderer.save(os.path.join(self.dir, "frame.png"))
+
+class TimeAnimation:
+    """create_animation_with_crop sobre una secuencia de PNG ya renderizada."""
+    params = [[10, 40]]
+    param_names = ["n_frames"]
+    timeout = 300
+
+    def setup(self, n_frames):
+        from p03_make_animation import create_animation_with_crop
+        self.create = create_animation_with_crop
+        self.dir = tempfile.mkdtemp(prefix="bench_anim_")
+        ds = _frames(n_frames)
+        renderer = SurfaceRenderer("Euler Backward")
+        for ti in range(n_frames):
+            renderer.draw(extrude_y(ds.isel(time=ti)), ti, DT, 0.6)
+            renderer.save(os.path.join(self.dir, f"3D{ti:03d}.png"), dpi=100)
+        renderer.close()
+        self.images = sorted(glob.glob(os.path.join(self.dir, "3D*.png")))
+
+    def teardown(self, n_frames):
+        shutil.rmtree(self.dir, ignore_errors=True)
+
+    def time_create_animation_with_crop(self, n_frames):
+        self.create(self.images, os.path.join(self.dir, "anim.gif"))
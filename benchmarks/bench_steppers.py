@@ -0,0 +1,57 @@
+"""Costo por paso de los esquemas, de Nx = 10^2 a 10^6."""
+import numpy as np
+from src.physics import euler_backward_step, gauss
+from src.schemes import available_schemes, get_scheme
+from src.kernels import jit_available
+
+U, DX, DT = 10, 500, 30
+
+def _initial(Nx):
+    return gauss(np.arange(Nx) * DX, 0, 10, U, DX, Nx)
+
+class TimeEulerBackwardStep:
+    """Función original de un paso (asigna el resultado en cada llamada)."""
+    params = [10 ** 2, 10 ** 3, 10 ** 4, 10 ** 5, 10 ** 6]
+    param_names = ["Nx"]
+
+    def setup(self, Nx):
+        self.C = _initial(Nx)
+        self.out = np.empty(Nx)
+
+    def time_step(self, Nx):
+        euler_backward_step(self.C, U, DT, DX, Nx)
+
+    def time_step_preallocated(self, Nx):
+        euler_backward_step(self.C, U, DT, DX, Nx, out=self.out)
+
+class TimeSchemes:
+    """10 pasos de cada esquema registrado con buffers preasignados."""
+    params = [available_schemes(), [10 ** 2, 10 ** 4, 10 ** 6], ["numpy", "jit"]]
+    param_names = ["method", "Nx", "backend"]
+
+    def setup(self, method, Nx, backend):
+        scheme_cls = get_scheme(method)
+        if backend == "jit" and not (jit_available() and scheme_cls.has_kernel):
+            raise NotImplementedError("sin núcleo compilado")
+        self.scheme = scheme_cls(U * DT / DX, Nx, backend=backend)
+        self.scheme.initialize(_initial(Nx))
+        self.scheme.step_n(2)  # compila el núcleo fuera de la medición
+
+    def time_step_n(self, method, Nx, backend):
+        self.scheme.step_n(10)
+
+class TimeSweep:
+    """Ensamble de 32 miembros (miembros, Nx) avanzado en bloque."""
+    params = [["Euler Backward", "RK4"], [10 ** 3, 10 ** 5], ["numpy", "jit"]]
+    param_names = ["method", "Nx", "backend"]
+
+    def setup(self, method, Nx, backend):
+        if backend == "jit" and not jit_available():
+            raise NotImplementedError("numba no está instalado")
+        cfl = np.linspace(0.2, 0.8, 32)
+        self.scheme = get_scheme(method)(cfl, Nx, backend=backend)
+        self.scheme.initialize(np.tile(_initial(Nx), (32, 1)))
+        self.scheme.step_n(2)
+
+    def time_step_n(self, method, Nx, backend):
+        self.scheme.step_n(10)
@@ -0,0 +1,229 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Ejecuta los benchmarks de `benchmarks/` y guarda resultados comparables entre commits.
+
+Los módulos siguen la convención de asv: clases con `params`/`param_names`,
+`setup`/`teardown` por combinación de parámetros (un `NotImplementedError`
+en `setup` omite la combinación), métodos `time_*` (segundos por llamada) y
+`track_*` (valor devuelto, con `unit`). Así la misma carpeta sirve para
+`asv run` si se configura asv.
+
+    python -m benchmarks.run                      # todo -> outputs/benchmarks/<commit>.json
+    python -m benchmarks.run -b TimeSchemes --quick
+    python -m benchmarks.run --compare outputs/benchmarks/a1b2c3d.json outputs/benchmarks/e4f5a6b.json
+"""
+import os
+import re
+import sys
+import json
+import time
+import math
+import argparse
+import platform
+import importlib
+import itertools
+import subprocess
+import contextlib
+import statistics
+import collections
+import numpy as np
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+BASE_DIR = os.path.dirname(BENCH_DIR)
+RESULTS_DIR = os.path.join(BASE_DIR, "outputs", "benchmarks")
+
+# Un caso: función medida con una combinación de parámetros
+Case = collections.namedtuple("Case", "name cls method params")
+
+def _combinations(cls):
+    """Combinaciones de parámetros como diccionarios {nombre: valor}."""
+    params = getattr(cls, "params", [])
+    if not params:
+        return [{}]
+    if not isinstance(params[0], list):  # un solo parámetro: lista simple
+        params = [params]
+    names = getattr(cls, "param_names", [f"param{i + 1}" for i in range(len(params))])
+    return [dict(zip(names, values)) for values in itertools.product(*params)]
+
+def discover(pattern=None):
+    """Casos de los módulos bench_*.py cuyo nombre completo coincide con `pattern`."""
+    cases = []
+    for filename in sorted(os.listdir(BENCH_DIR)):
+        if not (filename.startswith("bench_") and filename.endswith(".py")):
+            continue
+        module = importlib.import_module(f"benchmarks.{filename[:-3]}")
+        for cls_name, cls in vars(module).items():
+            if not (isinstance(cls, type) and cls.__module__ == module.__name__):
+                continue
+            for method in sorted(vars(cls)):
+                if not method.startswith(("time_", "track_")):
+                    continue
+                name = f"{filename[:-3]}.{cls_name}.{method}"
+                if pattern and not re.search(pattern, name):
+                    continue
+                cases.extend(Case(name, cls, method, p) for p in _combinations(cls))
+    return cases
+
+def _call(instance, name, params):
+    func = getattr(instance, name, None)
+    return func(*params.values()) if func is not None else None
+
+def run_case(case, min_time=0.2, repeat=5):
+    """Mide un caso y devuelve su registro (o None si `setup` lo omite).
+
+    `time_*`: se calibra el número de llamadas por repetición para que cada
+    repetición dure al menos `min_time` / `repeat`, y se reportan el mínimo y
+    la mediana por llamada. `track_*`: se guarda el valor devuelto.
+    """
+    instance = case.cls()
+    try:
+        _call(instance, "setup", case.params)
+    except NotImplementedError:
+        return None
+    record = {"name": case.name, "params": case.params}
+    try:
+        func = getattr(instance, case.method)
+        if case.method.startswith("track_"):
+            record.update(value=func(*case.params.values()), unit=getattr(func, "unit", "unit"))
+            return record
+        start = time.perf_counter()
+        func(*case.params.values())
+        first = time.perf_counter() - start
+        number = max(1, math.ceil(min_time / repeat / max(first, 1e-9)))
+        samples = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            for _ in range(number):
+                func(*case.params.values())
+            samples.append((time.perf_counter() - start) / number)
+        record.update(unit="seconds", min=min(samples), median=statistics.median(samples),
+                      number=number, repeat=repeat)
+        return record
+    finally:
+        _call(instance, "teardown", case.params)
+
+def _git(*args):
+    try:
+        return subprocess.run(["git", *args], cwd=BASE_DIR, capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def environment():
+    """Commit y máquina de una corrida, para saber qué se compara."""
+    try:
+        import numba
+        numba_version = numba.__version__
+    except ImportError:
+        numba_version = None
+    return {
+        "commit": _git("rev-parse", "--short", "HEAD") or "unknown",
+        "dirty": bool(_git("status", "--porcelain", "--untracked-files=no")),
+        "date": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "numba": numba_version,
+    }
+
+def run(pattern=None, min_time=0.2, repeat=5, verbose=True):
+    """Ejecuta los casos seleccionados; devuelve {'environment', 'results'}."""
+    results = []
+    for case in discover(pattern):
+        # Los benchmarks llaman funciones que imprimen reportes: se silencian
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            record = run_case(case, min_time, repeat)
+        if record is None:
+            continue
+        results.append(record)
+        if verbose:
+            print(f"{_label(record):<90} {_format(record)}")
+    return {"environment": environment(), "results": results}
+
+def _label(record):
+    params = ", ".join(f"{k}={v}" for k, v in record["params"].items())
+    return f"{record['name']}({params})"
+
+def _format(record, key="min"):
+    if record["unit"] != "seconds":
+        return f"{record['value']:,} {record['unit']}"
+    seconds = record[key]
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("µs", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.3f} {unit}"
+    return f"{seconds / 1e-9:.1f} ns"
+
+def _key(record):
+    return record["name"], json.dumps(record["params"], sort_keys=True)
+
+def compare(base, new, threshold=1.2):
+    """Compara dos corridas caso por caso (mínimo por llamada, o el valor de `track_*`).
+
+    Returns:
+        list: (etiqueta, valor base, valor nuevo, razón nuevo/base, marca), con
+        marca '+' si la razón supera `threshold` (regresión), '-' si baja de
+        1/threshold (mejora) y '' en otro caso.
+    """
+    base_records = {_key(r): r for r in base["results"]}
+    rows = []
+    for record in new["results"]:
+        old = base_records.get(_key(json.loads(json.dumps(record))))
+        if old is None:
+            continue
+        field = "min" if record["unit"] == "seconds" else "value"
+        ratio = record[field] / old[field] if old[field] else math.inf
+        mark = "+" if ratio > threshold else "-" if ratio < 1 / threshold else ""
+        rows.append((_label(record), old[field], record[field], ratio, mark))
+    return rows
+
+def save(results, path=None):
+    """Guarda los resultados en JSON (por defecto, outputs/benchmarks/<commit>.json)."""
+    if path is None:
+        env = results["environment"]
+        path = os.path.join(RESULTS_DIR, f"{env['commit']}{'-dirty' if env['dirty'] else ''}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(results, f, indent=1, default=lambda v: v.item() if hasattr(v, "item") else str(v))
+    return path
+
+def load(path):
+    with open(path) as f:
+        return json.load(f)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks del modelo de advección")
+    parser.add_argument("-b", "--bench", metavar="REGEX", help="Solo los casos cuyo nombre coincide")
+    parser.add_argument("--quick", action="store_true", help="Una repetición corta por caso")
+    parser.add_argument("--min-time", type=float, default=0.2, help="Tiempo mínimo por caso (s)")
+    parser.add_argument("--repeat", type=int, default=5, help="Repeticiones por caso")
+    parser.add_argument("-o", "--output", help="Archivo JSON de salida")
+    parser.add_argument("--compare", nargs="+", metavar="JSON",
+                        help="Compara BASE contra NUEVO (o contra una corrida nueva si se da solo BASE)")
+    parser.add_argument("--threshold", type=float, default=1.2,
+                        help="Razón nuevo/base a partir de la cual se marca una regresión")
+    args = parser.parse_args(argv)
+    if args.compare and len(args.compare) > 2:
+        parser.error("--compare acepta BASE [NUEVO]")
+
+    if args.compare and len(args.compare) == 2:
+        new = load(args.compare[1])
+    else:
+        min_time, repeat = (0.0, 1) if args.quick else (args.min_time, args.repeat)
+        new = run(args.bench, min_time, repeat)
+        print(f"Resultados guardados en {save(new, args.output)}")
+    if not args.compare:
+        return 0
+
+    base = load(args.compare[0])
+    rows = compare(base, new, args.threshold)
+    print(f"\nBase {base['environment']['commit']} -> nuevo {new['environment']['commit']}")
+    for label, old, value, ratio, mark in rows:
+        print(f"{mark:1} {label:<90} {ratio:6.2f}x")
+    regressions = [row for row in rows if row[4] == "+"]
+    print(f"{len(rows)} casos comparados, {len(regressions)} regresiones (> {args.threshold}x)")
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,9 +4,23 @@ import os
 import numpy as np
 import xarray as xr
 import pandas as pd
+import atexit
 import argparse
-from src.physics import analytical_solution, euler_backward_step
-from src.data_handling import create_dataset, save_dataset
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from src.physics import analytical_blocks, analytical_solution, initial_condition
+from src.schemes import get_scheme, available_schemes
+from src.kernels import BACKENDS, jit_available, process_context
+from src import instrumentation
+from src.data_handling import create_dataset, save_dataset, StreamingWriter, ArrayWriter, EncodingPolicy
+from src.sweep import build_members, parse_sweep, parse_values, write_sweep, PROFILES
+from src.cache import RunCache, run_key
+from src.catalog import register_file
+from src.checkpoint import Checkpointer
+from src.stability import check_stability
+from src.diagnostics import METRICS, DiagnosticsStage, compute_metrics, metric_variables
+from src.advection2d import (Advection2D, PROFILES_2D, STENCILS, VELOCITY_FIELDS, analytical_solution_2d,
+                             grid_2d, initial_condition_2d, velocity_field)
 
 # Constantes físicas
 U = 10  # Velocidad (m/s)
@@ -16,60 +30,547 @@ DX = 500  # Espaciado (m)
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 OUTPUTS_DIR = os.path.join(BASE_DIR, "outputs")
 DATA_DIR = os.path.join(OUTPUTS_DIR, "data")
+CACHE_DIR = os.path.join(OUTPUTS_DIR, "cache")
+CHECKPOINT_DIR = os.path.join(OUTPUTS_DIR, "checkpoints")
 os.makedirs(DATA_DIR, exist_ok=True)
 
-def run_simulation(dt, nr, method, profile="gauss"):
-    """Ejecuta simulación y guarda resultados en NetCDF"""
-    Nx = 101
-    total_steps = Nx * 1 # cantidad de tiempos, puede ser un numero cualquiera
+def simulate(dt, nr, method, profile, Nx, total_steps, numerical, analytical, save_every=1,
+             checkpointer=None, resume=None, diagnostics=None, dtype="float64", backend="numpy"):
+    """Integra un caso enviando cada `save_every` pasos a los escritores de salida.
+
+    `numerical` y `analytical` son objetos con `append(campo, t)`
+    (`StreamingWriter` o `ArrayWriter`), así que la historia nunca se acumula
+    en memoria; con `analytical=None` no se genera la solución analítica.
+    `diagnostics` (`DiagnosticsStage`) recibe cada paso guardado y calcula
+    las métricas de error en línea. Con `checkpointer` se guarda el estado
+    completo del esquema cada `checkpointer.every` pasos; `resume` (estado
+    leído del checkpoint) continúa la integración desde ese paso. `dtype`
+    es la precisión del esquema ('float32' o 'float64') y `backend` su
+    motor ('numpy' o 'jit', con resultados idénticos).
+    Returns:
+        str: Nombre canónico del esquema usado.
+    """
     CFL = U * dt / DX
 
     # Coordenadas
-    X = [e * DX for e in range(Nx)]
-    T = [e * dt for e in range(total_steps)][:]  #[:10] Primeros 10 pasos
+    X = np.arange(Nx) * DX
+    T = np.arange(0, total_steps, save_every) * dt
 
     # Simulación numérica
-    M_num = []
-    Cn = np.array([analytical_solution(x, 0, U, DX, Nx, profile, nr) for x in X])
-    for t in T:
-        if t != 0:
-            Cn = euler_backward_step(Cn, U, dt, DX, Nx)
-        M_num.append(Cn.copy())
-
-    # Solución analítica
-    M_analytical = [[analytical_solution(x, t, U, DX, Nx, profile, nr) for x in X] for t in T]
-
-    # Crear y guardar datasets
-    base_name = f"{method.replace(' ', '')}_dt{dt}_CFL{CFL}_dx{DX}_profile{profile}"
+    scheme = get_scheme(method)(CFL, Nx, dtype, backend)
+    if resume is None:
+        Cn = scheme.initialize(initial_condition(X, U, DX, Nx, profile, nr))
+        first = 0
+    else:
+        Cn = scheme.restore(resume)
+        first = scheme.nstep + 1
+    with instrumentation.stage("simulate", steps=total_steps - first):
+        for n in range(first, total_steps):
+            if n != 0:
+                Cn = scheme.step()
+            if n % save_every == 0:
+                numerical.append(Cn, n * dt)
+                if diagnostics is not None:
+                    diagnostics.record(Cn, n * dt)
+            if checkpointer is not None and checkpointer.due(n):
+                if diagnostics is not None:
+                    diagnostics.flush()
+                numerical.sync()
+                checkpointer.save(scheme, frames=numerical.nsteps)
+        if diagnostics is not None:
+            diagnostics.flush()
+    if analytical is None:
+        return scheme.name
+
+    # Solución analítica, por bloques de tiempo
+    with instrumentation.stage("analytical_solution", frames=len(T)):
+        for start, block in analytical_blocks(X, T, U, DX, Nx, profile, nr):
+            for t, field in zip(T[start:start + len(block)], block):
+                analytical.append(field, t)
+    return scheme.name
+
+def unstable_configs(methods, dts, steps):
+    """Describe las combinaciones (método, dt) inestables según Von Neumann"""
+    problems = []
+    for method in methods:
+        for dt in dts:
+            cfl = U * dt / DX
+            check = check_stability(method, cfl, steps)
+            if not check["stable"]:
+                problems.append(
+                    f"{get_scheme(method).name} con dt={dt} (CFL={cfl:.3g} > {check['limit']:.4g}): "
+                    f"|λ|max={check['max_amplification']:.4f}, crecimiento ~{check['growth']:.1e} en {steps} pasos")
+    return problems
+
+def run_name(dt, nr, method, profile, Nx=101, dtype="float64"):
+    """Prefijo de los archivos de una corrida"""
+    base_name = f"{method.replace(' ', '')}_dt{dt}_CFL{U * dt / DX}_dx{DX}_profile{profile}"
     if profile == 'gauss':
         base_name += f"_nr{nr}"
+    if Nx != 101:
+        base_name += f"_nx{Nx}"
+    if np.dtype(dtype) != np.float64:
+        base_name += f"_{np.dtype(dtype).name}"
+    return base_name
 
-    datasets = {
-        "numerical": create_dataset(M_num, Nx, DX, T),
-        "analytical": create_dataset(M_analytical, Nx, DX, T)
+def run_attrs(dt, nr, profile, Nx, scheme_name, key, dtype="float64"):
+    """Atributos globales de los archivos de una corrida"""
+    return {
+        'simulation_parameters': f"U={U}, Nx={Nx}, DX={DX}, dt={dt}, profile={profile}{f', nr={nr}' if profile == 'gauss' else ''}",
+        'CFL_number': U * dt / DX,
+        'method': scheme_name,
+        'data_type': key,
+        'compute_dtype': np.dtype(dtype).name
     }
 
+def run_params(dt, nr, method, profile, Nx, total_steps, save_every=1, policy=None,
+               write_analytical=True, dtype="float64", accumulate="float64"):
+    """Conjunto completo de parámetros que determina los archivos de una corrida"""
+    return {
+        'method': get_scheme(method).name, 'dt': dt, 'dx': DX, 'U': U, 'Nx': Nx,
+        'steps': Nx * 1 if total_steps is None else total_steps, 'save_every': save_every,
+        'profile': profile, 'nr': nr if profile == 'gauss' else None,
+        'encoding': repr(policy or EncodingPolicy()), 'analytical': write_analytical,
+        'dtype': np.dtype(dtype).name, 'accumulate': np.dtype(accumulate).name,
+    }
+
+def run_paths(base_name, write_analytical=True):
+    """Rutas de los archivos numérico y (si se escribe) analítico de una corrida"""
+    keys = ("numerical", "analytical") if write_analytical else ("numerical",)
+    return {key: os.path.join(DATA_DIR, f"{base_name}_{key}.nc") for key in keys}
+
+def fetch_cached(cache, key, destinations):
+    """Copia una corrida desde la caché y la registra en el catálogo de datos"""
+    if not cache.fetch(key, destinations):
+        return False
+    for path in destinations.values():
+        register_file(path)
+    return True
+
+def save_run(dt, nr, method, profile, Nx, M_num, M_analytical, scheme_name, save_every=1, policy=None,
+             write_analytical=True, dtype="float64", accumulate="float64"):
+    """Crea y guarda los datasets numérico (con sus diagnósticos) y analítico de una corrida ya calculada"""
+    T = [e * dt * save_every for e in range(len(M_num))]
+    base_name = run_name(dt, nr, method, profile, Nx, dtype)
+
+    numerical = create_dataset(M_num, Nx, DX, T)
+    metrics = compute_metrics(M_num, M_analytical, DX, accumulate)
+    numerical = numerical.assign(metric_variables(metrics, ["time"]))
+    datasets = {"numerical": numerical}
+    if write_analytical:
+        datasets["analytical"] = create_dataset(M_analytical, Nx, DX, T)
+
     for key, ds in datasets.items():
-        ds.attrs.update({
-            'simulation_parameters': f"U={U}, Nx={Nx}, DX={DX}, dt={dt}, profile={profile}{f', nr={nr}' if profile == 'gauss' else ''}",
-            'CFL_number': CFL,
-            'data_type': key
-        })
-        save_dataset(ds, os.path.join(DATA_DIR, f"{base_name}_{key}"))
+        ds.attrs.update(run_attrs(dt, nr, profile, Nx, scheme_name, key, dtype))
+        save_dataset(ds, os.path.join(DATA_DIR, f"{base_name}_{key}"), policy=policy, report=True)
+
+    return base_name
+
+@instrumentation.timed()
+def run_simulation(dt, nr, method, profile="gauss", Nx=101, total_steps=None, save_every=1,
+                   policy=None, cache=None, checkpoint_every=None, restart=False,
+                   write_analytical=True, dtype="float64", accumulate="float64", backend="numpy"):
+    """Ejecuta simulación y guarda resultados en NetCDF a medida que avanza
+
+    El archivo numérico incluye las series de diagnóstico (`METRICS`)
+    calculadas en línea; con `write_analytical=False` no se escribe el
+    archivo analítico. Con `cache` (RunCache) una corrida con parámetros
+    idénticos ya calculada se copia desde la caché en lugar de
+    recalcularse. Con `checkpoint_every` se guarda un checkpoint en
+    outputs/checkpoints cada N pasos; `restart` reanuda desde él y sigue
+    escribiendo en el archivo numérico existente. `dtype` es la precisión
+    del esquema y `accumulate` la de las sumas de los diagnósticos; la
+    precisión de almacenamiento la fija `policy`. `backend` ('numpy' o
+    'jit') no cambia los resultados, así que no entra en la clave de caché.
+    """
+    if total_steps is None:
+        total_steps = Nx * 1 # cantidad de tiempos, puede ser un numero cualquiera
+    base_name = run_name(dt, nr, method, profile, Nx, dtype)
+    scheme_name = get_scheme(method).name
+    if cache is not None:
+        params = run_params(dt, nr, method, profile, Nx, total_steps, save_every, policy,
+                            write_analytical, dtype, accumulate)
+        key = run_key(params)
+        if not restart and fetch_cached(cache, key, run_paths(base_name, write_analytical)):
+            print(f"Corrida en caché ({key[:12]}): {base_name}")
+            return base_name
+
+    checkpointer = Checkpointer(
+        os.path.join(CHECKPOINT_DIR, f"{base_name}.npz"), checkpoint_every,
+        meta={'method': scheme_name, 'dt': dt, 'nr': nr, 'profile': profile, 'Nx': Nx,
+              'save_every': save_every, 'dtype': np.dtype(dtype).name})
+    resume = checkpointer.load() if restart else None
+    if resume is not None:
+        print(f"Reanudando {base_name} desde el paso {resume['nstep']}")
+
+    # La solución analítica es barata: se reescribe completa también al reanudar
+    writers = {
+        key: StreamingWriter(os.path.join(DATA_DIR, f"{base_name}_{key}"), Nx, DX,
+                             attrs=run_attrs(dt, nr, profile, Nx, scheme_name, key, dtype), policy=policy,
+                             resume=resume['frames'] if resume is not None and key == "numerical" else None,
+                             series=METRICS if key == "numerical" else None)
+        for key in run_paths(base_name, write_analytical)
+    }
+    X = np.arange(Nx) * DX
+    diagnostics = DiagnosticsStage(
+        lambda times: analytical_solution(X, times, U, DX, Nx, profile, nr), Nx, DX,
+        writers["numerical"].write_series, start=resume['frames'] if resume is not None else 0,
+        dtype=accumulate)
+    try:
+        simulate(dt, nr, method, profile, Nx, total_steps, writers["numerical"],
+                 writers.get("analytical"), save_every, checkpointer, resume, diagnostics, dtype,
+                 backend)
+    finally:
+        for writer in writers.values():
+            writer.close()
+            print(writer.report())
+    checkpointer.remove()
+    if cache is not None:
+        cache.put(key, run_paths(base_name, write_analytical), params)
+    return base_name
 
+def default_period(velocity, Nx):
+    """Período por defecto: una vuelta con velocidad U en el borde (rotación) o 1.5 Lx/U (deformación)"""
+    L = Nx * DX
+    return np.pi * L / U if velocity == "rotation" else 1.5 * L / U
+
+@instrumentation.timed()
+def run_simulation_2d(dt, nr, profile="cone", velocity="rotation", Nx=101, Ny=None, total_steps=None,
+                      save_every=1, policy=None, stencil="split", period=None, dtype="float64",
+                      write_analytical=True, allow_unstable=False):
+    """Ejecuta una advección 2-D (x, y) y guarda los campos (time, Y, X) a medida que avanza
+
+    El pulso (cono o gaussiana de radio nr*DX, por defecto Lx/8) parte de
+    (Lx/2, 3Ly/4). Para rotación y deformación el período por defecto es
+    `default_period` y la corrida dura un período completo, tras el cual la
+    solución exacta vuelve a la condición inicial. La solución analítica
+    se escribe para traslación uniforme y rotación.
+    Raises:
+        ValueError: Si el número de Courant supera 1 y no se permite.
+    """
+    Ny = Nx if Ny is None else Ny
+    X, Y = grid_2d(Nx, Ny, DX, DX)
+    params = {'u': U, 'v': U} if velocity == "uniform" else {'u': U}
+    if velocity != "uniform":
+        params['period'] = default_period(velocity, Nx) if period is None else period
+    field = velocity_field(velocity, X, Y, **params)
+    stepper = Advection2D(field, DX, DX, dt, (Ny, Nx), stencil, dtype)
+    if stepper.courant_number > stepper.stability_limit and not allow_unstable:
+        raise ValueError(f"Courant {stepper.courant_number:.3g} > {stepper.stability_limit} "
+                         f"({stencil}, dt={dt}); usar un dt menor o --allow-unstable.")
+    if total_steps is None:
+        total_steps = Nx if velocity == "uniform" else int(round(params['period'] / dt)) + 1
+    radius = nr * DX if nr else None
+    scheme_name = f"Upwind 2D {stencil}"
+    base_name = (f"Upwind2D{stencil.capitalize()}_{velocity}_dt{dt}_dx{DX}_profile{profile}"
+                 f"{f'_nr{nr}' if nr else ''}_nx{Nx}_ny{Ny}")
+    if np.dtype(dtype) != np.float64:
+        base_name += f"_{np.dtype(dtype).name}"
+    exact = write_analytical and velocity != "deformation"
+
+    attrs = {
+        'simulation_parameters': (f"U={U}, Nx={Nx}, Ny={Ny}, DX={DX}, dt={dt}, profile={profile}"
+                                  f"{f', nr={nr}' if nr else ''}, velocity={velocity}"
+                                  + (f", period={params['period']}" if 'period' in params else '')),
+        'CFL_number': stepper.courant_number,
+        'method': scheme_name,
+        'stencil': stencil,
+        'compute_dtype': np.dtype(dtype).name,
+    }
+    # Pocos cuadros por bloque: un cuadro de 1000x1000 ya ocupa 8 MB
+    buffer_steps = max(1, min(64, 2 ** 22 // (Nx * Ny)))
+    writers = {
+        key: StreamingWriter(os.path.join(DATA_DIR, f"{base_name}_{key}"), Nx, DX,
+                             attrs={**attrs, 'data_type': key}, buffer_steps=buffer_steps,
+                             policy=policy, Ny=Ny)
+        for key in (("numerical", "analytical") if exact else ("numerical",))
+    }
+    try:
+        C = stepper.initialize(initial_condition_2d(X, Y, profile, radius))
+        with instrumentation.stage("simulate", steps=total_steps):
+            for n in range(total_steps):
+                if n != 0:
+                    C = stepper.step()
+                if n % save_every == 0:
+                    writers["numerical"].append(C, n * dt)
+                    if exact:
+                        writers["analytical"].append(
+                            analytical_solution_2d(X, Y, n * dt, velocity, profile, radius, **params), n * dt)
+    finally:
+        for writer in writers.values():
+            writer.close()
+            print(writer.report())
+    return base_name
+
+def _parallel_worker(buffer_path, config, total_steps, save_every, backend="numpy"):
+    """Ejecuta una corrida en un proceso hijo escribiendo en el buffer mapeado en memoria"""
+    buffers = np.load(buffer_path, mmap_mode='r+')
+    scheme_name = simulate(config['dt'], config['nr'], config['method'], config['profile'],
+                           config['Nx'], total_steps, ArrayWriter(buffers[0]),
+                           ArrayWriter(buffers[1]), save_every, dtype=buffers.dtype, backend=backend)
+    buffers.flush()
+    return scheme_name
+
+def run_parallel(configs, workers=None, total_steps=None, save_every=1, policy=None, cache=None,
+                 write_analytical=True, dtype="float64", accumulate="float64", backend="numpy"):
+    """Reparte corridas heterogéneas (método, Nx, dt, ...) en un pool de procesos.
+
+    Cada hijo escribe la historia numérica y analítica en un archivo .npy
+    mapeado en memoria, de modo que solo el nombre del esquema vuelve por
+    pickle; el proceso padre arma y guarda los NetCDF a medida que terminan.
+    Args:
+        configs (list): Diccionarios con method, dt, nr, profile y Nx.
+        workers (int, optional): Número de procesos (por defecto, núcleos disponibles).
+        total_steps (int, optional): Pasos por corrida (por defecto, Nx).
+        save_every (int): Guarda uno de cada `save_every` pasos.
+        policy (EncodingPolicy, optional): Codificación de los NetCDF.
+        cache (RunCache, optional): Las configuraciones en caché no se envían al pool.
+        write_analytical (bool): Si es False solo se guarda el archivo numérico
+            (la solución analítica se calcula igual para los diagnósticos).
+        dtype (str): Precisión de los esquemas y de los buffers compartidos.
+        accumulate (str): Precisión de las sumas de los diagnósticos.
+        backend (str): Motor de los esquemas en cada proceso ('numpy' o 'jit').
+    Returns:
+        list: Prefijos de los archivos generados, en el orden de `configs`.
+    """
+    names = [None] * len(configs)
+    keys = [None] * len(configs)
+    if cache is not None:
+        for i, config in enumerate(configs):
+            keys[i] = run_key(run_params(config['dt'], config['nr'], config['method'], config['profile'],
+                                         config['Nx'], total_steps, save_every, policy, write_analytical,
+                                         dtype, accumulate))
+            base_name = run_name(config['dt'], config['nr'], config['method'], config['profile'],
+                                 config['Nx'], dtype)
+            if fetch_cached(cache, keys[i], run_paths(base_name, write_analytical)):
+                names[i] = base_name
+        if any(names):
+            print(f"{sum(1 for n in names if n)} corridas tomadas de la caché")
+    with tempfile.TemporaryDirectory(prefix="atmodel_") as tmp_dir, \
+            ProcessPoolExecutor(max_workers=workers, mp_context=process_context()) as pool:
+        futures = {}
+        for i, config in enumerate(configs):
+            if names[i] is not None:
+                continue
+            buffer_path = os.path.join(tmp_dir, f"run{i}.npy")
+            steps = config['Nx'] * 1 if total_steps is None else total_steps
+            n_saved = len(range(0, steps, save_every))
+            np.lib.format.open_memmap(buffer_path, mode='w+', dtype=dtype,
+                                      shape=(2, n_saved, config['Nx'])).flush()
+            future = pool.submit(_parallel_worker, buffer_path, config, steps, save_every, backend)
+            futures[future] = (i, buffer_path)
+
+        for future in as_completed(futures):
+            i, buffer_path = futures[future]
+            config = configs[i]
+            buffers = np.load(buffer_path, mmap_mode='r')
+            names[i] = save_run(config['dt'], config['nr'], config['method'], config['profile'],
+                                config['Nx'], buffers[0], buffers[1], future.result(), save_every,
+                                policy, write_analytical, dtype, accumulate)
+            del buffers
+            os.remove(buffer_path)
+            if cache is not None:
+                cache.put(keys[i], run_paths(names[i], write_analytical), run_params(
+                    config['dt'], config['nr'], config['method'], config['profile'],
+                    config['Nx'], total_steps, save_every, policy, write_analytical, dtype, accumulate))
+    return names
+
+def build_configs(methods, dts, nrs, profiles, nxs=(101,)):
+    """Combina métodos, Nx y miembros (dt, nr, perfil) en configuraciones individuales"""
+    members = build_members(dts, nrs, profiles)
+    return [
+        {'method': method, 'Nx': int(Nx), 'dt': m['dt'],
+         'nr': m['nr'] if m['profile'] == 'gauss' else None, 'profile': m['profile']}
+        for method in methods for Nx in nxs for m in members
+    ]
+
+def sweep_name(method, dts, profiles, n_members, Nx=101, dtype="float64"):
+    """Nombre (sin extensión) del archivo de un barrido vectorizado"""
+    base_name = (f"{method.replace(' ', '')}_sweep_dt{min(dts)}-{max(dts)}_dx{DX}"
+                 f"_profile{'-'.join(profiles)}_{n_members}members")
+    if Nx != 101:
+        base_name += f"_nx{Nx}"
+    if np.dtype(dtype) != np.float64:
+        base_name += f"_{np.dtype(dtype).name}"
+    return base_name
+
+def sweep_params(method, members, Nx, total_steps, save_every=1, policy=None, write_analytical=True,
+                 dtype="float64", accumulate="float64"):
+    """Conjunto completo de parámetros que determina el archivo de un barrido"""
+    return {'method': get_scheme(method).name, 'members': members, 'dx': DX, 'U': U, 'Nx': Nx,
+            'steps': Nx if total_steps is None else total_steps, 'save_every': save_every,
+            'encoding': repr(policy or EncodingPolicy()), 'analytical': write_analytical,
+            'dtype': np.dtype(dtype).name, 'accumulate': np.dtype(accumulate).name}
+
+@instrumentation.timed()
+def run_sweep_simulation(method, dts, nrs, profiles, Nx=101, total_steps=None, save_every=1,
+                         policy=None, cache=None, write_analytical=True, dtype="float64",
+                         accumulate="float64", backend="numpy"):
+    """Ejecuta un barrido completo como un único arreglo (miembros, Nx) y lo guarda en un NetCDF
+
+    Los pasos guardados se escriben por bloques (`sweep.write_sweep`), así
+    que la memoria no crece con la duración de la corrida. Con `write_analytical=False` el archivo solo lleva el campo numérico y
+    las series de diagnóstico (la mitad de escritura).
+    """
+    members = build_members(dts, nrs, profiles)
+    base_name = sweep_name(method, dts, profiles, len(members), Nx, dtype)
+    path = {"sweep": os.path.join(DATA_DIR, f"{base_name}.nc")}
+    if cache is not None:
+        params = sweep_params(method, members, Nx, total_steps, save_every, policy, write_analytical,
+                              dtype, accumulate)
+        key = run_key(params)
+        if fetch_cached(cache, key, path):
+            print(f"Barrido en caché ({key[:12]}): {base_name}")
+            return base_name
+
+    writer = write_sweep(base_name, method, members, U, DX, Nx=Nx, total_steps=total_steps,
+                         save_every=save_every, analytical=write_analytical, dtype=dtype,
+                         accumulate=accumulate, backend=backend, output_dir=DATA_DIR, policy=policy)
+    print(writer.report())
+    if cache is not None:
+        cache.put(key, path, params)
     return base_name
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description='Genera datasets de simulación')
-    parser.add_argument('--method', required=True, help='Método numérico')
-    parser.add_argument('--dt', type=float, required=True, help='Paso de tiempo (s)')
-    parser.add_argument('--profile', choices=['gauss', 'rectg'], required=True)
-    parser.add_argument('--nr', type=float, help='Ancho gaussiana (requerido para profile=gauss)')
+    parser.add_argument('--method', required=True,
+                        help=f"Método numérico ({', '.join(available_schemes())}); lista separada por comas con --workers")
+    parser.add_argument('--dt', type=float, help='Paso de tiempo (s)')
+    parser.add_argument('--profile', required=True,
+                        help="Perfil inicial: gauss o rectg (lista separada por comas con --sweep)")
+    parser.add_argument('--nr', help='Ancho gaussiana (requerido para profile=gauss; lista con --sweep)')
+    parser.add_argument('--sweep', action='append', metavar='PARAM=VALORES',
+                        help="Barrido vectorizado, p. ej. 'dt=30:60:5' o 'nr=2,10' (repetible)")
+    parser.add_argument('--nx', default='101', help='Puntos en la malla (lista separada por comas con --workers)')
+    parser.add_argument('--steps', type=int, help='Pasos de tiempo a integrar (por defecto, Nx)')
+    parser.add_argument('--save-every', type=int, default=1, metavar='N',
+                        help='Guarda uno de cada N pasos (memoria y disco acotados)')
+    parser.add_argument('--complevel', type=int, default=4, help='Nivel de compresión zlib (0 = sin compresión)')
+    parser.add_argument('--no-shuffle', action='store_true', help='Desactiva el filtro shuffle')
+    parser.add_argument('--chunk-time', type=int, default=16, help='Pasos de tiempo por chunk en el NetCDF')
+    parser.add_argument('--dtype', choices=['float64', 'float32'], default='float64',
+                        help='Precisión del esquema y, por defecto, del almacenamiento')
+    parser.add_argument('--accumulate', choices=['float64', 'float32'], default='float64',
+                        help='Precisión de las sumas de los diagnósticos (masa, varianza, errores)')
+    parser.add_argument('--store-dtype', choices=['float64', 'float32'],
+                        help='Precisión de almacenamiento (por defecto, la de --dtype)')
+    parser.add_argument('--quantize', type=float, metavar='ERROR',
+                        help='Empaqueta en int16 (scale/offset) con error absoluto <= ERROR')
+    parser.add_argument('--no-analytical', action='store_true',
+                        help='No escribe la solución analítica completa (los diagnósticos se guardan igual)')
+    parser.add_argument('--backend', choices=BACKENDS, default='numpy',
+                        help='Motor de los esquemas: NumPy o núcleos compilados con numba (mismos resultados)')
+    parser.add_argument('--profile-report', nargs='?', const='', metavar='JSON',
+                        help='Reporte de tiempos, pasos/s, bytes y pico de memoria por etapa (y JSON si se da ruta)')
+    parser.add_argument('--velocity', choices=list(VELOCITY_FIELDS),
+                        help='Advección 2-D (x, y) con este campo de velocidad (solo Euler Backward/upwind)')
+    parser.add_argument('--ny', type=int, help='Puntos en y para 2-D (por defecto, igual a --nx)')
+    parser.add_argument('--stencil', choices=STENCILS, default='split',
+                        help='Esténcil 2-D: barridos por dimensión o no separado')
+    parser.add_argument('--period', type=float,
+                        help='Período (s) de la rotación o deformación 2-D (por defecto, una vuelta con U en el borde)')
+    parser.add_argument('--workers', type=int,
+                        help='Ejecuta cada configuración por separado en un pool de N procesos')
+    parser.add_argument('--checkpoint-every', type=int, metavar='N',
+                        help='Guarda un checkpoint (todos los niveles del esquema) cada N pasos')
+    parser.add_argument('--restart', action='store_true',
+                        help='Reanuda desde el último checkpoint y continúa el archivo de salida')
+    parser.add_argument('--allow-unstable', action='store_true',
+                        help='Ejecuta igual las configuraciones inestables (solo avisa)')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Recalcula siempre, sin consultar ni llenar la caché de corridas')
+    parser.add_argument('--cache-dir', default=CACHE_DIR, help='Directorio de la caché de corridas')
+    parser.add_argument('--cache-max-mb', type=float, default=2048,
+                        help='Tamaño máximo de la caché (MB) antes de desalojar entradas LRU')
     
     args = parser.parse_args()
+    if args.profile_report is not None:
+        instrumentation.enable()
+        atexit.register(instrumentation.emit_report, args.profile_report)
     
-    if args.profile == 'gauss' and args.nr is None:
+    try:
+        methods = [m.strip() for m in args.method.split(',') if m.strip()]
+        for method in methods:
+            get_scheme(method)
+        profiles = parse_values(args.profile, str)
+        nrs = parse_values(args.nr) if args.nr is not None else []
+        nxs = parse_values(args.nx, int)
+        sweeps = dict(parse_sweep(spec) for spec in args.sweep or [])
+        policy = EncodingPolicy(args.complevel, not args.no_shuffle, args.chunk_time,
+                                args.store_dtype or args.dtype, args.quantize)
+    except ValueError as e:
+        parser.error(str(e))
+    if args.velocity is not None:
+        if any(p not in PROFILES_2D for p in profiles):
+            parser.error(f"Perfil 2-D no válido. Usar uno de: {', '.join(PROFILES_2D)}.")
+        if (len(methods) > 1 or get_scheme(methods[0]).name != "Euler Backward" or len(profiles) > 1
+                or len(nxs) > 1 or args.sweep or args.workers or args.checkpoint_every or args.restart):
+            parser.error("--velocity (2-D) admite una sola corrida Euler Backward (upwind), "
+                         "sin --sweep, --workers ni checkpoints")
+        if args.dt is None:
+            parser.error("Se requiere --dt")
+        try:
+            base_name = run_simulation_2d(args.dt, float(nrs[0]) if nrs else None, profiles[0],
+                                          args.velocity, nxs[0], args.ny, args.steps, args.save_every,
+                                          policy, args.stencil, args.period, args.dtype,
+                                          not args.no_analytical, args.allow_unstable)
+        except ValueError as e:
+            parser.error(str(e))
+        print(f"Datasets 2-D generados con prefijo: {base_name}")
+        raise SystemExit
+    if any(p not in PROFILES for p in profiles):
+        parser.error("Perfil no válido. Usar 'gauss' o 'rectg'.")
+    nrs = sweeps.get('nr', nrs)
+    dts = sweeps.get('dt', [args.dt] if args.dt is not None else [])
+    if not dts:
+        parser.error("Se requiere --dt o --sweep dt=...")
+    if 'gauss' in profiles and not nrs:
         parser.error("Se requiere --nr para perfil gaussiano")
+    if args.workers is not None and args.workers < 1:
+        parser.error("--workers debe ser al menos 1")
+    if args.save_every < 1 or (args.steps is not None and args.steps < 1):
+        parser.error("--steps y --save-every deben ser al menos 1")
+    if args.checkpoint_every is not None and args.checkpoint_every < 1:
+        parser.error("--checkpoint-every debe ser al menos 1")
+    single_run = not (args.workers or args.sweep or len(profiles) > 1 or len(nrs) > 1
+                      or len(methods) > 1 or len(nxs) > 1)
+    if (args.checkpoint_every or args.restart) and not single_run:
+        parser.error("--checkpoint-every y --restart solo aplican a una corrida individual")
+    
+    problems = unstable_configs(methods, dts, args.steps or max(nxs))
+    if problems and not args.allow_unstable:
+        parser.error("configuraciones inestables:\n  " + "\n  ".join(problems)
+                     + "\nUsar --allow-unstable para ejecutarlas igual.")
+    for problem in problems:
+        print(f"Aviso, inestable: {problem}")
+    
+    if args.backend == 'jit' and not jit_available():
+        print("Aviso: numba no está instalado; se usa el backend NumPy.")
+        args.backend = 'numpy'
+    cache = None if args.no_cache else RunCache(args.cache_dir, int(args.cache_max_mb * 1024 ** 2))
     
-    base_name = run_simulation(args.dt, args.nr, args.method, args.profile)
-    print(f"Datasets generados con prefijo: {base_name}")
\ No newline at end of file
+    if args.workers:
+        configs = build_configs(methods, dts, nrs, profiles, nxs)
+        names = run_parallel(configs, args.workers, args.steps, args.save_every, policy, cache,
+                             not args.no_analytical, args.dtype, args.accumulate, args.backend)
+        print(f"{len(names)} corridas generadas con {args.workers} procesos en {DATA_DIR}")
+    elif args.sweep or len(profiles) > 1 or len(nrs) > 1 or len(methods) > 1:
+        if len(nxs) > 1:
+            parser.error("Varios --nx requieren --workers")
+        for method in methods:
+            base_name = run_sweep_simulation(method, dts, nrs, profiles, nxs[0],
+                                             args.steps, args.save_every, policy, cache,
+                                             not args.no_analytical, args.dtype, args.accumulate,
+                                             args.backend)
+            print(f"Datasets generados con prefijo: {base_name}")
+    else:
+        try:
+            base_name = run_simulation(dts[0], nrs[0] if nrs else None, methods[0], profiles[0],
+                                       nxs[0], args.steps, args.save_every, policy, cache,
+                                       args.checkpoint_every, args.restart, not args.no_analytical,
+                                       args.dtype, args.accumulate, args.backend)
+        except (FileNotFoundError, ValueError) as e:
+            if not args.restart:
+                raise
+            parser.error(str(e))
+        print(f"Datasets generados con prefijo: {base_name}")
@@ -1,56 +1,122 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 import os
-import glob
+import atexit
 import argparse
-import xarray as xr
-from src.visualization import plot_3d_surface
+from concurrent.futures import ProcessPoolExecutor
+import matplotlib
+from src.visualization import make_renderer
+from src.data_handling import FrameReader, extrude_y
+from src.catalog import Catalog, method_key
+from src.advection2d import STENCILS, VELOCITY_FIELDS
+from src import instrumentation
 
 # Constantes físicas
 U = 10  # Velocidad (m/s)
 DX = 500  # Espaciado (m)
+DATA_DIR = "outputs/data"
 
-def find_data_file(dt, profile, nr=None, method=None, data_type='numerical'):
-    """Busca archivos que coincidan con los parámetros"""
-    # Construye el patrón de búsqueda exacto que estás usando
-    pattern = f"outputs/data/{method.replace(' ', '')}_dt{dt}_CFL*_dx{DX}_profile{profile}"
-    if nr is not None:
-        pattern += f"_nr{nr}"
-    pattern += f"_{data_type}.nc"
-    
-    matches = glob.glob(pattern)
-    return matches[0] if matches else None
+def run_method(method, velocity=None, stencil='split'):
+    """Nombre con que el catálogo guarda el método de una corrida
+
+    Las corridas 2-D se piden con --velocity y el método de p01 ('Euler
+    Backward'), pero se guardan como 'Upwind 2D split' o 'Upwind 2D unsplit'.
+    """
+    if velocity and method and method_key(method) == 'eulerbackward':
+        return f"Upwind 2D {stencil}"
+    return method
+
+def find_data_file(dt, profile, nr=None, method=None, data_type='numerical', Nx=None,
+                   velocity=None, Ny=None):
+    """Busca en el catálogo de outputs/data el archivo que coincide con los parámetros
+
+    Con `Nx=None` no se filtra por tamaño de malla (se toma el más reciente).
+    `velocity` y `Ny` eligen entre corridas 2-D.
+    """
+    with Catalog(DATA_DIR) as catalog:
+        return catalog.find_one(method=method, data_type=data_type, dt=dt, nr=nr,
+                                profile=profile, dx=DX, Nx=Nx, Ny=Ny, velocity=velocity)
+
+# Renderizador del proceso actual (uno por worker, reutilizado entre cuadros)
+_renderer = None
+
+def _init_renderer(title, profile, two_d=False):
+    """Crea la figura una sola vez por proceso (mapa (x, y) si el archivo es 2-D)"""
+    global _renderer
+    matplotlib.use("Agg")
+    _renderer = make_renderer(title, profile, two_d)
+
+def _render_frames(data_path, indices, fig_dir, base_name, dt):
+    """Renderiza un bloque contiguo de cuadros con el renderizador del proceso"""
+    with FrameReader(data_path) as frames:
+        CFL = float(frames.attrs.get("CFL_number", U*dt/DX))
+        for ti in indices:
+            _renderer.draw(extrude_y(frames.frame(ti)), ti, float(dt), CFL)
+            _renderer.save(frame_path(fig_dir, base_name, ti))
+    return len(indices)
 
-def generate_plots(dt, profile, nr=None, method=None, data_type='numerical'):
-    """Genera gráficos adaptándose a tus nombres de archivo exactos"""
-    data_path = find_data_file(dt, profile, nr, method, data_type)
+def frame_path(fig_dir, base_name, ti):
+    """Ruta del cuadro `ti` de un archivo (mismo nombre también para 2-D: p03 busca esta secuencia)"""
+    return os.path.join(fig_dir, f"3D{ti:03d}_{base_name}.png")
+
+def frame_paths(fig_dir, base_name, n_frames):
+    """Rutas de todos los cuadros de un archivo, en orden"""
+    return [frame_path(fig_dir, base_name, ti) for ti in range(n_frames)]
+
+def render_file(data_path, fig_dir, title, profile, dt, workers=1):
+    """Renderiza todos los cuadros de un NetCDF en `fig_dir`
+
+    Con `workers` > 1 los cuadros se reparten en bloques contiguos entre un
+    pool de procesos, cada uno con su propia figura reutilizable.
+    Returns:
+        list: Rutas de las imágenes generadas, en orden.
+    """
+    os.makedirs(fig_dir, exist_ok=True)
+    base_name = os.path.basename(data_path).replace('.nc', '')
+    with FrameReader(data_path) as frames:
+        n_frames, two_d = len(frames), frames.is_2d
+    if workers > 1:
+        # Bloques contiguos: cada worker aprovecha los chunks de tiempo que descomprime
+        n_blocks = min(n_frames, workers * 4)
+        blocks = [range(i * n_frames // n_blocks, (i + 1) * n_frames // n_blocks)
+                  for i in range(n_blocks)]
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_renderer,
+                                 initargs=(title, profile, two_d)) as pool:
+            list(pool.map(_render_frames, *zip(*[(data_path, b, fig_dir, base_name, dt)
+                                                 for b in blocks])))
+    else:
+        _init_renderer(title, profile, two_d)
+        _render_frames(data_path, range(n_frames), fig_dir, base_name, dt)
+        _renderer.close()
+    return frame_paths(fig_dir, base_name, n_frames)
+
+@instrumentation.timed()
+def generate_plots(dt, profile, nr=None, method=None, data_type='numerical', workers=1, Nx=None,
+                   velocity=None, Ny=None):
+    """Genera gráficos adaptándose a tus nombres de archivo exactos
+
+    Con `workers` > 1 el renderizado se reparte entre procesos (`render_file`).
+    `Nx` elige la malla si hay corridas de varios tamaños; `velocity` y `Ny`
+    eligen entre corridas 2-D (con `method` ya resuelto por `run_method`).
+    """
+    data_path = find_data_file(dt, profile, nr, method, data_type, Nx, velocity, Ny)
     
     if not data_path:
         print(f"Error: No se encontró archivo {data_type} para:")
-        print(f"method={method}, dt={dt}, profile={profile}" + (f", nr={nr}" if nr else ""))
-        print("\nArchivos disponibles en outputs/data/:")
-        for f in glob.glob("outputs/data/*.nc"):
-            print(f"- {os.path.basename(f)}")
+        print(f"method={method}, dt={dt}, profile={profile}" + (f", nr={nr}" if nr else "")
+              + (f", Nx={Nx}" if Nx else "") + (f", Ny={Ny}" if Ny else "")
+              + (f", velocity={velocity}" if velocity else ""))
+        print(f"\nArchivos disponibles en {DATA_DIR}/:")
+        with Catalog(DATA_DIR) as catalog:
+            for run in catalog.find():
+                print(f"- {os.path.basename(run['path'])}")
         return
 
     try:
-        ds = xr.open_dataset(data_path)
         dir_name = method.replace(" ", "") if method else "Analytical"
-        os.makedirs(f"outputs/figures/{dir_name}", exist_ok=True)
-        
-        base_name = os.path.basename(data_path).replace('.nc', '')
-        for ti in range(len(ds.time)):
-            fig_path = f"outputs/figures/{dir_name}/3D{ti:03d}_{base_name}.png"
-            title = f"{method} ({data_type})" if method else "Solución Analítica"
-            plot_3d_surface(
-                ds.isel(time=ti),
-                title,
-                ti,
-                float(dt),
-                float(U*dt/DX),
-                save_path=fig_path,
-                profile=profile
-            )
+        title = f"{method} ({data_type})" if method else "Solución Analítica"
+        paths = render_file(data_path, f"outputs/figures/{dir_name}", title, profile, dt, workers)
+        instrumentation.count("generate_plots", frames=len(paths))
         print(f"Gráficos generados en outputs/figures/{dir_name}/")
         
     except Exception as e:
@@ -61,15 +127,28 @@ if __name__ == "__main__":
     
     # Parámetros comunes
     parser.add_argument('--dt', type=float, required=True, help='Paso de tiempo (s)')
-    parser.add_argument('--profile', choices=['gauss', 'rectg'], required=True)
+    parser.add_argument('--profile', choices=['gauss', 'rectg', 'cone'], required=True,
+                        help="Perfil inicial ('cone' solo en 2-D)")
     parser.add_argument('--nr', type=float, help='Ancho de la gaussiana (solo para profile=gauss)')
+    parser.add_argument('--nx', type=int, help='Puntos en la malla de la corrida (por defecto, cualquiera)')
+    parser.add_argument('--ny', type=int, help='Puntos en y de la corrida 2-D (por defecto, cualquiera)')
+    parser.add_argument('--velocity', choices=list(VELOCITY_FIELDS),
+                        help='Corrida 2-D con este campo de velocidad')
+    parser.add_argument('--stencil', choices=STENCILS, default='split', help='Esténcil de la corrida 2-D')
     
     # Modos de operación
     group = parser.add_mutually_exclusive_group(required=True)
     group.add_argument('--numerical', metavar='METHOD', help='Generar gráficos numéricos')
     group.add_argument('--analytical', metavar='METHOD', help='Generar gráficos analíticos')
+    parser.add_argument('--workers', type=int, default=1, help='Procesos para renderizar en paralelo')
+    parser.add_argument('--profile-report', nargs='?', const='', metavar='JSON',
+                        help='Reporte por etapa (y JSON si se da ruta); con --workers > 1 el '
+                             'renderizado ocurre en otros procesos y solo se mide el total')
     
     args = parser.parse_args()
+    if args.profile_report is not None:
+        instrumentation.enable()
+        atexit.register(instrumentation.emit_report, args.profile_report)
     
     # Validaciones
     if args.profile == 'gauss' and args.nr is None:
@@ -81,14 +160,23 @@ if __name__ == "__main__":
             dt=args.dt,
             profile=args.profile,
             nr=args.nr,
-            method=args.numerical,
-            data_type='numerical'
+            method=run_method(args.numerical, args.velocity, args.stencil),
+            data_type='numerical',
+            workers=args.workers,
+            Nx=args.nx,
+            velocity=args.velocity,
+            Ny=args.ny
         )
     else:
         generate_plots(
             dt=args.dt,
             profile=args.profile,
             nr=args.nr,
-            method=args.analytical,  # Pasa el método para mantener consistencia en nombres
-            data_type='analytical'
+            # Pasa el método para mantener consistencia en nombres
+            method=run_method(args.analytical, args.velocity, args.stencil),
+            data_type='analytical',
+            workers=args.workers,
+            Nx=args.nx,
+            velocity=args.velocity,
+            Ny=args.ny
         )
\ No newline at end of file
@@ -1,9 +1,20 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 import os
-import glob
+import time
+import atexit
 import argparse
+import tempfile
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
 from PIL import Image
+from src.animation import (render_frames, encode_gif, encode_ffmpeg, encode_imagemagick,
+                           resolve_engine, ENGINES, FORMATS)
+from src.catalog import Catalog
+from src import instrumentation
+from src.advection2d import STENCILS, VELOCITY_FIELDS
+from p02_generate_plots import find_data_file, frame_paths, run_method, DX
 #
 # Configuración de directorios
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -20,56 +31,90 @@ def crop_image(image_path, espacio=5):
     except Exception as e:
         print(f"Error al recortar {image_path}: {str(e)}")
         return None
-######################
-# def save_cropped_images(image_paths, temp_dir="temp_cropped"):
-#     """Guarda versiones recortadas en carpeta temporal"""
-#     os.makedirs(temp_dir, exist_ok=True)
-#     cropped_paths = []
-#     for img_path in image_paths:
-#         img = crop_image(img_path)
-#         img = img.resize((width//2, height//2))
-#         if img:
-#             new_path = os.path.join(temp_dir, os.path.basename(img_path))
-#             img.save(new_path)
-#             cropped_paths.append(new_path)
-#     return cropped_paths
+@contextmanager
+def stage(timings, name):
+    """Acumula en `timings[name]` el tiempo de pared de una etapa (también en `instrumentation`)"""
+    start = time.perf_counter()
+    try:
+        with instrumentation.stage(f"animación: {name}"):
+            yield
+    finally:
+        timings[name] = timings.get(name, 0.0) + time.perf_counter() - start
 
-# def create_gif_with_convert(image_paths, output_path, delay=50):
-#     """Crea GIF con ImageMagick usando os.system"""
-#     temp_dir = "temp_cropped"
-#     cropped_paths = save_cropped_images(image_paths, temp_dir)
-    
-#     if not cropped_paths:
-#         print("Error: No hay imágenes recortadas válidas")
-#         return
-    
-#     # Convert delay (ms to centisec)
-#     delay_cs = max(1, delay // 10)  # Asegura mínimo 1 centisegundo
-    
-#     # Construye comando
-#     cmd = f"convert -delay {delay_cs} -loop 0 {' '.join(sorted(cropped_paths))} {output_path}"
-#     # Ejecuta y verifica
-#     if os.system(cmd) == 0:
-#         print(f"GIF creado con convert: {output_path}")
-#         # Limpieza opcional:
-#         for img in cropped_paths:
-#             os.remove(img)
-#         os.rmdir(temp_dir)
-#     else:
-#         print("Error al ejecutar convert. ¿Está ImageMagick instalado?")
-# ######################
-######################
-def create_animation_with_crop(image_paths, output_path, duration=20):
+def print_timings(timings, engine, n_frames):
+    """Reporte de tiempos por etapa para comparar motores"""
+    total = sum(timings.values())
+    parts = ", ".join(f"{name} {seconds:.2f} s" for name, seconds in timings.items())
+    print(f"Tiempos [{engine}, {n_frames} cuadros]: {parts} (total {total:.2f} s)")
+
+def crop_images(image_paths, espacio=5, max_workers=4):
+    """Recorta las imágenes en paralelo con `max_workers` hilos
+
+    PIL libera el GIL al decodificar el PNG, así que los hilos escalan sin
+    copiar imágenes entre procesos. Conserva el orden de los cuadros.
+    """
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        cropped = list(pool.map(lambda path: crop_image(path, espacio), sorted(image_paths)))
+    return [img for img in cropped if img]
+
+def save_cropped_images(image_paths, temp_dir, espacio=5, max_workers=4):
+    """Guarda en paralelo versiones recortadas en una carpeta temporal"""
+    def crop_and_save(img_path):
+        img = crop_image(img_path, espacio)
+        if img is None:
+            return None
+        new_path = os.path.join(temp_dir, os.path.basename(img_path))
+        img.save(new_path)
+        return new_path
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        saved = list(pool.map(crop_and_save, sorted(image_paths)))
+    return [path for path in saved if path]
+
+def create_gif_with_convert(image_paths, output_path, delay=50, espacio=5, max_workers=4):
+    """Crea GIF con ImageMagick a partir de recortes temporales"""
+    timings = {}
+    with tempfile.TemporaryDirectory(prefix="cropped_") as temp_dir:
+        with stage(timings, "recorte"):
+            cropped_paths = save_cropped_images(image_paths, temp_dir, espacio, max_workers)
+        if not cropped_paths:
+            print("Error: No hay imágenes recortadas válidas")
+            return
+        try:
+            with stage(timings, "codificación"):
+                encode_imagemagick(cropped_paths, output_path, delay)
+        except Exception as e:
+            print(f"Error al ejecutar ImageMagick: {str(e)}")
+            return
+    print(f"GIF creado con ImageMagick: {output_path}")
+    print_timings(timings, "imagemagick", len(cropped_paths))
+
+def create_video_with_ffmpeg(image_paths, output_path, duration=50, espacio=5, max_workers=4):
+    """Crea GIF/MP4/WebM con ffmpeg (formato según la extensión de salida)"""
+    timings = {}
+    with stage(timings, "recorte"):
+        cropped_images = crop_images(image_paths, espacio, max_workers)
+    if not cropped_images:
+        print("Error: No hay imágenes válidas después del recorte")
+        return
+    try:
+        with stage(timings, "codificación"):
+            encode_ffmpeg((np.asarray(img) for img in cropped_images), output_path, duration)
+    except Exception as e:
+        print(f"Error al ejecutar ffmpeg: {str(e)}")
+        return
+    print(f"Animación creada con ffmpeg: {output_path}")
+    print_timings(timings, "ffmpeg", len(cropped_images))
+
+@instrumentation.timed()
+def create_animation_with_crop(image_paths, output_path, duration=20, espacio=5, max_workers=4):
     """Crea GIF con recorte de imágenes"""
     if not image_paths:
         print(f"Error: No se encontraron imágenes para animación")
         return
     
-    cropped_images = []
-    for img_path in sorted(image_paths):
-        cropped = crop_image(img_path)
-        if cropped:
-            cropped_images.append(cropped)
+    timings = {}
+    with stage(timings, "recorte"):
+        cropped_images = crop_images(image_paths, espacio, max_workers)
     
     if not cropped_images:
         print(f"Error: No hay imágenes válidas después del recorte")
@@ -77,32 +122,76 @@ def create_animation_with_crop(image_paths, output_path, duration=20):
     
     try:
         # Guardar GIF con tus parámetros originales
-        cropped_images[0].save(
-            output_path,
-            save_all=True,
-            append_images=cropped_images[1:],
-            duration=duration,
-            loop=0,
-            optimize=True
-        )
+        with stage(timings, "codificación"):
+            cropped_images[0].save(
+                output_path,
+                save_all=True,
+                append_images=cropped_images[1:],
+                duration=duration,
+                loop=0,
+                optimize=True
+            )
+        if instrumentation.is_enabled():
+            instrumentation.count("create_animation_with_crop", frames=len(cropped_images),
+                                  bytes=os.path.getsize(output_path))
         print(f"Animación con recorte creada: {output_path}")
+        print_timings(timings, "pillow", len(cropped_images))
     except Exception as e:
         print(f"Error al guardar GIF: {str(e)}")
 
-def find_image_sequence(method, dt, profile, nr=None, data_type='numerical'):
-    """Busca secuencias de imágenes con el patrón correcto"""
-    method_dir = method.replace(" ", "")
-    pattern = os.path.join(
-        OUTPUTS_DIR,
-        "figures",
-        method_dir,
-        f"3D*{method_dir}_dt{dt}_CFL*_dx500_profile{profile}"
-    )
-    if nr is not None:
-        pattern += f"_nr{nr}"
-    pattern += f"_{data_type}.png"
-    
-    return sorted(glob.glob(pattern))
+@instrumentation.timed()
+def create_animation_streaming(data_path, output_path, title, dt, profile, duration=50, espacio=5,
+                               engine="pillow"):
+    """Crea la animación renderizando cuadros en memoria, sin PNG intermedios
+
+    Con engine='ffmpeg' los cuadros se envían por la tubería a medida que se
+    dibujan; ImageMagick necesita archivos, así que aquí se usa Pillow. El
+    CFL del título se lee del archivo, como en p02.
+    """
+    frames = render_frames(data_path, title, float(dt), profile=profile, espacio=espacio)
+    timings = {}
+    try:
+        # El renderizado ocurre dentro del consumo del generador, junto con la codificación
+        with stage(timings, "render+codificación"):
+            if engine == "ffmpeg":
+                count = encode_ffmpeg(frames, output_path, duration)
+            else:
+                count = encode_gif(frames, output_path, duration)
+        print(f"Animación en memoria creada ({count} cuadros): {output_path}")
+        print_timings(timings, engine, count)
+    except Exception as e:
+        print(f"Error al generar animación en memoria: {str(e)}")
+
+def find_image_sequence(method, dt, profile, nr=None, data_type='numerical', Nx=None,
+                        velocity=None, Ny=None):
+    """Busca la secuencia de imágenes de una corrida a partir del catálogo de datos
+
+    El catálogo da el nombre del archivo y la cantidad de tiempos, así que las
+    rutas de los cuadros se construyen directamente, sin recorrer el directorio.
+    Con `Nx=None` no se filtra por tamaño de malla (se toma el más reciente);
+    `velocity` y `Ny` eligen entre corridas 2-D.
+    """
+    with Catalog(os.path.join(OUTPUTS_DIR, "data")) as catalog:
+        runs = catalog.find(method=method, data_type=data_type, dt=dt, nr=nr,
+                            profile=profile, dx=DX, Nx=Nx, Ny=Ny, velocity=velocity)
+    if not runs:
+        return []
+    base_name = os.path.basename(runs[0]["path"]).replace('.nc', '')
+    fig_dir = os.path.join(OUTPUTS_DIR, "figures", method.replace(" ", ""))
+    return [p for p in frame_paths(fig_dir, base_name, runs[0]["n_times"]) if os.path.exists(p)]
+
+def animation_name(method, dt, profile, nr=None, data_type='numerical', fmt='gif', Nx=101,
+                   velocity=None, Ny=None):
+    """Nombre del archivo de animación de una corrida (con el campo de velocidad si es 2-D)"""
+    output_name = method.replace(' ', '') + (f"_{velocity}" if velocity else "")
+    output_name += f"_dt{dt}_profile{profile}"
+    if nr:
+        output_name += f"_nr{nr}"
+    if Nx != 101:
+        output_name += f"_nx{Nx}"
+    if Ny:
+        output_name += f"_ny{Ny}"
+    return output_name + f"_{data_type}_cropped.{fmt}"
 
 def main():
     parser = argparse.ArgumentParser(
@@ -111,8 +200,14 @@ def main():
     
     # Estructura idéntica a p02_generate_plots.py
     parser.add_argument('--dt', type=float, required=True, help='Paso de tiempo (s)')
-    parser.add_argument('--profile', choices=['gauss', 'rectg'], required=True)
+    parser.add_argument('--profile', choices=['gauss', 'rectg', 'cone'], required=True,
+                        help="Perfil inicial ('cone' solo en 2-D)")
     parser.add_argument('--nr', type=float, help='Ancho de la gaussiana (requerido para profile=gauss)')
+    parser.add_argument('--nx', type=int, help='Puntos en la malla de la corrida (por defecto, cualquiera)')
+    parser.add_argument('--ny', type=int, help='Puntos en y de la corrida 2-D (por defecto, cualquiera)')
+    parser.add_argument('--velocity', choices=list(VELOCITY_FIELDS),
+                        help='Corrida 2-D con este campo de velocidad')
+    parser.add_argument('--stencil', choices=STENCILS, default='split', help='Esténcil de la corrida 2-D')
     
     # Grupo mutuamente excluyente
     group = parser.add_mutually_exclusive_group(required=True)
@@ -123,25 +218,62 @@ def main():
     parser.add_argument('--duration', type=int, default=50, help='Duración entre frames (ms)')
     parser.add_argument('--espacio', type=int, default=5, 
                        help='Parámetro de recorte (1/espacio superior, (espacio-1)/espacio inferior)')
-    parser.add_argument('--engine', choices=['pillow', 'imagemagick'], default='pillow',
-                   help='Motor para generar GIFs (default: pillow)')
+    parser.add_argument('--engine', choices=ENGINES, default='pillow',
+                   help='Motor de codificación (si falta el binario se usa pillow)')
+    parser.add_argument('--format', choices=FORMATS, default='gif',
+                        help='Formato de salida (mp4/webm requieren ffmpeg)')
+    parser.add_argument('--workers', type=int, default=4, help='Hilos para la etapa de recorte')
+    parser.add_argument('--stream', action='store_true',
+                        help='Renderizar desde el NetCDF en memoria, sin leer PNG de outputs/figures '
+                             '(cada cuadro se escribe al llegar: memoria acotada a dos cuadros)')
+    parser.add_argument('--profile-report', nargs='?', const='', metavar='JSON',
+                        help='Reporte de tiempos, bytes y pico de memoria por etapa (y JSON si se da ruta)')
     args = parser.parse_args()
+    if args.profile_report is not None:
+        instrumentation.enable()
+        atexit.register(instrumentation.emit_report, args.profile_report)
     
     # Validaciones
     if args.profile == 'gauss' and args.nr is None:
         parser.error("Se requiere --nr para perfil gaussiano")
     
     # Determinar tipo y método
-    method = args.numerical if args.numerical else args.analytical
+    method = run_method(args.numerical or args.analytical, args.velocity, args.stencil)
     data_type = 'numerical' if args.numerical else 'analytical'
     
+    # Preparar directorio de salida
+    output_dir = os.path.join(OUTPUTS_DIR, "animations")
+    os.makedirs(output_dir, exist_ok=True)
+    
+    # Nombre del archivo de salida
+    engine, fmt = resolve_engine(args.engine, args.format)
+    output_path = os.path.join(output_dir, animation_name(method, args.dt, args.profile, args.nr,
+                                                          data_type, fmt, args.nx or 101,
+                                                          args.velocity, args.ny))
+    
+    if args.stream:
+        data_path = find_data_file(args.dt, args.profile, args.nr, method, data_type, args.nx,
+                                   args.velocity, args.ny)
+        if not data_path:
+            print(f"\nNo se encontraron datos {data_type} para:")
+            print(f"method={method}, dt={args.dt}, profile={args.profile}" + (f", nr={args.nr}" if args.nr else ""))
+            return
+        print(f"\nGenerando animación en memoria (espacio={args.espacio})...")
+        title = f"{method} ({data_type})"
+        create_animation_streaming(data_path, output_path, title, args.dt, args.profile,
+                                   args.duration, args.espacio, engine)
+        return
+    
     # Buscar imágenes
     image_paths = find_image_sequence(
         method=method,
         dt=args.dt,
         profile=args.profile,
         nr=args.nr,
-        data_type=data_type
+        data_type=data_type,
+        Nx=args.nx,
+        velocity=args.velocity,
+        Ny=args.ny
     )
     
     if not image_paths:
@@ -149,24 +281,16 @@ def main():
         print(f"method={method}, dt={args.dt}, profile={args.profile}" + (f", nr={args.nr}" if args.nr else ""))
         return
     
-    # Preparar directorio de salida
-    output_dir = os.path.join(OUTPUTS_DIR, "animations")
-    os.makedirs(output_dir, exist_ok=True)
-    
-    # Nombre del archivo de salida
-    output_name = f"{method.replace(' ', '')}_dt{args.dt}_profile{args.profile}"
-    if args.nr:
-        output_name += f"_nr{args.nr}"
-    output_name += f"_{data_type}_cropped.gif"
-    output_path = os.path.join(output_dir, output_name)
-    
     # Crear animación con recorte
     print(f"\nGenerando animación con recorte (espacio={args.espacio})...")
     #create_animation_with_crop(image_paths, output_path, args.duration)
-    if args.engine == 'imagemagick':
-        create_gif_with_convert(image_paths, output_path, delay=args.duration, espacio=args.espacio, max_workers=4)
+    if engine == 'imagemagick':
+        create_gif_with_convert(image_paths, output_path, delay=args.duration, espacio=args.espacio,
+                                max_workers=args.workers)
+    elif engine == 'ffmpeg':
+        create_video_with_ffmpeg(image_paths, output_path, args.duration, args.espacio, args.workers)
     else:
-        create_animation_with_crop(image_paths, output_path, args.duration)
+        create_animation_with_crop(image_paths, output_path, args.duration, args.espacio, args.workers)
 
 if __name__ == "__main__":
     main()
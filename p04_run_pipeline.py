@@ -0,0 +1,242 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Corre simulación -> gráficos -> animación de una o muchas configuraciones en un solo proceso.
+
+Cada configuración aporta tres tareas (simulate, render, animate) a un grafo
+de dependencias; las tareas cuyas salidas siguen vigentes se omiten y las
+independientes se ejecutan a la vez en un pool de procesos. Con --batched
+cada barrido (método, Nx) es una sola tarea del motor vectorizado.
+
+    python p04_run_pipeline.py --method RK4 --sweep dt=30:60:5 --nr 2,10 --profile gauss --workers 8
+    python p04_run_pipeline.py --method RK4 --sweep dt=30:60:5 --nr 2,10 --profile gauss --batched
+    python p04_run_pipeline.py --config barrido.json
+"""
+import os
+import json
+import argparse
+from src.pipeline import Task, run, summary
+from src.schemes import get_scheme, available_schemes
+from src.kernels import BACKENDS, jit_available
+from src.sweep import build_members, parse_sweep, parse_values, PROFILES
+from src.data_handling import EncodingPolicy
+from src.cache import RunCache
+import p01_run_simulation as p01
+import p02_generate_plots as p02
+import p03_make_animation as p03
+
+STAGES = ("simulate", "render", "animate")
+STAMP_DIR = os.path.join(p01.OUTPUTS_DIR, "pipeline")
+
+def build_tasks(configs, total_steps=None, save_every=1, policy=None, cache=None, dtype="float64",
+                backend="numpy", write_analytical=True, until="animate", data_types=("numerical",),
+                stream=False, duration=50, espacio=5):
+    """Arma las tareas de cada configuración (ver `p01.build_configs`).
+
+    simulate escribe los NetCDF; render dibuja los PNG de cada archivo en
+    `data_types` y animate arma el GIF recortado a partir de ellos. Con
+    `stream` la animación se renderiza directo desde el NetCDF y no hay
+    tarea render. `until` corta el grafo en esa etapa.
+    Returns:
+        list: Objetos `Task`.
+    """
+    tasks = []
+    depth = STAGES.index(until)
+    for config in configs:
+        dt, nr, method, profile, Nx = (config['dt'], config['nr'], config['method'],
+                                       config['profile'], config['Nx'])
+        steps = Nx if total_steps is None else total_steps
+        base_name = p01.run_name(dt, nr, method, profile, Nx, dtype)
+        paths = p01.run_paths(base_name, write_analytical)
+        simulate = Task(
+            f"simulate:{base_name}", p01.run_simulation,
+            dict(dt=dt, nr=nr, method=method, profile=profile, Nx=Nx, total_steps=total_steps,
+                 save_every=save_every, policy=policy, cache=cache, write_analytical=write_analytical,
+                 dtype=dtype, backend=backend),
+            outputs=paths.values(),
+            params=p01.run_params(dt, nr, method, profile, Nx, total_steps, save_every, policy,
+                                  write_analytical, dtype))
+        tasks.append(simulate)
+        if depth < 1:
+            continue
+
+        fig_dir = os.path.join(p01.OUTPUTS_DIR, "figures", method.replace(" ", ""))
+        n_frames = len(range(0, steps, save_every))
+        for data_type in data_types:
+            data_path = paths[data_type]
+            title = f"{method} ({data_type})"
+            output_path = os.path.join(p01.OUTPUTS_DIR, "animations",
+                                       p03.animation_name(method, dt, profile, nr, data_type, Nx=Nx))
+            if stream:
+                if depth >= 2:
+                    tasks.append(Task(
+                        f"animate:{base_name}_{data_type}", p03.create_animation_streaming,
+                        dict(data_path=data_path, output_path=output_path, title=title, dt=dt,
+                             profile=profile, duration=duration, espacio=espacio),
+                        deps=[simulate.name], outputs=[output_path]))
+                continue
+            images = p02.frame_paths(fig_dir, os.path.basename(data_path).replace('.nc', ''), n_frames)
+            render = Task(
+                f"render:{base_name}_{data_type}", p02.render_file,
+                dict(data_path=data_path, fig_dir=fig_dir, title=title, profile=profile, dt=dt),
+                deps=[simulate.name], outputs=images)
+            tasks.append(render)
+            if depth >= 2:
+                tasks.append(Task(
+                    f"animate:{base_name}_{data_type}", p03.create_animation_with_crop,
+                    dict(image_paths=images, output_path=output_path, duration=duration,
+                         espacio=espacio),
+                    deps=[render.name], outputs=[output_path]))
+    return tasks
+
+def build_sweep_tasks(methods, dts, nrs, profiles, nxs=(101,), total_steps=None, save_every=1,
+                      policy=None, cache=None, dtype="float64", backend="numpy", write_analytical=True):
+    """Arma una tarea `sweep` por método y Nx con todos los miembros (dt, nr, perfil).
+
+    Cada tarea es una sola llamada a `p01.run_sweep_simulation` (arreglo
+    (miembros, Nx)) y su sello cubre el archivo del barrido completo: si
+    cambia un miembro se repite todo el barrido. Esos archivos tienen
+    dimensiones (member, step, X) y no se dibujan, así que no hay render
+    ni animate.
+    Returns:
+        list: Objetos `Task`.
+    """
+    members = build_members(dts, nrs, profiles)
+    tasks = []
+    for method in methods:
+        for Nx in nxs:
+            base_name = p01.sweep_name(method, dts, profiles, len(members), Nx, dtype)
+            tasks.append(Task(
+                f"sweep:{base_name}", p01.run_sweep_simulation,
+                dict(method=method, dts=dts, nrs=nrs, profiles=profiles, Nx=Nx, total_steps=total_steps,
+                     save_every=save_every, policy=policy, cache=cache,
+                     write_analytical=write_analytical, dtype=dtype, backend=backend),
+                outputs=[os.path.join(p01.DATA_DIR, f"{base_name}.nc")],
+                params=p01.sweep_params(method, members, Nx, total_steps, save_every, policy,
+                                        write_analytical, dtype)))
+    return tasks
+
+def load_config(path):
+    """Lee un archivo JSON de opciones {opción: valor} con los mismos nombres que la línea de comandos.
+
+    Las listas se aceptan en lugar de los valores separados por comas.
+    """
+    with open(path) as f:
+        config = json.load(f)
+    if not isinstance(config, dict):
+        raise ValueError(f"{path}: se esperaba un objeto JSON {{opción: valor}}.")
+    options = {}
+    for key, value in config.items():
+        key = key.lstrip("-").replace("-", "_")
+        if key == "sweep":
+            value = [value] if isinstance(value, str) else list(value)
+        elif isinstance(value, list):
+            value = ",".join(str(v) for v in value)
+        options[key] = value
+    return options
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Simulación, gráficos y animaciones en un solo grafo de tareas')
+    parser.add_argument('--config', metavar='JSON',
+                        help='Opciones desde un archivo JSON (la línea de comandos tiene prioridad)')
+    parser.add_argument('--method', help=f"Métodos numéricos separados por comas ({', '.join(available_schemes())})")
+    parser.add_argument('--dt', type=float, help='Paso de tiempo (s)')
+    parser.add_argument('--sweep', action='append', metavar='PARAM=VALORES',
+                        help="Valores de dt o nr, p. ej. 'dt=30:60:5' o 'nr=2,10' (repetible)")
+    parser.add_argument('--profile', help="Perfiles iniciales separados por comas: gauss, rectg")
+    parser.add_argument('--nr', help='Anchos de la gaussiana separados por comas')
+    parser.add_argument('--nx', default='101', help='Puntos en la malla (lista separada por comas)')
+    parser.add_argument('--steps', type=int, help='Pasos de tiempo a integrar (por defecto, Nx)')
+    parser.add_argument('--save-every', type=int, default=1, metavar='N', help='Guarda uno de cada N pasos')
+    parser.add_argument('--complevel', type=int, default=4, help='Nivel de compresión zlib (0 = sin compresión)')
+    parser.add_argument('--dtype', choices=['float64', 'float32'], default='float64',
+                        help='Precisión del esquema y del almacenamiento')
+    parser.add_argument('--backend', choices=BACKENDS, default='numpy',
+                        help='Motor de los esquemas: NumPy o núcleos compilados con numba')
+    parser.add_argument('--no-analytical', action='store_true',
+                        help='No escribe la solución analítica completa')
+    parser.add_argument('--analytical', action='store_true',
+                        help='Dibuja y anima también la solución analítica')
+    parser.add_argument('--until', choices=STAGES, default='animate', help='Última etapa a ejecutar')
+    parser.add_argument('--batched', action='store_true',
+                        help='Una tarea por método y Nx con todo el barrido vectorizado '
+                             '(un archivo por barrido, solo etapa simulate)')
+    parser.add_argument('--stream', action='store_true',
+                        help='Anima directo desde el NetCDF, sin PNG intermedios (sin etapa render)')
+    parser.add_argument('--duration', type=int, default=50, help='Duración entre frames (ms)')
+    parser.add_argument('--espacio', type=int, default=5, help='Parámetro de recorte de las imágenes')
+    parser.add_argument('--workers', type=int, default=1, help='Procesos para las tareas independientes')
+    parser.add_argument('--force', action='store_true', help='Ejecuta todas las tareas aunque estén al día')
+    parser.add_argument('--allow-unstable', action='store_true',
+                        help='Ejecuta igual las configuraciones inestables (solo avisa)')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='No consulta ni llena la caché de corridas de p01')
+
+    args = parser.parse_args(argv)
+    if args.config:
+        try:
+            options = load_config(args.config)
+        except (OSError, ValueError) as e:
+            parser.error(str(e))
+        unknown = sorted(key for key in options if key == 'config' or key not in vars(args))
+        if unknown:
+            parser.error(f"{args.config}: opciones desconocidas: {', '.join(unknown)}")
+        parser.set_defaults(**options)
+        args = parser.parse_args(argv)
+
+    if not args.method or not args.profile:
+        parser.error("Se requieren --method y --profile (o un --config que los defina)")
+    try:
+        methods = [m.strip() for m in str(args.method).split(',') if m.strip()]
+        for method in methods:
+            get_scheme(method)
+        profiles = parse_values(args.profile, str)
+        nrs = parse_values(args.nr) if args.nr is not None else []
+        nxs = parse_values(args.nx, int)
+        sweeps = dict(parse_sweep(spec) for spec in args.sweep or [])
+    except ValueError as e:
+        parser.error(str(e))
+    if any(p not in PROFILES for p in profiles):
+        parser.error("Perfil no válido. Usar 'gauss' o 'rectg'.")
+    nrs = sweeps.get('nr', nrs)
+    dts = sweeps.get('dt', [args.dt] if args.dt is not None else [])
+    if not dts:
+        parser.error("Se requiere --dt o --sweep dt=...")
+    if 'gauss' in profiles and not nrs:
+        parser.error("Se requiere --nr para perfil gaussiano")
+    if args.workers < 1 or args.save_every < 1 or (args.steps is not None and args.steps < 1):
+        parser.error("--workers, --steps y --save-every deben ser al menos 1")
+    if args.analytical and args.no_analytical:
+        parser.error("--analytical necesita el archivo analítico (sin --no-analytical)")
+    if args.batched and (args.analytical or args.stream):
+        parser.error("--batched solo simula: los archivos de barrido no se dibujan ni se animan")
+
+    problems = p01.unstable_configs(methods, dts, args.steps or max(nxs))
+    if problems and not args.allow_unstable:
+        parser.error("configuraciones inestables:\n  " + "\n  ".join(problems)
+                     + "\nUsar --allow-unstable para ejecutarlas igual.")
+    for problem in problems:
+        print(f"Aviso, inestable: {problem}")
+    if args.backend == 'jit' and not jit_available():
+        print("Aviso: numba no está instalado; se usa el backend NumPy.")
+        args.backend = 'numpy'
+
+    configs = p01.build_configs(methods, dts, nrs, profiles, nxs)
+    policy = EncodingPolicy(args.complevel, dtype=args.dtype)
+    cache = None if args.no_cache else RunCache(p01.CACHE_DIR)
+    if args.batched:
+        tasks = build_sweep_tasks(methods, dts, nrs, profiles, nxs, args.steps, args.save_every, policy,
+                                  cache, args.dtype, args.backend, not args.no_analytical)
+    else:
+        tasks = build_tasks(
+            configs, args.steps, args.save_every, policy, cache, args.dtype, args.backend,
+            not args.no_analytical, args.until,
+            ("numerical", "analytical") if args.analytical else ("numerical",),
+            args.stream, args.duration, args.espacio)
+    print(f"{len(configs)} configuraciones, {len(tasks)} tareas, {args.workers} procesos")
+    status = run(tasks, args.workers, STAMP_DIR, args.force)
+    counts = summary(status)
+    print("Resumen: " + ", ".join(f"{state} {n}" for state, n in sorted(counts.items())))
+    return 1 if counts.get("failed") or counts.get("blocked") else 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
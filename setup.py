@@ -9,6 +9,7 @@ setup(
         "xarray>=0.20.0",
         "matplotlib>=3.5.0",
         "pandas>=1.3.0",
-        "pillow>=9.0.0"
+        "pillow>=9.0.0",
+        "netCDF4>=1.5.0"
     ],
 )
\ No newline at end of file
@@ -0,0 +1,172 @@
+import os
+import itertools
+import shutil
+import subprocess
+import numpy as np
+from PIL import Image, GifImagePlugin
+from .visualization import make_renderer
+from .data_handling import FrameReader, extrude_y
+
+ENGINES = ("pillow", "imagemagick", "ffmpeg")
+FORMATS = ("gif", "mp4", "webm")
+
+def find_encoder(engine):
+    """Ruta del binario externo de un motor (None si no está instalado o es 'pillow')."""
+    if engine == "imagemagick":
+        return shutil.which("magick") or shutil.which("convert")
+    if engine == "ffmpeg":
+        return shutil.which("ffmpeg")
+    return None
+
+def resolve_engine(engine, fmt="gif"):
+    """Decide el motor y el formato efectivos.
+
+    MP4/WebM solo los produce ffmpeg. Si el binario pedido no está
+    instalado se avisa y se usa Pillow con salida GIF.
+    Returns:
+        tuple: (motor, formato).
+    """
+    if engine not in ENGINES:
+        raise ValueError(f"Motor no válido: '{engine}'. Usar uno de: {', '.join(ENGINES)}.")
+    if fmt not in FORMATS:
+        raise ValueError(f"Formato no válido: '{fmt}'. Usar uno de: {', '.join(FORMATS)}.")
+    if fmt != "gif" and engine != "ffmpeg":
+        print(f"El formato {fmt} requiere ffmpeg; se usa ese motor.")
+        engine = "ffmpeg"
+    if engine != "pillow" and find_encoder(engine) is None:
+        print(f"No se encontró el binario de {engine}; se usa Pillow (GIF).")
+        return "pillow", "gif"
+    return engine, fmt
+
+def crop_frame(frame, espacio=5):
+    """Recorta un cuadro (alto, ancho, canales) manteniendo la franja central.
+
+    Misma regla que `crop_image` de p03 (de 1/espacio a (espacio-1)/espacio
+    de la altura), pero por slicing: devuelve una vista, sin copiar.
+    """
+    height = frame.shape[0]
+    return frame[height // espacio:(espacio - 1) * height // espacio]
+
+def render_frames(data_path, metodo, dt, CFL=None, profile="gauss", dpi=200, espacio=5):
+    """Genera los cuadros recortados de un archivo NetCDF directamente en memoria.
+
+    Lee un tiempo por vez (`FrameReader`), lo dibuja con un único
+    renderizador (`SurfaceRenderer`, o `FieldRenderer` si el archivo es 2-D)
+    y entrega el arreglo RGBA recortado. Cada cuadro es una vista del
+    lienzo: el consumidor debe usarlo (o copiarlo) antes de pedir el
+    siguiente, de modo que en memoria hay un solo cuadro a la vez. Con
+    `CFL=None` el título usa el atributo `CFL_number` del archivo (correcto
+    para cualquier Nx, DX o campo de velocidad 2-D).
+    """
+    import matplotlib
+    matplotlib.use("Agg")
+    with FrameReader(data_path) as frames:
+        CFL = float(frames.attrs["CFL_number"]) if CFL is None else CFL
+        renderer = make_renderer(metodo, profile, frames.is_2d)
+        try:
+            for ti in range(len(frames)):
+                renderer.draw(extrude_y(frames.frame(ti)), ti, dt, CFL)
+                yield crop_frame(renderer.to_array(dpi), espacio)
+        finally:
+            renderer.close()
+
+def encode_gif(frames, output_path, duration=50):
+    """Codifica un GIF escribiendo cada cuadro en el archivo apenas llega.
+
+    Cada cuadro se escribe con los ayudantes de cuadro de Pillow
+    (`GifImagePlugin.getheader`/`getdata`) y con la misma optimización que
+    `save(..., optimize=True)`: solo el rectángulo que cambió respecto del
+    anterior, con los píxeles sin cambios transparentes (se comprimen como
+    una racha) y una paleta adaptativa propia (tabla de colores local). En
+    memoria quedan a lo sumo dos cuadros (el actual y el anterior, para
+    comparar), igual que en la tubería de `encode_ffmpeg`.
+    Returns:
+        int: Número de cuadros escritos.
+    """
+    count = 0
+    previous = None
+    with open(output_path, "wb") as fp:
+        for frame in frames:
+            rgb = np.ascontiguousarray(np.asarray(frame)[..., :3])
+            if previous is None:
+                image = Image.fromarray(rgb).convert("P", palette=Image.Palette.ADAPTIVE)
+                header, _ = GifImagePlugin.getheader(image, info={"loop": 0})
+                fp.write(b"".join(header))
+                data = GifImagePlugin.getdata(image, duration=duration, include_color_table=True)
+            else:
+                changed = np.any(rgb != previous, axis=2)
+                rows, cols = np.flatnonzero(changed.any(axis=1)), np.flatnonzero(changed.any(axis=0))
+                # Cuadro idéntico: se repite un solo píxel
+                top, bottom = (rows[0], rows[-1] + 1) if rows.size else (0, 1)
+                left, right = (cols[0], cols[-1] + 1) if cols.size else (0, 1)
+                # 255 colores: el índice 255 queda libre como transparente
+                image = Image.fromarray(rgb[top:bottom, left:right]).convert(
+                    "P", palette=Image.Palette.ADAPTIVE, colors=255)
+                indices = np.array(image)
+                indices[~changed[top:bottom, left:right]] = 255
+                palette = image.getpalette()[:255 * 3]
+                image = Image.fromarray(indices, "P")
+                image.putpalette(palette + [0] * (768 - len(palette)))
+                data = GifImagePlugin.getdata(image, offset=(left, top), duration=duration,
+                                              transparency=255, include_color_table=True)
+            fp.write(b"".join(data))
+            fp.flush()
+            previous = rgb
+            count += 1
+        fp.write(b";")  # fin del GIF
+    if count == 0:
+        os.remove(output_path)
+        raise ValueError("No hay cuadros para la animación.")
+    return count
+
+def encode_imagemagick(image_paths, output_path, duration=50):
+    """Codifica un GIF con ImageMagick (`magick` o `convert`) a partir de archivos."""
+    binary = find_encoder("imagemagick")
+    if binary is None:
+        raise FileNotFoundError("No se encontró ImageMagick ('magick' o 'convert') en el PATH.")
+    if not image_paths:
+        raise ValueError("No hay cuadros para la animación.")
+    delay_cs = max(1, duration // 10)  # ImageMagick usa centésimas de segundo
+    cmd = [binary, "-delay", str(delay_cs), "-loop", "0", *map(str, image_paths), str(output_path)]
+    subprocess.run(cmd, check=True)
+    return len(image_paths)
+
+def encode_ffmpeg(frames, output_path, duration=50, ffmpeg="ffmpeg"):
+    """Codifica con ffmpeg enviando cuadros RGB(A) crudos por stdin.
+
+    El formato se deduce de la extensión (.gif, .mp4, .webm, ...). Cada
+    cuadro se escribe en la tubería apenas se genera, así que la memoria
+    queda acotada a un cuadro.
+    Returns:
+        int: Número de cuadros escritos.
+    """
+    binary = shutil.which(ffmpeg)
+    if binary is None:
+        raise FileNotFoundError(f"No se encontró '{ffmpeg}' en el PATH.")
+    frames = iter(frames)
+    first = next(frames, None)
+    if first is None:
+        raise ValueError("No hay cuadros para la animación.")
+    height, width = first.shape[:2]
+    pix_fmt = "rgba" if first.shape[2] == 4 else "rgb24"
+    cmd = [binary, "-loglevel", "error", "-y",
+           "-f", "rawvideo", "-pix_fmt", pix_fmt, "-s", f"{width}x{height}",
+           "-framerate", f"{1000 / duration:g}", "-i", "-"]
+    if not str(output_path).endswith(".gif"):
+        if str(output_path).endswith(".webm"):
+            cmd += ["-c:v", "libvpx-vp9", "-b:v", "0", "-crf", "32"]
+        else:
+            cmd += ["-c:v", "libx264"]
+        # yuv420p requiere dimensiones pares
+        cmd += ["-vf", "pad=ceil(iw/2)*2:ceil(ih/2)*2", "-pix_fmt", "yuv420p"]
+    proc = subprocess.Popen(cmd + [str(output_path)], stdin=subprocess.PIPE)
+    count = 0
+    try:
+        for frame in itertools.chain([first], frames):
+            proc.stdin.write(np.ascontiguousarray(frame).tobytes())
+            count += 1
+    finally:
+        proc.stdin.close()
+        if proc.wait() != 0:
+            raise RuntimeError(f"ffmpeg terminó con código {proc.returncode}.")
+    return count
@@ -0,0 +1,191 @@
+import hashlib
+import json
+import os
+import shutil
+import time
+import uuid
+
+CACHE_DIR = "outputs/cache"
+MANIFEST = "manifest.json"
+
+# Código que determina los resultados: todo `src/` más el script de simulación
+# (que arma las corridas y escribe los archivos). Cambiarlo invalida la caché.
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DRIVER_FILES = ("p01_run_simulation.py",)
+
+def code_files(base_dir=None):
+    """Rutas (relativas a `base_dir`) de los archivos que entran en la huella del código."""
+    base_dir = BASE_DIR if base_dir is None else base_dir
+    modules = sorted(name for name in os.listdir(os.path.join(base_dir, "src")) if name.endswith(".py"))
+    return [f"src/{name}" for name in modules] + list(DRIVER_FILES)
+
+def code_version(base_dir=None):
+    """Huella (sha256 abreviado) de todos los módulos de `src/` y del script de simulación."""
+    base_dir = BASE_DIR if base_dir is None else base_dir
+    digest = hashlib.sha256()
+    for name in code_files(base_dir):
+        with open(os.path.join(base_dir, name), "rb") as f:
+            digest.update(name.encode())
+            digest.update(f.read())
+    return digest.hexdigest()[:16]
+
+def _canonical(value):
+    """Normaliza valores para que parámetros equivalentes den la misma clave."""
+    if isinstance(value, dict):
+        return {str(k): _canonical(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_canonical(v) for v in value]
+    if hasattr(value, "item"):  # escalares de numpy
+        value = value.item()
+    if isinstance(value, (bool, str)) or value is None:
+        return value
+    if isinstance(value, (int, float)):
+        # 30 y 30.0 son el mismo dt; NaN (nr del perfil rectangular) no es JSON válido
+        value = float(value)
+        return None if value != value else value
+    return str(value)
+
+def run_key(params):
+    """Clave de contenido: sha256 de los parámetros canónicos más la versión del código.
+
+    Args:
+        params (dict): Conjunto completo de parámetros de la corrida
+            (esquema, dt, dx, U, Nx, pasos, perfil, nr, codificación, ...).
+    Returns:
+        str: Clave hexadecimal.
+    """
+    payload = dict(_canonical(params), code_version=code_version())
+    text = json.dumps(payload, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(text.encode()).hexdigest()
+
+class RunCache:
+    """Caché de resultados direccionada por contenido.
+
+    Cada entrada es un directorio `<clave>/` con los archivos de la corrida
+    y un `manifest.json` (parámetros, archivos, tamaño, último uso). Las
+    entradas se publican con un `rename` atómico, así que varios procesos o
+    trabajos pueden compartir el mismo directorio. Cuando el total supera
+    `max_bytes` se eliminan las entradas usadas hace más tiempo (LRU).
+    Args:
+        directory (str): Directorio de la caché.
+        max_bytes (int): Tamaño máximo antes de desalojar entradas.
+    """
+
+    def __init__(self, directory=CACHE_DIR, max_bytes=2 * 1024 ** 3):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+
+    def _entry(self, key):
+        return os.path.join(self.directory, key)
+
+    def _read_manifest(self, key):
+        try:
+            with open(os.path.join(self._entry(key), MANIFEST)) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write_manifest(self, entry, manifest):
+        tmp = os.path.join(entry, f".{MANIFEST}.{uuid.uuid4().hex}")
+        with open(tmp, "w") as f:
+            json.dump(manifest, f, indent=1, sort_keys=True)
+        os.replace(tmp, os.path.join(entry, MANIFEST))
+
+    def get(self, key):
+        """Devuelve {nombre: ruta} de una entrada en caché (o None) y marca su uso."""
+        manifest = self._read_manifest(key)
+        if manifest is None:
+            return None
+        entry = self._entry(key)
+        paths = {name: os.path.join(entry, fname) for name, fname in manifest["files"].items()}
+        if not all(os.path.exists(p) for p in paths.values()):
+            return None
+        manifest["last_used"] = time.time()
+        manifest["hits"] = manifest.get("hits", 0) + 1
+        try:
+            self._write_manifest(entry, manifest)
+        except OSError:  # entrada desalojada por otro proceso
+            return None
+        return paths
+
+    def put(self, key, files, params=None):
+        """Copia los archivos {nombre: ruta} bajo la clave y desaloja si hace falta.
+
+        Returns:
+            dict: Rutas de los archivos dentro de la caché.
+        """
+        staging = os.path.join(self.directory, f".tmp-{key}-{uuid.uuid4().hex}")
+        os.makedirs(staging)
+        size = 0
+        for path in files.values():
+            shutil.copyfile(path, os.path.join(staging, os.path.basename(path)))
+            size += os.path.getsize(path)
+        now = time.time()
+        self._write_manifest(staging, {
+            "key": key,
+            "params": _canonical(params or {}),
+            "code_version": code_version(),
+            "files": {name: os.path.basename(path) for name, path in files.items()},
+            "size": size,
+            "created": now,
+            "last_used": now,
+            "hits": 0,
+        })
+        try:
+            os.rename(staging, self._entry(key))
+        except OSError:  # otro proceso publicó la misma clave primero
+            shutil.rmtree(staging, ignore_errors=True)
+        self.evict(keep=key)
+        return self.get(key)
+
+    def fetch(self, key, destinations):
+        """Copia una entrada en caché a {nombre: ruta destino}; True si hubo acierto."""
+        paths = self.get(key)
+        if paths is None or set(paths) != set(destinations):
+            return False
+        for name, dest in destinations.items():
+            os.makedirs(os.path.dirname(os.path.abspath(dest)), exist_ok=True)
+            shutil.copyfile(paths[name], dest)
+        return True
+
+    def entries(self):
+        """Manifiestos de todas las entradas publicadas."""
+        manifests = []
+        for key in os.listdir(self.directory):
+            if key.startswith("."):
+                continue
+            manifest = self._read_manifest(key)
+            if manifest is not None:
+                manifests.append(manifest)
+        return manifests
+
+    def size(self):
+        """Tamaño total de las entradas (bytes)."""
+        return sum(m["size"] for m in self.entries())
+
+    def evict(self, keep=None):
+        """Elimina entradas LRU hasta quedar bajo `max_bytes`.
+
+        Args:
+            keep (str, optional): Clave que nunca se desaloja (la recién guardada).
+        Returns:
+            list: Claves eliminadas.
+        """
+        entries = sorted(self.entries(), key=lambda m: m["last_used"])
+        total = sum(m["size"] for m in entries)
+        removed = []
+        for manifest in entries:
+            if total <= self.max_bytes:
+                break
+            if manifest["key"] == keep:
+                continue
+            shutil.rmtree(self._entry(manifest["key"]), ignore_errors=True)
+            total -= manifest["size"]
+            removed.append(manifest["key"])
+        return removed
+
+    def clear(self):
+        """Vacía la caché."""
+        for key in os.listdir(self.directory):
+            shutil.rmtree(os.path.join(self.directory, key), ignore_errors=True)
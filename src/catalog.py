@@ -0,0 +1,211 @@
+import glob
+import os
+import re
+import sqlite3
+import netCDF4
+import numpy as np
+
+CATALOG_NAME = "catalog.sqlite"
+TIME_UNITS = "seconds since 2020-01-01 00:00:00"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    path TEXT PRIMARY KEY,      -- nombre del archivo, relativo al directorio del catálogo
+    method TEXT,
+    method_key TEXT,            -- nombre normalizado ('Euler Backward' -> 'eulerbackward')
+    data_type TEXT,
+    profile TEXT,
+    dt REAL,
+    nr REAL,
+    dx REAL,
+    u REAL,
+    nx INTEGER,
+    ny INTEGER,                 -- solo corridas 2-D
+    velocity TEXT,              -- campo de velocidad 2-D ('uniform', 'rotation', ...)
+    cfl REAL,
+    n_times INTEGER,
+    t_start REAL,
+    t_end REAL,
+    size INTEGER,
+    mtime REAL,
+    schema_version INTEGER
+);
+CREATE INDEX IF NOT EXISTS runs_params ON runs (method_key, data_type, profile, dt, nr);
+"""
+
+_COLUMNS = ("path", "method", "method_key", "data_type", "profile", "dt", "nr", "dx", "u", "nx",
+            "ny", "velocity", "cfl", "n_times", "t_start", "t_end", "size", "mtime", "schema_version")
+
+# Columnas que los catálogos más antiguos no tienen (se agregan al abrirlos)
+_ADDED_COLUMNS = {"ny": "INTEGER", "velocity": "TEXT"}
+
+def method_key(name):
+    """Clave normalizada de un método; resuelve alias registrados ('EB' -> 'eulerbackward')."""
+    from .schemes import get_scheme, _normalize
+    try:
+        name = get_scheme(name).name
+    except ValueError:
+        pass
+    return _normalize(name)
+
+def _number(value, digits=9):
+    """Redondea para que 30, 30.0 y 30.000000000001 coincidan en las consultas."""
+    return None if value is None else round(float(value), digits)
+
+def _parse_parameters(text):
+    """Interpreta 'U=10, Nx=101, DX=500, dt=30.0, ...' (atributo `simulation_parameters`)."""
+    params = {}
+    for item in str(text).split(","):
+        key, sep, value = item.partition("=")
+        if sep:
+            params[key.strip()] = value.strip()
+    return params
+
+def read_metadata(path):
+    """Lee parámetros, tamaño y rango temporal de la cabecera de un NetCDF de salida."""
+    with netCDF4.Dataset(path) as nc:
+        attrs = {k: nc.getncattr(k) for k in nc.ncattrs()}
+        times = nc["time"]
+        # Solo el primer y último tiempo (los barridos guardan time(member, step))
+        values = np.asarray(times[:] if times.ndim > 1 else np.r_[times[:1], times[-1:]])
+        if values.size:
+            seconds = netCDF4.date2num(
+                netCDF4.num2date([values.min(), values.max()], times.units,
+                                 getattr(times, "calendar", "standard")),
+                TIME_UNITS, getattr(times, "calendar", "standard"))
+            t_start, t_end = (float(s) for s in seconds)
+        else:
+            t_start = t_end = None
+        n_times = nc.dimensions["step" if "step" in nc.dimensions else "time"].size
+        nx = nc.dimensions["X"].size
+
+    params = _parse_parameters(attrs.get("simulation_parameters", ""))
+    name = os.path.basename(path)
+    # Archivos antiguos sin atributo 'method': el nombre empieza con el método
+    method = attrs.get("method") or re.split(r"_dt|_sweep", name)[0]
+    stat = os.stat(path)
+    return {
+        "path": name,
+        "method": method,
+        "method_key": method_key(method),
+        "data_type": attrs.get("data_type"),
+        "profile": params.get("profile"),
+        "dt": _number(params.get("dt")),
+        "nr": _number(params["nr"]) if "nr" in params else None,
+        "dx": _number(params.get("DX", attrs.get("dx"))),
+        "u": _number(params.get("U")),
+        "nx": nx,
+        "ny": int(params["Ny"]) if "Ny" in params else None,
+        "velocity": params.get("velocity"),
+        "cfl": _number(attrs.get("CFL_number")),
+        "n_times": n_times,
+        "t_start": t_start,
+        "t_end": t_end,
+        "size": stat.st_size,
+        "mtime": stat.st_mtime,
+        "schema_version": int(attrs.get("schema_version", 1)),
+    }
+
+class Catalog:
+    """Índice persistente (SQLite) de los NetCDF de un directorio de salida.
+
+    `save_dataset` y `StreamingWriter` registran cada archivo al escribirlo,
+    así que ubicar una corrida es una consulta indexada por parámetros en
+    lugar de un glob sobre el directorio. Si el catálogo no existe, se
+    construye una vez recorriendo los archivos ya presentes.
+    Args:
+        data_dir (str): Directorio de los NetCDF (el catálogo vive dentro).
+    """
+
+    def __init__(self, data_dir="outputs/data"):
+        self.data_dir = data_dir
+        self.path = os.path.join(data_dir, CATALOG_NAME)
+        os.makedirs(data_dir, exist_ok=True)
+        is_new = not os.path.exists(self.path)
+        self._db = sqlite3.connect(self.path, timeout=30)
+        self._db.row_factory = sqlite3.Row
+        with self._db:
+            self._db.executescript(_SCHEMA)
+            columns = {row["name"] for row in self._db.execute("PRAGMA table_info(runs)")}
+            # Catálogos de versiones anteriores: se agregan las columnas y se reindexa
+            added = [c for c in _ADDED_COLUMNS if c not in columns]
+            for column in added:
+                self._db.execute(f"ALTER TABLE runs ADD COLUMN {column} {_ADDED_COLUMNS[column]}")
+        if is_new or added:
+            self.rebuild()
+
+    def register(self, path):
+        """Agrega o actualiza la entrada de un archivo."""
+        row = read_metadata(path)
+        with self._db:
+            self._db.execute(
+                f"INSERT OR REPLACE INTO runs ({', '.join(_COLUMNS)}) "
+                f"VALUES ({', '.join('?' * len(_COLUMNS))})",
+                [row[c] for c in _COLUMNS])
+        return row
+
+    def remove(self, path):
+        """Elimina la entrada de un archivo."""
+        with self._db:
+            self._db.execute("DELETE FROM runs WHERE path = ?", (os.path.basename(path),))
+
+    def rebuild(self):
+        """Reconstruye el índice recorriendo una vez los NetCDF del directorio."""
+        with self._db:
+            self._db.execute("DELETE FROM runs")
+        for path in sorted(glob.glob(os.path.join(self.data_dir, "*.nc"))):
+            try:
+                self.register(path)
+            except (OSError, KeyError, IndexError):
+                print(f"Catálogo: se omite {os.path.basename(path)} (no es una salida reconocible)")
+
+    def find(self, method=None, data_type=None, dt=None, nr=None, profile=None, dx=None, Nx=None,
+             Ny=None, velocity=None):
+        """Busca corridas por parámetros (los que son None no filtran).
+
+        `velocity` y `Ny` distinguen las corridas 2-D de igual dt, perfil y Nx.
+
+        Returns:
+            list: Diccionarios con las columnas del índice y `path` absoluto,
+            del más reciente al más antiguo. Las entradas cuyo archivo ya no
+            existe se eliminan del índice.
+        """
+        filters = {"method_key": method_key(method) if method is not None else None,
+                   "data_type": data_type, "profile": profile, "dt": _number(dt),
+                   "nr": _number(nr), "dx": _number(dx), "nx": Nx,
+                   "ny": Ny, "velocity": velocity}
+        filters = {k: v for k, v in filters.items() if v is not None}
+        where = " AND ".join(f"{k} = ?" for k in filters) or "1"
+        rows = self._db.execute(f"SELECT * FROM runs WHERE {where} ORDER BY mtime DESC",
+                                list(filters.values())).fetchall()
+        found = []
+        for row in rows:
+            entry = dict(row)
+            entry["path"] = os.path.join(self.data_dir, row["path"])
+            if os.path.exists(entry["path"]):
+                found.append(entry)
+            else:
+                self.remove(row["path"])
+        return found
+
+    def find_one(self, **query):
+        """Ruta del archivo más reciente que cumple la consulta (o None)."""
+        found = self.find(**query)
+        return found[0]["path"] if found else None
+
+    def close(self):
+        self._db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def register_file(path):
+    """Registra un archivo en el catálogo de su directorio sin interrumpir la escritura."""
+    try:
+        with Catalog(os.path.dirname(os.path.abspath(path))) as catalog:
+            catalog.register(path)
+    except (sqlite3.Error, OSError, KeyError) as e:
+        print(f"Catálogo: no se pudo registrar {os.path.basename(path)}: {e}")
@@ -0,0 +1,67 @@
+import os
+import numpy as np
+
+CHECKPOINT_DIR = "outputs/checkpoints"
+
+class Checkpointer:
+    """Guarda y recupera checkpoints de una integración larga.
+
+    Cada `every` pasos escribe en un `.npz` todos los niveles pronósticos
+    del esquema (`Scheme.state()`, incluido el nivel n-1 de Leapfrog), el
+    paso alcanzado y cuántos tiempos ya están en el archivo de salida. La
+    escritura es atómica (archivo temporal + `os.replace`): si el proceso
+    muere a mitad, el checkpoint anterior sigue intacto.
+    Args:
+        path (str): Archivo del checkpoint.
+        every (int, optional): Pasos entre checkpoints (None = no guarda).
+        meta (dict, optional): Parámetros de la corrida; al reanudar deben
+            coincidir con los del checkpoint.
+    """
+
+    def __init__(self, path, every=None, meta=None):
+        self.path = path
+        self.every = every
+        self.meta = dict(meta or {})
+
+    def due(self, n):
+        """Indica si corresponde guardar después del paso `n`."""
+        return bool(self.every) and n > 0 and n % self.every == 0
+
+    def save(self, scheme, frames):
+        """Escribe el estado del esquema y la cantidad de tiempos ya guardados."""
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        arrays = {f"level_{name}": value for name, value in scheme.state().items()
+                  if name != "nstep"}
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "wb") as f:
+            np.savez(f, nstep=scheme.nstep, frames=frames,
+                     meta=np.array(sorted((k, str(v)) for k, v in self.meta.items())), **arrays)
+        os.replace(tmp, self.path)
+
+    def exists(self):
+        return os.path.exists(self.path)
+
+    def load(self):
+        """Lee el checkpoint y verifica que corresponde a la misma corrida.
+
+        Returns:
+            dict: Estado para `Scheme.restore` más la clave `frames`.
+        """
+        if not self.exists():
+            raise FileNotFoundError(f"No hay checkpoint para reanudar: {self.path}")
+        with np.load(self.path) as data:
+            saved = {k: v for k, v in data["meta"].tolist()}
+            expected = {k: str(v) for k, v in self.meta.items()}
+            if saved != expected:
+                diff = sorted(k for k in set(saved) | set(expected) if saved.get(k) != expected.get(k))
+                raise ValueError(f"El checkpoint {self.path} no corresponde a esta corrida "
+                                 f"(difieren: {', '.join(diff)}).")
+            state = {k[len("level_"):]: data[k] for k in data.files if k.startswith("level_")}
+            state["nstep"] = int(data["nstep"])
+            state["frames"] = int(data["frames"])
+        return state
+
+    def remove(self):
+        """Elimina el checkpoint (al terminar la corrida)."""
+        if self.exists():
+            os.remove(self.path)
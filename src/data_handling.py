@@ -2,32 +2,588 @@ import xarray as xr
 import os
 import pandas as pd
 import numpy as np
+import netCDF4
+import time
+from xarray.backends import BackendArray
+from xarray.core import indexing
+from .catalog import register_file
+from . import instrumentation
+
+# Versión del formato de archivo: 1 = (time, Y, X) con Y duplicado, 2 = (time, X)
+SCHEMA_VERSION = 2
 
 def create_dataset(M, Nx, dx, T):
-    """Crea un dataset xarray a partir de los resultados de la simulación."""
-    data_3d = np.tile(np.array(M)[:, np.newaxis, :], (1, 2, 1))
+    """Crea un dataset xarray (time, X) a partir de los resultados de la simulación.
+
+    El eje Y no se almacena; `extrude_y` lo reconstruye como vista cuando se
+    necesita (p. ej. para `plot_3d_surface`).
+    """
     time = pd.Timestamp('2020-01-01') + pd.to_timedelta(T, unit='s')
     return xr.Dataset(
-        {"conc_unids": (["time", "Y", "X"], data_3d)},
-        coords={"time": time, "X": np.arange(Nx), "Y": [-dx/2, dx/2]}
+        {"conc_unids": (["time", "X"], np.array(M))},
+        coords={"time": time, "X": np.arange(Nx)},
+        attrs={"schema_version": SCHEMA_VERSION, "dx": dx}
     )
 
-def save_dataset(ds, filename, output_dir="outputs/data"):
-    """Guarda el dataset en NetCDF con compresión eficiente."""
-    os.makedirs(output_dir, exist_ok=True)
-    path = os.path.join(output_dir, f"{filename}.nc")
-    
-    encoding = {
-        "conc_unids": {
-            "zlib": True,
-            "complevel": 4  # Compresión balanceada (1-9)
+def create_dataset_2d(M, Nx, Ny, dx, dy, T):
+    """Crea un dataset xarray (time, Y, X) de una simulación 2-D real."""
+    time = pd.Timestamp('2020-01-01') + pd.to_timedelta(T, unit='s')
+    return xr.Dataset(
+        {"conc_unids": (["time", "Y", "X"], np.array(M))},
+        coords={"time": time, "Y": np.arange(Ny), "X": np.arange(Nx)},
+        attrs={"schema_version": SCHEMA_VERSION, "dx": dx, "dy": dy}
+    )
+
+def is_legacy(attrs, dims):
+    """Formato antiguo: Y duplicado y sin `schema_version` (los 2-D reales lo tienen)."""
+    return "Y" in dims and "schema_version" not in attrs
+
+def compact_dataset(ds):
+    """Convierte un dataset del formato antiguo (time, Y, X) al compacto (time, X).
+
+    Las dos filas Y son idénticas, así que basta con seleccionar la primera
+    (selección perezosa, sin copiar datos). Los datasets compactos y los
+    2-D reales se devuelven sin cambios.
+    """
+    if not is_legacy(ds.attrs, ds.dims):
+        return ds
+    dx = float(ds.Y[1] - ds.Y[0])
+    compact = ds.isel(Y=0, drop=True)
+    compact.attrs.update({"schema_version": SCHEMA_VERSION, "dx": dx})
+    return compact
+
+class _ExtrudedY(BackendArray):
+    """Variable (…, X) vista como (…, Y=2, X) sin leerla.
+
+    Cada acceso lee de la variable original solo la porción pedida (sin el
+    eje Y) y repite las dos filas por broadcasting, así que una variable
+    perezosa de un NetCDF abierto no se carga completa.
+    """
+
+    def __init__(self, variable, axis):
+        self.variable = variable
+        self.axis = axis
+        self.shape = variable.shape[:axis] + (2,) + variable.shape[axis:]
+        self.dtype = variable.dtype
+
+    def __getitem__(self, key):
+        return indexing.explicit_indexing_adapter(key, self.shape, indexing.IndexingSupport.BASIC,
+                                                  self._getitem)
+
+    def _getitem(self, key):
+        y = key[self.axis]
+        values = np.asarray(self.variable[key[:self.axis] + key[self.axis + 1:]].values)
+        if not isinstance(y, slice):
+            return values
+        # Posición de Y en el resultado: los índices enteros anteriores eliminan ejes
+        axis = sum(isinstance(k, slice) for k in key[:self.axis])
+        values = np.expand_dims(values, axis)
+        shape = values.shape[:axis] + (len(range(*y.indices(2))),) + values.shape[axis + 1:]
+        return np.broadcast_to(values, shape)
+
+def extrude_y(ds):
+    """Vista (…, Y, X) del dataset compacto para graficar superficies.
+
+    Las dos filas Y se generan por broadcasting (sin copiar datos), por lo
+    que las variables resultantes son de solo lectura. Las variables aún no
+    cargadas (dataset abierto desde disco) siguen siendo perezosas: solo se
+    lee lo que se selecciona.
+    """
+    if "Y" in ds.dims:
+        return ds
+    dx = ds.attrs["dx"]
+    data_vars = {}
+    for name, var in ds.data_vars.items():
+        if "X" not in var.dims:
+            data_vars[name] = var
+            continue
+        axis = var.dims.index("X")
+        dims = var.dims[:axis] + ("Y",) + var.dims[axis:]
+        if var.variable._in_memory:
+            values = np.expand_dims(var.values, axis)
+            shape = values.shape[:axis] + (2,) + values.shape[axis + 1:]
+            data = np.broadcast_to(values, shape)
+        else:
+            data = indexing.LazilyIndexedArray(_ExtrudedY(var.variable, axis))
+        data_vars[name] = xr.Variable(dims, data, var.attrs)
+    coords = {name: coord for name, coord in ds.coords.items()}
+    coords["Y"] = [-dx/2, dx/2]
+    return xr.Dataset(data_vars, coords=coords, attrs=ds.attrs)
+
+class EncodingPolicy:
+    """Política de codificación de las variables al escribir NetCDF.
+
+    Args:
+        complevel (int): Nivel de compresión zlib (0 = sin compresión, 1-9).
+        shuffle (bool): Aplica el filtro shuffle antes de comprimir.
+        chunk_time (int): Pasos de tiempo por chunk (chunks pequeños favorecen
+            la lectura cuadro a cuadro).
+        dtype (str): 'float64' o 'float32' para el almacenamiento.
+        quantize (float, optional): Cota del error absoluto. Si se indica, los
+            datos se empaquetan en int16 con scale_factor = 2*quantize y
+            add_offset = 0, de modo que |error| <= quantize y el rango
+            representable es ±32767*scale_factor; los valores fuera de rango
+            (o no finitos) se guardan como faltantes.
+    """
+    time_dims = ("time", "step")
+    max_chunk_values = 2 ** 20
+    fill_value = np.int16(-32768)
+
+    def __init__(self, complevel=4, shuffle=True, chunk_time=16, dtype="float64", quantize=None):
+        if not 0 <= complevel <= 9:
+            raise ValueError("complevel debe estar entre 0 y 9.")
+        if dtype not in ("float64", "float32"):
+            raise ValueError("dtype de almacenamiento no válido. Usar 'float64' o 'float32'.")
+        if chunk_time < 1 or (quantize is not None and quantize <= 0):
+            raise ValueError("chunk_time y quantize deben ser positivos.")
+        self.complevel = complevel
+        self.shuffle = shuffle
+        self.chunk_time = chunk_time
+        self.dtype = dtype
+        self.quantize = quantize
+
+    @property
+    def scale_factor(self):
+        return 2.0 * self.quantize
+
+    def __repr__(self):
+        return (f"complevel={self.complevel}, shuffle={self.shuffle}, chunk_time={self.chunk_time}, "
+                f"dtype={self.dtype}, quantize={self.quantize}")
+
+    def attrs(self):
+        """Atributos que documentan la política en el archivo."""
+        attrs = {"encoding_policy": repr(self)}
+        if self.quantize is not None:
+            attrs["quantization_error_bound"] = self.quantize
+        return attrs
+
+    def chunks(self, dims, shape):
+        """Tamaño de chunk: `chunk_time` pasos, un miembro y el resto completo.
+
+        Los pasos por chunk se reducen para no superar `max_chunk_values`
+        (un cuadro 2-D de 1000x1000 ya ocupa un chunk entero).
+        """
+        frame = int(np.prod([n for d, n in zip(dims, shape) if d not in self.time_dims + ("member",)]))
+        steps = max(1, min(self.chunk_time, self.max_chunk_values // max(frame, 1)))
+        return tuple(min(steps, n) if d in self.time_dims else (1 if d == "member" else n)
+                     for d, n in zip(dims, shape))
+
+    def prepare(self, data):
+        """Marca como faltantes los valores que no se pueden empaquetar."""
+        if self.quantize is None:
+            return data
+        limit = 32767 * self.scale_factor
+        return np.ma.masked_where(~np.isfinite(data) | (np.abs(data) > limit), data)
+
+    def variable_encoding(self, var):
+        """Diccionario de `encoding` de xarray para una variable."""
+        encoding = {
+            "zlib": self.complevel > 0,
+            "complevel": self.complevel,
+            "shuffle": self.shuffle and self.complevel > 0,
+            "chunksizes": self.chunks(var.dims, var.shape),
+        }
+        if self.quantize is not None:
+            encoding.update({"dtype": "int16", "scale_factor": self.scale_factor,
+                             "add_offset": 0.0, "_FillValue": self.fill_value})
+        else:
+            encoding["dtype"] = self.dtype
+        return encoding
+
+    def netcdf4_kwargs(self, dims, shape):
+        """Argumentos de `netCDF4.Dataset.createVariable` para una variable."""
+        kwargs = {
+            "datatype": "i2" if self.quantize is not None else self.dtype,
+            "zlib": self.complevel > 0,
+            "complevel": self.complevel,
+            "shuffle": self.shuffle and self.complevel > 0,
+            "chunksizes": self.chunks(dims, shape),
         }
-    }
+        if self.quantize is not None:
+            kwargs["fill_value"] = self.fill_value
+        return kwargs
+
+def save_dataset(ds, filename, output_dir="outputs/data", policy=None, report=False):
+    """Guarda el dataset en NetCDF con compresión eficiente.
+
+    Args:
+        policy (EncodingPolicy, optional): Codificación de los campos (variables
+            con dimensión X; por defecto, zlib nivel 4 en float64). Las series
+            1-D, como los diagnósticos, se guardan sin cambios en float64.
+        report (bool): Imprime el tiempo de escritura y los bytes escritos.
+    """
+    path = os.path.join(output_dir, f"{filename}.nc")
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    policy = policy or EncodingPolicy()
+    fields = [var for var in ds.data_vars if "X" in ds[var].dims]
+
+    if policy.quantize is not None:
+        limit = 32767 * policy.scale_factor
+        ds = ds.copy()
+        for var in fields:
+            ds[var] = ds[var].where(np.abs(ds[var]) <= limit)
+    ds = ds.assign_attrs(policy.attrs())
+    encoding = {var: policy.variable_encoding(ds[var]) for var in fields}
     
-    ds.to_netcdf(path, encoding=encoding)
+    start = time.perf_counter()
+    with instrumentation.stage("save_dataset"):
+        ds.to_netcdf(path, encoding=encoding)
+    if instrumentation.is_enabled():
+        instrumentation.count("save_dataset", bytes=os.path.getsize(path))
+    if report:
+        print(write_report(path, time.perf_counter() - start))
+    register_file(path)
     return path
 
+def write_report(path, seconds):
+    """Resumen de escritura: bytes en disco y tiempo empleado."""
+    nbytes = os.path.getsize(path)
+    return f"{os.path.basename(path)}: {nbytes / 1e6:.3f} MB escritos en {seconds:.3f} s"
+
+def open_dataset(path, **kwargs):
+    """Abre un NetCDF de cualquier versión del formato y lo devuelve compacto (time, X)."""
+    return compact_dataset(xr.open_dataset(path, **kwargs))
+
 def load_dataset(filename, output_dir="outputs/data"):
-    """Carga un dataset desde NetCDF."""
+    """Carga un dataset desde NetCDF (formato compacto, también para archivos antiguos)."""
     path = os.path.join(output_dir, f"{filename}.nc")
-    return xr.open_dataset(path)
+    return open_dataset(path)
+
+class StreamingWriter:
+    """Escribe la simulación en NetCDF a medida que avanza, con memoria acotada.
+
+    Abre el archivo con una dimensión temporal ilimitada y agrega los pasos en
+    bloques de `buffer_steps`, con la misma estructura compacta (time, X) que
+    `create_dataset` (legible con `load_dataset`). Se usa como gestor de contexto:
+
+        with StreamingWriter("corrida", Nx, dx, attrs={...}) as writer:
+            writer.append(Cn, t)
+    Args:
+        filename (str): Nombre del archivo sin extensión.
+        Nx (int): Puntos en la malla.
+        dx (float): Espaciado del grid (m).
+        output_dir (str): Directorio de salida.
+        attrs (dict, optional): Atributos globales del archivo.
+        buffer_steps (int): Pasos acumulados en memoria antes de escribir.
+        policy (EncodingPolicy, optional): Codificación de `conc_unids`.
+        resume (int, optional): Reabre un archivo existente y continúa
+            escribiendo a partir de ese índice de tiempo (reinicio desde un
+            checkpoint); los tiempos posteriores se sobrescriben.
+        series (dict, optional): Series 1-D sobre `time` a crear, nombre ->
+            atributos (p. ej. `diagnostics.METRICS`); se escriben con `write_series`.
+        Ny (int, optional): Puntos en y para campos 2-D reales (time, Y, X).
+        dy (float, optional): Espaciado en y (m); por defecto, `dx`.
+    """
+    time_units = "seconds since 2020-01-01 00:00:00"
+
+    def __init__(self, filename, Nx, dx, output_dir="outputs/data", attrs=None,
+                 buffer_steps=64, policy=None, resume=None, series=None, Ny=None, dy=None):
+        self.path = os.path.join(output_dir, f"{filename}.nc")
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self.buffer_steps = buffer_steps
+        self.policy = policy or EncodingPolicy()
+        # El buffer ya en la precisión de almacenamiento (la mitad de memoria en float32)
+        shape = (Nx,) if Ny is None else (Ny, Nx)
+        dims = ("time", "X") if Ny is None else ("time", "Y", "X")
+        self._buffer = np.empty((buffer_steps,) + shape, dtype=self.policy.dtype)
+        self._times = np.empty(buffer_steps)
+        self._pending = 0
+        self.nsteps = 0
+        self.write_seconds = 0.0
+
+        if resume is not None:
+            self._nc = netCDF4.Dataset(self.path, "a")
+            self._var = self._nc["conc_unids"]
+            if resume > self._var.shape[0]:
+                raise ValueError(f"{self.path} tiene {self._var.shape[0]} tiempos; "
+                                 f"no se puede reanudar en el {resume}.")
+            self.nsteps = resume
+            return
+        self._nc = netCDF4.Dataset(self.path, "w")
+        self._nc.createDimension("time", None)
+        if Ny is not None:
+            self._nc.createDimension("Y", Ny)
+            self._nc.createVariable("Y", "i8", ("Y",))[:] = np.arange(Ny)
+        self._nc.createDimension("X", Nx)
+        time_var = self._nc.createVariable("time", "f8", ("time",))
+        time_var.units = self.time_units
+        time_var.calendar = "proleptic_gregorian"
+        self._nc.createVariable("X", "i8", ("X",))[:] = np.arange(Nx)
+        self._var = self._nc.createVariable(
+            "conc_unids", dimensions=dims,
+            **self.policy.netcdf4_kwargs(dims, (self.policy.chunk_time,) + shape)
+        )
+        if self.policy.quantize is not None:
+            self._var.scale_factor = self.policy.scale_factor
+            self._var.add_offset = 0.0
+        for name, var_attrs in (series or {}).items():
+            self._nc.createVariable(name, "f8", ("time",)).setncatts(var_attrs)
+        grid = {"dx": dx} if Ny is None else {"dx": dx, "dy": dx if dy is None else dy}
+        self._nc.setncatts({"schema_version": SCHEMA_VERSION, **grid,
+                            **self.policy.attrs(), **(attrs or {})})
+
+    def append(self, field, t):
+        """Agrega un paso (campo Nx o (Ny, Nx) en el tiempo `t`, en segundos)."""
+        self._buffer[self._pending] = field
+        self._times[self._pending] = t
+        self._pending += 1
+        if self._pending == self.buffer_steps:
+            self.flush()
+
+    def flush(self):
+        """Escribe en disco los pasos acumulados en el buffer."""
+        n, k = self.nsteps, self._pending
+        if k:
+            start = time.perf_counter()
+            with instrumentation.stage("netcdf_write", frames=k):
+                self._nc["time"][n:n + k] = self._times[:k]
+                self._var[n:n + k] = self.policy.prepare(self._buffer[:k])
+            self.write_seconds += time.perf_counter() - start
+            self.nsteps += k
+            self._pending = 0
+
+    def write_series(self, start, values):
+        """Escribe series 1-D (nombre -> arreglo) a partir del índice de tiempo `start`."""
+        begin = time.perf_counter()
+        for name, data in values.items():
+            self._nc[name][start:start + len(data)] = data
+        self.write_seconds += time.perf_counter() - begin
+
+    def sync(self):
+        """Escribe el buffer y fuerza el volcado a disco (antes de un checkpoint)."""
+        self.flush()
+        self._nc.sync()
+
+    def close(self):
+        """Vacía el buffer, cierra el archivo y lo registra en el catálogo."""
+        if self._nc.isopen():
+            self.flush()
+            start = time.perf_counter()
+            with instrumentation.stage("netcdf_write"):
+                self._nc.close()
+            self.write_seconds += time.perf_counter() - start
+            if instrumentation.is_enabled():
+                instrumentation.count("netcdf_write", bytes=os.path.getsize(self.path))
+            register_file(self.path)
+        return self.path
+
+    def report(self):
+        """Resumen de escritura (bytes en disco y tiempo empleado en escribir)."""
+        return write_report(self.path, self.write_seconds)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+class SweepWriter:
+    """Escribe un barrido (member, step, X) por bloques de pasos guardados, con memoria acotada.
+
+    Produce la misma estructura que `save_dataset` sobre el resultado de
+    `sweep.run_sweep` (campos (member, step, X), series (member, step) y
+    coordenadas por miembro), pero cada bloque se escribe al llegar con
+    `write`, así que el historial completo nunca está en memoria.
+    Args:
+        filename (str): Nombre del archivo sin extensión.
+        Nx (int): Puntos en la malla.
+        dx (float): Espaciado del grid (m).
+        steps (array): Índices de los pasos guardados.
+        times (array): Tiempos en segundos, forma (member, step).
+        coords (dict): Coordenadas por miembro, nombre -> arreglo (p. ej. dt, nr, profile, CFL).
+        output_dir (str): Directorio de salida.
+        attrs (dict, optional): Atributos globales del archivo.
+        policy (EncodingPolicy, optional): Codificación de los campos.
+        fields (tuple): Nombres de los campos (member, step, X).
+        series (dict, optional): Series (member, step), nombre -> atributos.
+    """
+    time_units = StreamingWriter.time_units
+
+    def __init__(self, filename, Nx, dx, steps, times, coords, output_dir="outputs/data", attrs=None,
+                 policy=None, fields=("conc_unids",), series=None):
+        self.path = os.path.join(output_dir, f"{filename}.nc")
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self.policy = policy or EncodingPolicy()
+        self.write_seconds = 0.0
+        members, n_steps = np.shape(times)
+        dims = ("member", "step", "X")
+        # Como xarray: las coordenadas sin dimensión propia se enlazan por atributo
+        linked = " ".join(list(coords) + ["time"])
+
+        self._nc = netCDF4.Dataset(self.path, "w")
+        for name, size, values in (("member", members, np.arange(members)),
+                                   ("step", n_steps, steps), ("X", Nx, np.arange(Nx))):
+            self._nc.createDimension(name, size)
+            self._nc.createVariable(name, "i8", (name,))[:] = values
+        for name, values in coords.items():
+            values = np.asarray(values)
+            if values.dtype.kind in "US":
+                self._nc.createVariable(name, str, ("member",))[:] = values.astype(object)
+            else:
+                self._nc.createVariable(name, "f8", ("member",))[:] = values
+        time_var = self._nc.createVariable("time", "f8", ("member", "step"))
+        time_var.units = self.time_units
+        time_var.calendar = "proleptic_gregorian"
+        time_var[:] = times
+        for name in fields:
+            var = self._nc.createVariable(
+                name, dimensions=dims, **self.policy.netcdf4_kwargs(dims, (members, n_steps, Nx)))
+            if self.policy.quantize is not None:
+                var.scale_factor = self.policy.scale_factor
+                var.add_offset = 0.0
+            var.coordinates = linked
+        for name, var_attrs in (series or {}).items():
+            self._nc.createVariable(name, "f8", ("member", "step")).setncatts(
+                {**var_attrs, "coordinates": linked})
+        self._nc.setncatts({"schema_version": SCHEMA_VERSION, "dx": dx,
+                            **self.policy.attrs(), **(attrs or {})})
+
+    def write(self, start, fields, series=None):
+        """Escribe un bloque de pasos a partir del índice `start`.
+
+        Args:
+            fields (dict): Nombre -> arreglo (member, k, X).
+            series (dict, optional): Nombre -> arreglo (member, k).
+        """
+        members, k = next(iter(fields.values())).shape[:2]
+        begin = time.perf_counter()
+        with instrumentation.stage("netcdf_write", frames=members * k):
+            for name, data in fields.items():
+                self._nc[name][:, start:start + k] = self.policy.prepare(data)
+            for name, data in (series or {}).items():
+                self._nc[name][:, start:start + k] = data
+        self.write_seconds += time.perf_counter() - begin
+
+    def close(self):
+        """Cierra el archivo y lo registra en el catálogo."""
+        if self._nc.isopen():
+            start = time.perf_counter()
+            with instrumentation.stage("netcdf_write"):
+                self._nc.close()
+            self.write_seconds += time.perf_counter() - start
+            if instrumentation.is_enabled():
+                instrumentation.count("netcdf_write", bytes=os.path.getsize(self.path))
+            register_file(self.path)
+        return self.path
+
+    def report(self):
+        """Resumen de escritura (bytes en disco y tiempo empleado en escribir)."""
+        return write_report(self.path, self.write_seconds)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+class ArrayWriter:
+    """Versión en memoria de `StreamingWriter`: copia cada paso en un arreglo preasignado."""
+
+    def __init__(self, out):
+        self.out = out
+        self.times = np.empty(len(out))
+        self.nsteps = 0
+
+    def append(self, field, t):
+        self.out[self.nsteps] = field
+        self.times[self.nsteps] = t
+        self.nsteps += 1
+
+    def sync(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        pass
+
+class FrameReader:
+    """Acceso perezoso cuadro a cuadro a un NetCDF de simulación.
+
+    Lee solo el cuadro pedido (netCDF4 descomprime únicamente los chunks que
+    lo contienen) y lo copia en un único buffer reutilizable, sin cargar ni
+    modificar la variable completa. Acepta archivos compactos, antiguos
+    (time, Y, X) con Y duplicado y 2-D reales (cuadros (Y, X)). Se usa como
+    gestor de contexto:
+
+        with FrameReader(path) as frames:
+            for ti in range(len(frames)):
+                ds_t = frames.frame(ti)
+    """
+
+    def __init__(self, path, variable="conc_unids"):
+        self.path = path
+        self._nc = netCDF4.Dataset(path)
+        self._var = self._nc[variable]
+        self.variable = variable
+        self._legacy = is_legacy(self._nc.ncattrs(), self._var.dimensions)
+        self.is_2d = "Y" in self._var.dimensions and not self._legacy
+        self.X = self._nc["X"][:]
+        self.Y = self._nc["Y"][:] if self.is_2d else None
+        if self._legacy:
+            Y = self._nc["Y"][:]
+            self.dx = float(Y[1] - Y[0])
+        else:
+            self.dx = float(self._nc.getncattr("dx"))
+        self.attrs = {k: self._nc.getncattr(k) for k in self._nc.ncattrs()}
+        self.attrs.update({"schema_version": SCHEMA_VERSION, "dx": self.dx})
+        # Buffer en la precisión del archivo: float32 no se promueve a float64.
+        # Los datos empaquetados en int16 (16 bits de información) se
+        # desempaquetan aquí directamente en float32.
+        self._scale = getattr(self._var, "scale_factor", None)
+        if self._scale is not None:
+            self._var.set_auto_scale(False)
+            self.dtype = np.dtype(np.float32)
+            self._scale = self.dtype.type(self._scale)
+            self._offset = self.dtype.type(getattr(self._var, "add_offset", 0.0))
+        else:
+            self.dtype = self._var.dtype if self._var.dtype.kind == "f" else np.dtype(float)
+        self._buffer = np.empty(self._var.shape[1:] if self.is_2d else len(self.X), dtype=self.dtype)
+
+    def __len__(self):
+        return self._var.shape[0]
+
+    def read(self, ti, out=None):
+        """Lee el cuadro `ti` en `out` (por defecto, el buffer interno reutilizable)."""
+        out = self._buffer if out is None else out
+        index = (ti, 0) if self._legacy else ti
+        # Solo la lectura cruda reserva memoria; la conversión se hace dentro de `out`
+        raw = self._var[index]
+        if self._scale is not None:
+            np.multiply(np.ma.getdata(raw), self._scale, out=out)
+            np.add(out, self._offset, out=out)
+        else:
+            np.copyto(out, np.ma.getdata(raw))
+        mask = np.ma.getmask(raw)
+        if mask is not np.ma.nomask:
+            np.copyto(out, np.nan, where=mask)
+        return out
+
+    def frame(self, ti):
+        """Dataset (X) o (Y, X) del cuadro `ti`, apoyado en el buffer interno."""
+        if self.is_2d:
+            return xr.Dataset(
+                {self.variable: (["Y", "X"], self.read(ti))},
+                coords={"Y": self.Y, "X": self.X},
+                attrs=self.attrs
+            )
+        return xr.Dataset(
+            {self.variable: (["X"], self.read(ti))},
+            coords={"X": self.X},
+            attrs=self.attrs
+        )
+
+    def __iter__(self):
+        for ti in range(len(self)):
+            yield self.frame(ti)
+
+    def close(self):
+        if self._nc.isopen():
+            self._nc.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,101 @@
+import numpy as np
+from . import instrumentation
+
+# Series de diagnóstico por paso guardado: nombre -> atributos de la variable
+METRICS = {
+    "err_l1": {"long_name": "Error L1: media de |C - C_analítica|", "units": "Unids"},
+    "err_l2": {"long_name": "Error L2: raíz del error cuadrático medio", "units": "Unids"},
+    "err_linf": {"long_name": "Error L∞: máximo de |C - C_analítica|", "units": "Unids"},
+    "mass": {"long_name": "Masa: suma de C por dx", "units": "Unids m"},
+    "variance": {"long_name": "Varianza (invariante cuadrático): suma de C² por dx",
+                 "units": "Unids² m"},
+    "peak": {"long_name": "Amplitud máxima de C", "units": "Unids"},
+    "peak_position": {"long_name": "Posición del máximo de C", "units": "m"},
+}
+
+def compute_metrics(C, reference, dx, dtype=np.float64):
+    """Calcula todas las métricas con reducciones vectorizadas sobre el último eje.
+
+    Acepta bloques de cualquier forma (..., Nx): un paso, (tiempo, Nx) o
+    (miembros, pasos, Nx); cada métrica tiene la forma de los ejes previos.
+    Args:
+        C (array): Campo numérico.
+        reference (array): Solución analítica (misma forma que `C`).
+        dx (float): Espaciado de la malla (m).
+        dtype: Precisión de las acumulaciones (solo las reducciones). Con
+            float64 (por defecto) un campo float32 se suma en doble precisión
+            sin copiarlo, y la deriva de masa medida es la del esquema, no la
+            de la suma. Las diferencias se calculan en la precisión de los
+            campos, así que float32 no redondea un campo float64.
+    Returns:
+        dict: Nombre de la métrica (ver `METRICS`) -> arreglo de tipo `dtype`.
+    """
+    C = np.asarray(C)
+    dtype = np.dtype(dtype).type
+    error = np.abs(np.subtract(C, reference))
+    peak_index = np.argmax(C, axis=-1)
+    return {
+        "err_l1": error.mean(axis=-1, dtype=dtype),
+        "err_l2": np.sqrt(np.einsum("...i,...i->...", error, error, dtype=dtype, casting="same_kind")
+                          / dtype(C.shape[-1])),
+        "err_linf": error.max(axis=-1).astype(dtype),
+        "mass": C.sum(axis=-1, dtype=dtype) * dtype(dx),
+        "variance": np.einsum("...i,...i->...", C, C, dtype=dtype, casting="same_kind") * dtype(dx),
+        "peak": np.take_along_axis(C, peak_index[..., None], axis=-1)[..., 0].astype(dtype),
+        "peak_position": (peak_index * dtype(dx)).astype(dtype),
+    }
+
+def metric_variables(metrics, dims):
+    """Variables de xarray {nombre: (dims, valores, atributos)} para agregar a un dataset."""
+    return {name: (dims, np.asarray(values), METRICS[name]) for name, values in metrics.items()}
+
+class DiagnosticsStage:
+    """Etapa de diagnóstico en línea para el bucle de simulación.
+
+    Copia cada paso guardado en un buffer de `block_size` filas; al llenarse,
+    evalúa la solución de referencia para todo el bloque en una llamada y
+    calcula las métricas con `compute_metrics`, entregándolas a `sink`. Así
+    el campo analítico completo nunca necesita escribirse en disco.
+    Args:
+        reference (callable): reference(tiempos) -> arreglo (len(tiempos), Nx).
+        Nx (int): Puntos en la malla.
+        dx (float): Espaciado de la malla (m).
+        sink (callable): sink(índice inicial, métricas) recibe cada bloque
+            (p. ej. `StreamingWriter.write_series`).
+        block_size (int): Pasos por bloque.
+        start (int): Índice del primer paso (distinto de 0 al reanudar).
+        dtype: Precisión de acumulación (ver `compute_metrics`); el buffer se
+            crea en la precisión del primer campo recibido, sin convertirlo.
+    """
+
+    def __init__(self, reference, Nx, dx, sink, block_size=64, start=0, dtype=np.float64):
+        self.reference = reference
+        self.dx = dx
+        self.sink = sink
+        self.dtype = dtype
+        self._shape = (block_size, Nx)
+        self._buffer = None
+        self._times = np.empty(block_size)
+        self._pending = 0
+        self.count = start
+
+    def record(self, field, t):
+        """Agrega un paso guardado (campo numérico en el tiempo `t`, en segundos)."""
+        if self._buffer is None:
+            self._buffer = np.empty(self._shape, dtype=np.asarray(field).dtype)
+        self._buffer[self._pending] = field
+        self._times[self._pending] = t
+        self._pending += 1
+        if self._pending == len(self._buffer):
+            self.flush()
+
+    def flush(self):
+        """Calcula y entrega las métricas de los pasos acumulados."""
+        k = self._pending
+        if k:
+            with instrumentation.stage("diagnostics", frames=k):
+                reference = self.reference(self._times[:k])
+                metrics = compute_metrics(self._buffer[:k], reference, self.dx, self.dtype)
+            self.sink(self.count, metrics)
+            self.count += k
+            self._pending = 0
@@ -0,0 +1,134 @@
+import functools
+import numpy as np
+
+try:  # scipy es opcional: aporta la factorización tridiagonal de LAPACK
+    from scipy.linalg import get_lapack_funcs
+except ImportError:  # pragma: no cover - depende del entorno
+    get_lapack_funcs = None
+
+SOLVER_KINDS = ("auto", "banded", "fft")
+
+class CyclicTridiagonalSolver:
+    """Resuelve sistemas tridiagonales periódicos de coeficientes constantes.
+
+    Cada fila es lower*x_{j-1} + diag*x_j + upper*x_{j+1} = d_j, con
+    x_{-1} = x_{Nx-1} y x_{Nx} = x_0. Las esquinas se tratan con la fórmula de
+    Sherman-Morrison, de modo que basta factorizar una vez (LAPACK gttrf) la
+    parte tridiagonal y cada resolución cuesta O(Nx). Requiere scipy.
+    Como `scipy.linalg`, revisa el `info` de LAPACK: un sistema singular
+    lanza `np.linalg.LinAlgError` en lugar de devolver NaN.
+    """
+
+    def __init__(self, lower, diag, upper, Nx):
+        if get_lapack_funcs is None:
+            raise ImportError("El solver 'banded' requiere scipy; usar kind='fft'.")
+        if diag == 0:
+            raise np.linalg.LinAlgError("Sistema cíclico con diagonal nula (sin pivote para Sherman-Morrison).")
+        self.Nx = Nx
+        gamma = -diag
+        dl = np.full(Nx - 1, lower, dtype=float)
+        d = np.full(Nx, diag, dtype=float)
+        du = np.full(Nx - 1, upper, dtype=float)
+        d[0] -= gamma
+        d[-1] -= upper * lower / gamma
+        gttrf, self._gttrs = get_lapack_funcs(("gttrf", "gttrs"), (d,))
+        *self._factors, info = gttrf(dl, d, du)
+        if info > 0:
+            raise np.linalg.LinAlgError(f"Sistema tridiagonal singular: U({info},{info}) es cero (gttrf).")
+        if info < 0:
+            raise ValueError(f"Argumento {-info} no válido en gttrf.")
+        # Corrección de Sherman-Morrison: A = B + u v^T
+        u = np.zeros(Nx)
+        u[0], u[-1] = gamma, upper
+        self._v_last = lower / gamma
+        self._z = self._solve_banded(u)
+        terms = (1.0, self._z[0], self._v_last * self._z[-1])
+        self._denom = sum(terms)
+        # Denominador nulo dentro del redondeo de la suma: A es singular aunque B no lo sea
+        if not abs(self._denom) > Nx * np.finfo(float).eps * sum(abs(t) for t in terms):
+            raise np.linalg.LinAlgError("Sistema cíclico singular (denominador de Sherman-Morrison nulo).")
+
+    def _solve_banded(self, rhs):
+        b = np.asarray(rhs, dtype=float)
+        shape = b.shape
+        b = b.reshape(-1, self.Nx).T
+        x, info = self._gttrs(*self._factors, b)
+        if info != 0:
+            raise ValueError(f"Argumento {-info} no válido en gttrs.")
+        return x.T.reshape(shape)
+
+    def solve(self, rhs, out=None):
+        """Resuelve A x = rhs sobre el último eje (acepta lotes (miembros, Nx))."""
+        y = self._solve_banded(rhs)
+        factor = (y[..., 0] + self._v_last * y[..., -1]) / self._denom
+        if out is None:
+            out = np.empty_like(y)
+        return np.subtract(y, np.multiply.outer(factor, self._z), out=out)
+
+class CirculantSolver:
+    """Resuelve sistemas circulantes por FFT en O(Nx log Nx).
+
+    La matriz periódica de coeficientes constantes es circulante, así que se
+    diagonaliza con la FFT: x = irfft(rfft(d) / rfft(c)), con c su primera
+    columna. Sus autovalores se calculan una sola vez. Si los coeficientes
+    son arreglos de largo M, representa M sistemas distintos que se resuelven
+    en lote sobre un lado derecho de forma (M, Nx).
+    """
+
+    def __init__(self, lower, diag, upper, Nx):
+        self.Nx = Nx
+        lower, diag, upper = np.broadcast_arrays(lower, diag, upper)
+        column = np.zeros(lower.shape + (Nx,))
+        column[..., 0] = diag
+        column[..., 1] += lower
+        column[..., -1] += upper
+        self._eigenvalues = np.fft.rfft(column)
+        if np.any(self._eigenvalues == 0):
+            raise np.linalg.LinAlgError("Sistema circulante singular.")
+
+    def solve(self, rhs, out=None):
+        """Resuelve A x = rhs sobre el último eje (acepta lotes (miembros, Nx))."""
+        x = np.fft.irfft(np.fft.rfft(rhs) / self._eigenvalues, n=self.Nx)
+        if out is None:
+            return x
+        out[...] = x
+        return out
+
+@functools.lru_cache(maxsize=64)
+def _cached_solver(kind, lower, diag, upper, Nx):
+    if kind == "banded":
+        return CyclicTridiagonalSolver(lower, diag, upper, Nx)
+    return CirculantSolver(np.array(lower), np.array(diag), np.array(upper), Nx)
+
+def get_solver(lower, diag, upper, Nx, kind="auto"):
+    """Devuelve un solver factorizado, reutilizado entre llamadas con iguales parámetros.
+
+    Args:
+        lower, diag, upper (float): Coeficientes de la fila periódica.
+        Nx (int): Puntos en la malla.
+        kind (str): 'banded' (LAPACK, O(Nx)), 'fft' (O(Nx log Nx)) o 'auto'
+            ('banded' si scipy está disponible, si no 'fft').
+    """
+    if kind not in SOLVER_KINDS:
+        raise ValueError(f"Solver no válido: '{kind}'. Usar uno de: {', '.join(SOLVER_KINDS)}.")
+    if kind == "auto":
+        kind = "banded" if get_lapack_funcs is not None else "fft"
+    return _cached_solver(kind, _key(lower), _key(diag), _key(upper), int(Nx))
+
+def _key(value):
+    """Convierte coeficientes (escalares o por miembro) en claves de caché."""
+    if np.ndim(value) == 0:
+        return float(value)
+    return tuple(float(v) for v in np.ravel(value))
+
+def crank_nicolson_solver(cfl, Nx, kind="auto"):
+    """Solver del lado implícito de Crank-Nicolson: (I + CFL/4 D) x = d.
+
+    `cfl` puede ser una tupla de CFL por miembro (solo con kind='fft').
+    """
+    a = 0.25 * np.asarray(cfl, dtype=float)
+    return get_solver(-a, 1.0, a, Nx, kind)
+
+def clear_solver_cache():
+    """Vacía la caché de factorizaciones."""
+    _cached_solver.cache_clear()
@@ -0,0 +1,160 @@
+import os
+import sys
+import json
+import time
+import functools
+import contextlib
+
+try:  # pico de memoria residente (no existe en Windows)
+    import resource
+except ImportError:  # pragma: no cover - depende de la plataforma
+    resource = None
+
+# Estado global: desactivado por defecto. Con la instrumentación apagada,
+# `stage` devuelve siempre el mismo contexto vacío y `count` retorna de
+# inmediato, así que el costo en los puntos instrumentados es una
+# comprobación de un booleano.
+_enabled = False
+_stats = {}
+_NULL = contextlib.nullcontext()
+
+def enable():
+    """Activa la medición."""
+    global _enabled
+    _enabled = True
+
+def disable():
+    """Desactiva la medición (los datos acumulados se conservan hasta `reset`)."""
+    global _enabled
+    _enabled = False
+
+def is_enabled():
+    return _enabled
+
+def reset():
+    """Borra los tiempos y contadores acumulados."""
+    _stats.clear()
+
+def max_rss_bytes():
+    """Pico de memoria residente del proceso hasta ahora (0 si la plataforma no lo expone)."""
+    if resource is None:
+        return 0
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss if sys.platform == "darwin" else rss * 1024
+
+def _entry(name):
+    return _stats.setdefault(name, {"calls": 0, "seconds": 0.0, "peak_rss_bytes": 0,
+                                    "rss_growth_bytes": 0, "counters": {}})
+
+class _Stage:
+    """Mide una ejecución de una etapa: tiempo de pared y pico de memoria (inclusivos).
+
+    La memoria es el pico residente del proceso (getrusage) al terminar la
+    etapa y cuánto lo elevó la etapa; es una llamada al sistema, sin el
+    costo de rastrear cada asignación.
+    """
+
+    def __init__(self, name, counters):
+        self.name = name
+        self.counters = counters
+
+    def __enter__(self):
+        self.start_rss = max_rss_bytes()
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        seconds = time.perf_counter() - self.start
+        rss = max_rss_bytes()
+        entry = _entry(self.name)
+        entry["calls"] += 1
+        entry["seconds"] += seconds
+        entry["peak_rss_bytes"] = max(entry["peak_rss_bytes"], rss)
+        entry["rss_growth_bytes"] += rss - self.start_rss
+        _add(entry, self.counters)
+        return False
+
+def stage(name, **counters):
+    """Contexto que mide una etapa; `counters` (p. ej. steps=100) se suman a sus contadores.
+
+        with instrumentation.stage("simulate", steps=n):
+            ...
+    """
+    if not _enabled:
+        return _NULL
+    return _Stage(name, counters)
+
+def timed(name=None):
+    """Decorador equivalente a `stage` sobre toda la función (por defecto, con su nombre)."""
+    def decorator(func):
+        label = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            with _Stage(label, {}):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+def _add(entry, counters):
+    for key, value in counters.items():
+        entry["counters"][key] = entry["counters"].get(key, 0) + value
+
+def count(name, **counters):
+    """Suma contadores a una etapa (p. ej. bytes escritos) sin medir tiempo."""
+    if _enabled:
+        _add(_entry(name), counters)
+
+def report():
+    """Resumen por etapa, ordenado por tiempo total.
+
+    Returns:
+        dict: {'stages': {nombre: {calls, seconds, peak_rss_bytes,
+        rss_growth_bytes, contadores..., steps_per_second, bytes_per_second}},
+        'max_rss_bytes': pico del proceso}. Los tiempos y la memoria son
+        inclusivos (cuentan las etapas anidadas).
+    """
+    stages = {}
+    for name, entry in sorted(_stats.items(), key=lambda item: -item[1]["seconds"]):
+        row = {"calls": entry["calls"], "seconds": entry["seconds"],
+               "peak_rss_bytes": entry["peak_rss_bytes"], "rss_growth_bytes": entry["rss_growth_bytes"],
+               **entry["counters"]}
+        for key in ("steps", "frames", "bytes"):
+            if key in row and entry["seconds"] > 0:
+                row[f"{key}_per_second"] = row[key] / entry["seconds"]
+        stages[name] = row
+    return {"stages": stages, "max_rss_bytes": max_rss_bytes()}
+
+def format_report(data=None):
+    """Tabla de texto de `report()`."""
+    data = data or report()
+    lines = [f"{'etapa':<32}{'llamadas':>9}{'tiempo (s)':>12}{'pasos/s':>12}{'MB escritos':>13}"
+             f"{'MB/s':>9}{'pico MB':>10}{'+MB':>8}"]
+    for name, row in data["stages"].items():
+        def cell(key, scale=1.0, fmt="{:.1f}"):
+            return fmt.format(row[key] / scale) if key in row else "-"
+        lines.append(f"{name:<32}{row['calls']:>9}{row['seconds']:>12.3f}"
+                     f"{cell('steps_per_second', fmt='{:.0f}'):>12}{cell('bytes', 1e6, '{:.3f}'):>13}"
+                     f"{cell('bytes_per_second', 1e6):>9}{cell('peak_rss_bytes', 1e6):>10}"
+                     f"{cell('rss_growth_bytes', 1e6):>8}")
+    if data["max_rss_bytes"]:
+        lines.append(f"Pico de memoria residente del proceso: {data['max_rss_bytes'] / 1e6:.1f} MB")
+    return "\n".join(lines)
+
+def write_report(path, data=None):
+    """Guarda `report()` en JSON."""
+    data = data or report()
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(data, f, indent=1)
+    return path
+
+def emit_report(path=""):
+    """Imprime la tabla y, si se da `path`, guarda además el JSON (para --profile-report)."""
+    data = report()
+    print(format_report(data))
+    if path:
+        print(f"Reporte de perfil guardado en {write_report(path, data)}")
+    return data
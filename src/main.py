@@ -1,8 +1,10 @@
 import numpy as np
 import os
-from physics import gauss, euler_backward_step
-from visualization import setup_plot_style, plot_3d_surface
-from data_handling import create_dataset, save_dataset, load_dataset
+from src.physics import initial_condition, EulerBackwardStepper
+from src.visualization import setup_plot_style, plot_3d_surface
+from src.data_handling import StreamingWriter, load_dataset, extrude_y
+from src.cache import RunCache, run_key
+from src.catalog import register_file
 
 
 # Parámetros globales
@@ -16,35 +18,36 @@ def main():
     setup_plot_style()
     
     # Simulación
-    X = [e * dx for e in range(Nx)]
+    X = np.arange(Nx) * dx
     T = [e * dt for e in range(Nx * 2)][:10]  # Tiempos de simulación
     CFL = dt * u / dx
     print(f"CFL: {CFL}")
     
-    # Almacenar resultados
-    M = []
-    Cn = np.array([gauss(x, 0, nr, u, dx, Nx) for x in X])
-    
-    for t in T:
-        if t == 0:
-            M.append(Cn.copy())
-            continue
-        Cn = euler_backward_step(Cn, u, dt, dx, Nx)
-        M.append(Cn.copy())
-    
-    # Crear dataset y visualizar
-    ds = create_dataset(M, Nx, dx, T)
+    # Simular escribiendo cada paso directamente en NetCDF
+    Cn = initial_condition(X, u, dx, Nx, "gauss", nr)
+    stepper = EulerBackwardStepper(u, dt, dx, Nx)
+    # Solo se recalcula si cambian los parámetros (o el código numérico)
+    cache = RunCache()
+    key = run_key({'method': 'Euler Backward', 'dt': dt, 'dx': dx, 'U': u, 'Nx': Nx,
+                   'steps': len(T), 'profile': 'gauss', 'nr': nr})
+    path = os.path.join("outputs/data", "simulacion.nc")
+    if cache.fetch(key, {"simulacion": path}):
+        register_file(path)
+    else:
+        attrs = {'CFL_number': CFL, 'method': 'Euler Backward', 'data_type': 'numerical',
+                 'simulation_parameters': f"U={u}, Nx={Nx}, DX={dx}, dt={dt}, profile=gauss, nr={nr}"}
+        with StreamingWriter("simulacion", Nx, dx, attrs=attrs) as writer:
+            for t in T:
+                if t != 0:
+                    Cn = stepper.step(Cn)
+                writer.append(Cn, t)
+        cache.put(key, {"simulacion": path})
+    ds = load_dataset("simulacion")  # Carga datos existentes
     print(ds)
-    #'''
-    # Después de generar 'ds':
-    if not os.path.exists("outputs/data/simulacion.nc"): 
-        save_dataset(ds, "simulacion")
-    else: 
-        ds = load_dataset("simulacion")  # Carga datos existentes
-    #'''
     ti=5
+    os.makedirs("outputs/figures", exist_ok=True)
     plot_3d_surface(
-        ds.isel(time=ti), 
+        extrude_y(ds.isel(time=ti)), 
         metodo="Euler Backward", 
         ti=ti, dt=dt, CFL=CFL,
         save_path="outputs/figures/figura_3d.png"
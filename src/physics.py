@@ -1,4 +1,5 @@
 import numpy as np
+from .kernels import euler_backward_steps, per_member, resolve_backend, rows
 
 def gauss(x, t, nr, u, dx, Nx):
     """Calcula una gaussiana centrada en 51*dx con condiciones periódicas."""
@@ -12,18 +13,128 @@ def rectg(x, t, u, dx, Nx, co=10):
     b = x0 <= 52*dx
     return np.where(a & b, co, 0)
 
-def euler_backward_step(Cn, u, dt, dx, Nx):
-    """Avanza un paso en el tiempo usando el esquema Euler backward."""
-    Cnp1 = np.zeros_like(Cn, dtype=float)
-    for j in range(Nx):
-        Cnp1[j] = Cn[j] - (u * dt / dx) * (Cn[j] - Cn[j-1])
-    return Cnp1
+def euler_backward_update(Cn, cfl, out):
+    """Actualización upwind vectorizada: escribe en `out` el paso n+1 de `Cn`.
+
+    Usa condiciones periódicas (C_{-1} = C_{Nx-1}) y opera sobre el último
+    eje, por lo que también acepta lotes de forma (miembros, Nx). `out` debe
+    ser un arreglo distinto de `Cn`; no se reserva memoria adicional.
+    Mantiene el mismo orden de operaciones que el bucle original
+    (C_j - cfl * (C_j - C_{j-1})), de modo que el resultado es idéntico bit a bit.
+    """
+    if out is Cn:
+        raise ValueError("'out' no puede ser el mismo arreglo que 'Cn'.")
+    np.subtract(Cn[..., 1:], Cn[..., :-1], out=out[..., 1:])
+    np.subtract(Cn[..., 0], Cn[..., -1], out=out[..., 0])
+    np.multiply(cfl, out, out=out)
+    np.subtract(Cn, out, out=out)
+    return out
+
+def periodic_difference(C, shift, out):
+    """Escribe en `out` la diferencia periódica C_{j+shift} - C_{j-shift}.
+
+    Opera sobre el último eje sin crear arreglos temporales; `out` debe ser
+    distinto de `C` y `shift` menor que Nx/2.
+    """
+    s = shift
+    np.subtract(C[..., 2*s:], C[..., :-2*s], out=out[..., s:-s])
+    np.subtract(C[..., s:2*s], C[..., -s:], out=out[..., :s])
+    np.subtract(C[..., :s], C[..., -2*s:-s], out=out[..., -s:])
+    return out
+
+def euler_backward_step(Cn, u, dt, dx, Nx, out=None):
+    """Avanza un paso en el tiempo usando el esquema Euler backward.
+
+    Si se pasa `out`, el resultado se escribe en ese arreglo preasignado.
+    """
+    Cn = np.asarray(Cn)
+    if out is None:
+        out = np.empty(Nx, dtype=float)
+    return euler_backward_update(Cn, u * dt / dx, out)
+
+class EulerBackwardStepper:
+    """Motor de pasos Euler backward sin asignaciones de memoria por paso.
+
+    Mantiene dos buffers preasignados (o los que entregue el usuario) y
+    alterna entre ellos (ping-pong) para avanzar muchos pasos seguidos.
+    Args:
+        u (float): Velocidad de advección (m/s).
+        dt (float): Paso de tiempo (s).
+        dx (float): Espaciado del grid (m).
+        Nx (int): Puntos en la malla.
+        buffers (tuple, optional): Par de arreglos de tamaño Nx a reutilizar.
+        backend (str): 'numpy' o 'jit' (ver `step_n`).
+    """
+
+    def __init__(self, u, dt, dx, Nx, buffers=None, backend="numpy"):
+        self.cfl = u * dt / dx
+        self.Nx = Nx
+        if buffers is None:
+            buffers = (np.empty(Nx, dtype=float), np.empty(Nx, dtype=float))
+        if len(buffers) != 2 or buffers[0] is buffers[1]:
+            raise ValueError("Se requieren dos buffers distintos.")
+        self.buffers = buffers
+        self.backend = resolve_backend(backend)
+
+    def step(self, Cn, out=None):
+        """Avanza un paso; escribe en `out` (por defecto, el primer buffer)."""
+        if out is None:
+            out = self.buffers[1] if Cn is self.buffers[0] else self.buffers[0]
+        return euler_backward_update(Cn, self.cfl, out)
+
+    def step_n(self, C, n):
+        """Avanza `n` pasos desde `C` alternando entre los dos buffers.
+
+        `C` no se modifica. Devuelve el buffer que contiene el estado final,
+        que será sobrescrito en la siguiente llamada (copiar si se necesita
+        conservarlo). Con el backend 'numpy' cada paso es una actualización
+        vectorizada sin asignaciones, pero el bucle en el tiempo sigue en
+        Python (una llamada por paso); solo con 'jit' los `n` pasos corren
+        en un único llamado compilado, con el mismo resultado bit a bit.
+        """
+        a, b = self.buffers
+        if n <= 0:
+            a[...] = C
+            return a
+        if self.backend == "jit":
+            a[...] = C
+            euler_backward_steps(rows(a), rows(b), per_member(self.cfl, 1, a.dtype), n)
+            return b if n % 2 else a
+        src = np.asarray(C)
+        for _ in range(n):
+            dst = b if src is a else a
+            euler_backward_update(src, self.cfl, dst)
+            src = dst
+        return src
 
 def analytical_solution(x, t, u, dx, Nx, profile="gauss", nr=10):
-    """Solución analítica para la ecuación de advección con perfil gaussiano o rectangular."""
+    """Solución analítica para la ecuación de advección con perfil gaussiano o rectangular.
+
+    Acepta escalares o arreglos. Si `x` y `t` son ambos arreglos, devuelve el
+    campo espacio-tiempo completo de forma t.shape + x.shape (p. ej. (Nt, Nx))
+    por broadcasting, sin bucles en Python.
+    """
+    x = np.asarray(x)
+    t = np.asarray(t)
+    if x.ndim and t.ndim:
+        t = t.reshape(t.shape + (1,) * x.ndim)
     if profile == "gauss":
         return gauss(x, t, nr, u, dx, Nx)
     elif profile == "rectg":
         return rectg(x, t, u, dx, Nx)
     else:
         raise ValueError("Perfil no válido. Usar 'gauss' o 'rectg'.")
+
+def initial_condition(x, u, dx, Nx, profile="gauss", nr=10):
+    """Perfil inicial (t = 0) evaluado sobre todo el arreglo de coordenadas `x`."""
+    return analytical_solution(x, 0, u, dx, Nx, profile, nr)
+
+def analytical_blocks(x, T, u, dx, Nx, profile="gauss", nr=10, block_size=256):
+    """Genera la solución analítica por bloques de tiempo, sin materializar todo el campo.
+
+    Yields:
+        tuple: (índice inicial, bloque de forma (len(bloque), Nx)).
+    """
+    T = np.asarray(T)
+    for start in range(0, len(T), block_size):
+        yield start, analytical_solution(x, T[start:start + block_size], u, dx, Nx, profile, nr)
@@ -0,0 +1,222 @@
+import os
+import json
+import time
+import hashlib
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from .cache import run_key
+from .kernels import process_context
+
+STAMP_DIR = "outputs/pipeline"
+
+class Task:
+    """Tarea del grafo: `func(**kwargs)` produce los archivos `outputs`.
+
+    `func` debe ser una función de módulo (se envía por pickle a los
+    procesos del pool). `params` son los parámetros que definen el
+    resultado: si cambian, la tarea se repite aunque sus salidas existan.
+    Args:
+        name (str): Identificador único, p. ej. 'simulate:RK4_dt30.0_...'.
+        func (callable): Función que ejecuta la tarea.
+        kwargs (dict): Argumentos de `func`.
+        deps (list): Nombres de las tareas que deben terminar antes.
+        outputs (list): Rutas de los archivos que la tarea escribe.
+        params (dict): Parámetros para la clave de la tarea (por defecto, `kwargs`).
+    """
+
+    def __init__(self, name, func, kwargs=None, deps=(), outputs=(), params=None):
+        self.name = name
+        self.func = func
+        self.kwargs = kwargs or {}
+        self.deps = list(deps)
+        self.outputs = list(outputs)
+        self.params = self.kwargs if params is None else params
+
+    def key(self):
+        """Clave de contenido de los parámetros (más la versión del código numérico)."""
+        return run_key(dict(self.params, task=self.name))
+
+    def __repr__(self):
+        return f"Task({self.name!r}, deps={self.deps})"
+
+def topological_order(tasks):
+    """Ordena las tareas de modo que cada una quede después de sus dependencias.
+
+    Raises:
+        ValueError: Si hay nombres repetidos, dependencias desconocidas o ciclos.
+    """
+    by_name = {}
+    for task in tasks:
+        if task.name in by_name:
+            raise ValueError(f"Tarea repetida: '{task.name}'.")
+        by_name[task.name] = task
+    for task in tasks:
+        missing = [d for d in task.deps if d not in by_name]
+        if missing:
+            raise ValueError(f"La tarea '{task.name}' depende de tareas inexistentes: {', '.join(missing)}.")
+    order, state = [], {}
+    for task in tasks:
+        # DFS iterativo: 1 = en la pila, 2 = ya ordenada
+        stack = [(task, iter(task.deps))]
+        state.setdefault(task.name, 1)
+        if state[task.name] == 2:
+            continue
+        while stack:
+            current, deps = stack[-1]
+            dep = next(deps, None)
+            if dep is None:
+                stack.pop()
+                state[current.name] = 2
+                order.append(current)
+            elif state.get(dep) == 1:
+                raise ValueError(f"Ciclo en el grafo de tareas: '{current.name}' -> '{dep}'.")
+            elif dep not in state:
+                state[dep] = 1
+                stack.append((by_name[dep], iter(by_name[dep].deps)))
+    return order
+
+def _stamp_path(stamp_dir, name):
+    return os.path.join(stamp_dir, hashlib.sha256(name.encode()).hexdigest()[:16] + ".json")
+
+def _mtimes(paths):
+    try:
+        return [os.path.getmtime(p) for p in paths]
+    except OSError:
+        return None
+
+def is_up_to_date(task, inputs, stamp_dir=STAMP_DIR):
+    """True si las salidas de la tarea existen y siguen vigentes.
+
+    Vigentes: la última ejecución registrada (sello en `stamp_dir`) tuvo la
+    misma clave de parámetros y ninguna salida es más antigua que los
+    archivos de entrada `inputs` (salidas de las dependencias), como en make.
+    """
+    if not task.outputs:
+        return False
+    try:
+        with open(_stamp_path(stamp_dir, task.name)) as f:
+            stamp = json.load(f)
+    except (OSError, ValueError):
+        return False
+    if stamp.get("key") != task.key():
+        return False
+    outputs, sources = _mtimes(task.outputs), _mtimes(inputs)
+    if outputs is None or sources is None:
+        return False
+    return not sources or min(outputs) >= max(sources)
+
+def write_stamp(task, stamp_dir=STAMP_DIR):
+    """Registra que la tarea terminó con sus parámetros actuales."""
+    os.makedirs(stamp_dir, exist_ok=True)
+    path = _stamp_path(stamp_dir, task.name)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w") as f:
+        json.dump({"name": task.name, "key": task.key(), "outputs": task.outputs,
+                   "finished": time.time()}, f, indent=1)
+    os.replace(tmp, path)
+
+def _execute(func, kwargs, outputs=()):
+    """Ejecuta una tarea (en el proceso actual o en un worker) y mide su duración.
+
+    Las carpetas de las salidas se crean antes, así ninguna tarea depende de
+    que otra las haya creado.
+    """
+    for directory in {os.path.dirname(os.path.abspath(p)) for p in outputs}:
+        os.makedirs(directory, exist_ok=True)
+    start = time.perf_counter()
+    func(**kwargs)
+    return time.perf_counter() - start
+
+def run(tasks, workers=1, stamp_dir=STAMP_DIR, force=False, verbose=True):
+    """Ejecuta el grafo: cada tarea empieza apenas terminan sus dependencias.
+
+    Las tareas vigentes (`is_up_to_date`) se omiten salvo con `force`. Con
+    `workers` > 1 las tareas independientes corren a la vez en un pool de
+    procesos que se reutiliza para todo el grafo (las bibliotecas se
+    importan una vez por worker); con 1 corren en orden en este proceso.
+    Si una tarea falla, las que dependen de ella no se ejecutan y el resto
+    del grafo continúa.
+    Returns:
+        dict: {nombre: estado}, con estado 'done', 'skipped', 'failed' o 'blocked'.
+    """
+    order = topological_order(tasks)
+    by_name = {task.name: task for task in order}
+    status = {}
+    pending = list(order)
+    running = {}
+
+    def log(task, message):
+        if verbose:
+            print(f"[{sum(1 for s in status.values() if s != 'running')}/{len(order)}] "
+                  f"{task.name}: {message}")
+
+    def finish(task, seconds=None, error=None):
+        missing = [p for p in task.outputs if not os.path.exists(p)]
+        if error is None and missing:
+            error = f"no produjo {os.path.basename(missing[0])}"
+        if error is not None:
+            status[task.name] = "failed"
+            log(task, f"falló ({error})")
+        else:
+            status[task.name] = "done"
+            write_stamp(task, stamp_dir)
+            log(task, f"listo en {seconds:.2f} s")
+
+    def schedule(pool):
+        """Lanza (u omite) las tareas cuyas dependencias ya terminaron."""
+        progressed = True
+        while progressed:
+            progressed = False
+            for task in list(pending):
+                deps = [status.get(d) for d in task.deps]
+                if any(s in ("failed", "blocked") for s in deps):
+                    pending.remove(task)
+                    status[task.name] = "blocked"
+                    log(task, "omitida (falló una dependencia)")
+                    progressed = True
+                    continue
+                if not all(s in ("done", "skipped") for s in deps):
+                    continue
+                pending.remove(task)
+                progressed = True
+                inputs = [p for d in task.deps for p in by_name[d].outputs]
+                # Una dependencia recién ejecutada obliga a repetir aunque las fechas empaten
+                rerun = force or any(s == "done" for s in deps)
+                if not rerun and is_up_to_date(task, inputs, stamp_dir):
+                    status[task.name] = "skipped"
+                    log(task, "al día")
+                elif pool is None:
+                    status[task.name] = "running"
+                    try:
+                        seconds = _execute(task.func, task.kwargs, task.outputs)
+                    except Exception as e:
+                        finish(task, error=e)
+                    else:
+                        finish(task, seconds)
+                else:
+                    status[task.name] = "running"
+                    running[pool.submit(_execute, task.func, task.kwargs, task.outputs)] = task
+
+    if workers <= 1:
+        schedule(None)
+    else:
+        with ProcessPoolExecutor(max_workers=workers, mp_context=process_context()) as pool:
+            schedule(pool)
+            while running:
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    task = running.pop(future)
+                    try:
+                        seconds = future.result()
+                    except Exception as e:
+                        finish(task, error=e)
+                    else:
+                        finish(task, seconds)
+                schedule(pool)
+    return status
+
+def summary(status):
+    """Conteo de tareas por estado, p. ej. {'done': 3, 'skipped': 57}."""
+    counts = {}
+    for state in status.values():
+        counts[state] = counts.get(state, 0) + 1
+    return counts
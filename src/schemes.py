@@ -0,0 +1,385 @@
+import numpy as np
+from .physics import euler_backward_update, periodic_difference
+from .implicit import crank_nicolson_solver
+from .kernels import (euler_backward_steps, leapfrog_steps, matsuno_steps, per_member, resolve_backend,
+                      rk4_steps, rows)
+
+# Registro nombre normalizado -> clase del esquema
+SCHEMES = {}
+
+def _normalize(name):
+    """Normaliza nombres de métodos: 'Euler Backward' -> 'eulerbackward'."""
+    return "".join(ch for ch in str(name).lower() if ch.isalnum())
+
+def register_scheme(cls):
+    """Registra un esquema bajo su nombre y sus alias (usable como decorador)."""
+    for alias in (cls.name,) + tuple(cls.aliases):
+        SCHEMES[_normalize(alias)] = cls
+    return cls
+
+def get_scheme(name):
+    """Devuelve la clase del esquema registrado con ese nombre o alias."""
+    try:
+        return SCHEMES[_normalize(name)]
+    except KeyError:
+        raise ValueError(
+            f"Método no válido: '{name}'. Usar uno de: {', '.join(available_schemes())}."
+        ) from None
+
+def available_schemes():
+    """Lista los nombres canónicos de los esquemas registrados."""
+    return sorted({cls.name for cls in SCHEMES.values()})
+
+class Scheme:
+    """Clase base de los esquemas de integración temporal.
+
+    Cada esquema avanza toda la malla con operaciones vectorizadas sobre
+    buffers preasignados en el constructor, sin reservar memoria por paso.
+    Atributos declarados por cada subclase:
+        name (str): Nombre canónico (el usado en --method).
+        aliases (tuple): Nombres alternativos aceptados.
+        stencil_width (int): Semiancho del operador espacial (puntos a cada lado).
+        time_levels (int): Niveles temporales que usa un paso (2 = n y n-1).
+        stability_limit (float): CFL máximo estable (np.inf si incondicional).
+        cost_per_step (int): Evaluaciones del operador espacial por paso.
+        has_kernel (bool): Si tiene un núcleo compilado (`_compiled`) para el
+            backend 'jit'.
+    Args:
+        cfl (float or array): Número CFL (U*dt/dx). Con un arreglo de CFL por
+            miembro el estado tiene forma (miembros, Nx) y todos los miembros
+            avanzan juntos.
+        Nx (int): Puntos en la malla.
+        dtype: Tipo de dato de los buffers (por defecto float64; con float32
+            todo el paso se hace en simple precisión, salvo la factorización
+            implícita de Crank-Nicolson, que se mantiene en float64).
+        backend (str): 'numpy' (por defecto) o 'jit': con 'jit' los pasos los
+            avanzan núcleos compilados con numba (`src/kernels.py`), con los
+            mismos resultados. Si falta numba, o el esquema no tiene núcleo
+            (Crank-Nicolson), se usa NumPy.
+    """
+    name = None
+    aliases = ()
+    stencil_width = 1
+    time_levels = 1
+    stability_limit = 1.0
+    cost_per_step = 1
+    n_buffers = 1  # buffers de trabajo además del estado actual
+    has_kernel = False
+
+    def __init__(self, cfl, Nx, dtype=float, backend="numpy"):
+        self.dtype = np.dtype(dtype)
+        if np.ndim(cfl) == 0:
+            self.cfl = cfl
+            self.shape = (Nx,)
+        else:
+            # En la precisión del estado: en float32 los productos no pasan por float64
+            self.cfl = np.asarray(cfl, dtype=self.dtype).reshape(-1, 1)
+            self.shape = (len(self.cfl), Nx)
+        self.Nx = Nx
+        self.current = np.zeros(self.shape, dtype=self.dtype)
+        self._work = [np.zeros(self.shape, dtype=self.dtype) for _ in range(self.n_buffers)]
+        self.nstep = 0
+        backend = resolve_backend(backend)
+        self.backend = backend if self.has_kernel else "numpy"
+        if self.backend == "jit":
+            # CFL por miembro en la precisión del estado, como lo ve el núcleo
+            self._cfl_rows = per_member(self.cfl, len(rows(self.current)), self.dtype)
+
+    def initialize(self, C0):
+        """Copia la condición inicial en el estado interno y reinicia el conteo."""
+        self.current[...] = C0
+        self.nstep = 0
+        return self.current
+
+    def state(self):
+        """Copia de todos los niveles pronósticos necesarios para reanudar la integración."""
+        return {"nstep": self.nstep, "current": self.current.copy()}
+
+    def restore(self, state):
+        """Restaura un estado obtenido con `state()` (p. ej. desde un checkpoint)."""
+        self.current[...] = state["current"]
+        self.nstep = int(state["nstep"])
+        return self.current
+
+    def step(self):
+        """Avanza un paso y devuelve el estado actual (buffer interno)."""
+        return self.step_n(1)
+
+    def step_n(self, n):
+        """Avanza `n` pasos y devuelve el estado final (buffer interno).
+
+        Con el backend 'jit' los `n` pasos corren en un solo llamado compilado.
+        """
+        if self.backend == "jit":
+            self._compiled(n)
+        else:
+            for _ in range(n):
+                self._advance()
+        self.nstep += n
+        return self.current
+
+    def _advance(self):
+        raise NotImplementedError
+
+    def _compiled(self, n):
+        """Avanza `n` pasos con el núcleo compilado (solo si `has_kernel`)."""
+        raise NotImplementedError
+
+    @classmethod
+    def amplification(cls, cfl, kdx):
+        """Factores de amplificación de Von Neumann para un modo exp(i k x).
+
+        Args:
+            cfl (array): Números CFL.
+            kdx (array): Números de onda adimensionales k*dx (broadcast con `cfl`).
+        Returns:
+            numpy.ndarray: Raíces complejas λ con forma broadcast(cfl, kdx) +
+            (time_levels,); los esquemas de dos niveles tienen además el modo
+            computacional.
+        """
+        raise NotImplementedError
+
+@register_scheme
+class EulerBackward(Scheme):
+    """Euler backward (upwind de primer orden), idéntico a `euler_backward_step`."""
+    name = "Euler Backward"
+    aliases = ("EB", "upwind")
+    has_kernel = True
+
+    @classmethod
+    def amplification(cls, cfl, kdx):
+        cfl, kdx = np.broadcast_arrays(cfl, kdx)
+        return (1 - cfl * (1 - np.exp(-1j * kdx)))[..., None]
+
+    def _advance(self):
+        nxt = self._work[0]
+        euler_backward_update(self.current, self.cfl, nxt)
+        self._work[0], self.current = self.current, nxt
+
+    def _compiled(self, n):
+        nxt = self._work[0]
+        euler_backward_steps(rows(self.current), rows(nxt), self._cfl_rows, n)
+        if n % 2:
+            self._work[0], self.current = self.current, nxt
+
+@register_scheme
+class Leapfrog(Scheme):
+    """Leapfrog con diferencia centrada de 2º orden.
+
+    C^{n+1} = C^{n-1} - CFL * (C_{j+1} - C_{j-1}). El primer paso, sin nivel
+    n-1 disponible, se da con Euler backward.
+    """
+    name = "Leapfrog"
+    aliases = ("LFo2", "LF")
+    time_levels = 2
+    n_buffers = 2  # [n-1, n+1]
+    coefficient = 1.0
+    has_kernel = True
+    _has_previous = False
+
+    def initialize(self, C0):
+        self._has_previous = False
+        return super().initialize(C0)
+
+    def state(self):
+        state = super().state()
+        if self._has_previous:
+            state["previous"] = self._work[0].copy()  # nivel n-1
+        return state
+
+    def restore(self, state):
+        self._has_previous = "previous" in state
+        if self._has_previous:
+            self._work[0][...] = state["previous"]
+        return super().restore(state)
+
+    def _tendency(self, C, out):
+        return periodic_difference(C, 1, out)
+
+    @classmethod
+    def _symbol(cls, kdx):
+        """Símbolo real S(kΔx) de la tendencia: coefficient * tendencia = 2i S C."""
+        return np.sin(kdx)
+
+    @classmethod
+    def amplification(cls, cfl, kdx):
+        # λ² + 2i CFL S λ - 1 = 0: modo físico y modo computacional
+        cfl, kdx = np.broadcast_arrays(cfl, kdx)
+        a = cfl * cls._symbol(kdx)
+        root = np.sqrt(1 - a ** 2 + 0j)
+        return np.stack([-1j * a + root, -1j * a - root], axis=-1)
+
+    def _advance(self):
+        prev, nxt = self._work[0], self._work[1]
+        if not self._has_previous:
+            euler_backward_update(self.current, self.cfl, nxt)
+            self._has_previous = True
+        else:
+            self._tendency(self.current, nxt)
+            np.multiply(self.coefficient * self.cfl, nxt, out=nxt)
+            np.subtract(prev, nxt, out=nxt)
+        self._work[0], self._work[1], self.current = self.current, prev, nxt
+
+    def _compiled(self, n):
+        prev, nxt = self._work[0], self._work[1]
+        coefficient = per_member(self.coefficient * self.cfl, len(self._cfl_rows), self.dtype)
+        leapfrog_steps(rows(prev), rows(self.current), rows(nxt), coefficient, self._cfl_rows,
+                       self.dtype.type(8.0), n, self._has_previous, self.stencil_width == 2)
+        self._has_previous = self._has_previous or n > 0
+        # El núcleo rota (n-1, n, n+1) en cada paso, igual que `_advance`
+        for _ in range(n % 3):
+            self._work[0], self._work[1], self.current = self.current, self._work[0], self._work[1]
+
+@register_scheme
+class Leapfrog4(Leapfrog):
+    """Leapfrog con derivada espacial de 4º orden.
+
+    C^{n+1} = C^{n-1} - (CFL/6) * (-C_{j+2} + 8C_{j+1} - 8C_{j-1} + C_{j-2}),
+    es decir, 2*dt*U por la derivada de 4º orden (1/12dx); con este factor el
+    límite de estabilidad es CFL ≈ 0.729.
+    """
+    name = "Leapfrog4"
+    aliases = ("LFo4", "LF4")
+    stencil_width = 2
+    stability_limit = 0.729
+    n_buffers = 3  # [n-1, n+1, diferencia de ancho 2]
+    coefficient = 1.0 / 6.0
+
+    @classmethod
+    def _symbol(cls, kdx):
+        return (8 * np.sin(kdx) - np.sin(2 * kdx)) / 6
+
+    def _tendency(self, C, out):
+        wide = self._work[2]
+        periodic_difference(C, 1, out)
+        np.multiply(8.0, out, out=out)
+        periodic_difference(C, 2, wide)
+        return np.subtract(out, wide, out=out)
+
+@register_scheme
+class Matsuno(Scheme):
+    """Predictor-corrector de Matsuno con diferencias centradas.
+
+    C* = C^n - (CFL/2) (C_{j+1} - C_{j-1})
+    C^{n+1} = C^n - (CFL/2) (C*_{j+1} - C*_{j-1})
+    """
+    name = "Matsuno"
+    cost_per_step = 2
+    n_buffers = 2  # [predictor, n+1]
+    has_kernel = True
+
+    @classmethod
+    def amplification(cls, cfl, kdx):
+        cfl, kdx = np.broadcast_arrays(cfl, kdx)
+        z = -1j * cfl * np.sin(kdx)
+        return (1 + z + z ** 2)[..., None]
+
+    def _advance(self):
+        star, nxt = self._work
+        half = 0.5 * self.cfl
+        periodic_difference(self.current, 1, star)
+        np.multiply(half, star, out=star)
+        np.subtract(self.current, star, out=star)
+        periodic_difference(star, 1, nxt)
+        np.multiply(half, nxt, out=nxt)
+        np.subtract(self.current, nxt, out=nxt)
+        self._work[1], self.current = self.current, nxt
+
+    def _compiled(self, n):
+        star, nxt = self._work
+        half = per_member(0.5 * self.cfl, len(self._cfl_rows), self.dtype)
+        matsuno_steps(rows(self.current), rows(nxt), rows(star), half, n)
+        if n % 2:
+            self._work[1], self.current = self.current, nxt
+
+@register_scheme
+class CrankNicolson(Scheme):
+    """Crank-Nicolson con diferencias centradas (implícito).
+
+    (I + CFL/4 D) C^{n+1} = (I - CFL/4 D) C^n, con D la diferencia centrada
+    periódica. El sistema cíclico se factoriza una vez por (CFL, Nx) y la
+    factorización se comparte entre corridas (ver `src/implicit.py`). Con CFL
+    por miembro se usa siempre el solver circulante (FFT) en lote.
+    Args:
+        solver (str): 'auto', 'banded' (tridiagonal cíclico) o 'fft' (circulante).
+    """
+    name = "Crank-Nicolson"
+    aliases = ("CN", "Crank-Nicholson")
+    stability_limit = np.inf
+    n_buffers = 2  # [lado derecho, n+1]
+
+    @classmethod
+    def amplification(cls, cfl, kdx):
+        cfl, kdx = np.broadcast_arrays(cfl, kdx)
+        a = 0.5j * cfl * np.sin(kdx)
+        return ((1 - a) / (1 + a))[..., None]
+
+    def __init__(self, cfl, Nx, dtype=float, backend="numpy", solver="auto"):
+        super().__init__(cfl, Nx, dtype, backend)
+        if np.ndim(cfl) == 0:
+            self.solver = crank_nicolson_solver(cfl, Nx, solver)
+        else:
+            self.solver = crank_nicolson_solver(tuple(self.cfl.ravel()), Nx, "fft")
+
+    def _advance(self):
+        rhs, nxt = self._work
+        periodic_difference(self.current, 1, rhs)
+        np.multiply(0.25 * self.cfl, rhs, out=rhs)
+        np.subtract(self.current, rhs, out=rhs)
+        self.solver.solve(rhs, out=nxt)
+        self._work[1], self.current = self.current, nxt
+
+@register_scheme
+class RK4(Scheme):
+    """Runge-Kutta de 4º orden con diferencias centradas.
+
+    La tendencia por paso es k = -(CFL/2) (C_{j+1} - C_{j-1}); estable hasta
+    CFL = 2*sqrt(2).
+    """
+    name = "RK4"
+    aliases = ("Runge-Kutta", "Runge-Kutta 4")
+    stability_limit = 2 * np.sqrt(2)
+    cost_per_step = 4
+    n_buffers = 3  # [k, etapa, acumulador]
+    has_kernel = True
+
+    @classmethod
+    def amplification(cls, cfl, kdx):
+        cfl, kdx = np.broadcast_arrays(cfl, kdx)
+        z = -1j * cfl * np.sin(kdx)
+        return (1 + z + z ** 2 / 2 + z ** 3 / 6 + z ** 4 / 24)[..., None]
+
+    def _stage(self, C, k):
+        periodic_difference(C, 1, k)
+        return np.multiply(-0.5 * self.cfl, k, out=k)
+
+    def _advance(self):
+        k, stage, acc = self._work
+        C = self.current
+        # k1
+        self._stage(C, k)
+        acc[...] = k
+        np.multiply(0.5, k, out=stage)
+        np.add(C, stage, out=stage)
+        # k2 y k3
+        for weight in (0.5, 1.0):
+            self._stage(stage, k)
+            np.multiply(2.0, k, out=stage)
+            np.add(acc, stage, out=acc)
+            np.multiply(weight, k, out=stage)
+            np.add(C, stage, out=stage)
+        # k4
+        self._stage(stage, k)
+        np.add(acc, k, out=acc)
+        np.multiply(1.0 / 6.0, acc, out=acc)
+        np.add(C, acc, out=acc)
+        self._work[2], self.current = C, acc
+
+    def _compiled(self, n):
+        k, stage, acc = self._work
+        slope = per_member(-0.5 * self.cfl, len(self._cfl_rows), self.dtype)
+        one = self.dtype.type(1.0)
+        rk4_steps(rows(self.current), rows(acc), rows(k), rows(stage), slope,
+                  one / 2, one, one + one, one / 6, n)
+        if n % 2:
+            self._work[2], self.current = self.current, acc
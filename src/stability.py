@@ -0,0 +1,88 @@
+import functools
+import numpy as np
+import xarray as xr
+from .schemes import get_scheme
+
+# Números de onda adimensionales kΔx de 0 a π (onda de 2Δx)
+KDX = np.linspace(0.0, np.pi, 1441)
+# Holgura para |λ| = 1 exacto (Leapfrog, Crank-Nicolson) con error de redondeo
+TOLERANCE = 1e-9
+
+def max_amplification(method, cfl, kdx=KDX):
+    """Máximo de |λ| sobre todos los kΔx y raíces, para cada CFL, en una sola evaluación.
+
+    Args:
+        method (str): Nombre o alias del esquema.
+        cfl (float or array): Números CFL.
+        kdx (array): Números de onda adimensionales a evaluar.
+    Returns:
+        numpy.ndarray: Arreglo de forma np.shape(cfl).
+    """
+    cfl = np.asarray(cfl, dtype=float)
+    roots = get_scheme(method).amplification(cfl[..., None], kdx)
+    return np.abs(roots).max(axis=(-2, -1))
+
+def amplification_grid(method, cfls, kdx=KDX):
+    """Factor de amplificación sobre la malla (CFL, kΔx), listo para graficar.
+
+    Returns:
+        xarray.Dataset: Con dimensiones (CFL, kdx):
+            modulus: max |λ| entre raíces (> 1 = inestable).
+            phase_ratio: fase del modo físico / fase exacta (-CFL kΔx);
+                1 = sin error de fase, < 1 = el modo se retrasa.
+    """
+    scheme = get_scheme(method)
+    cfls = np.asarray(cfls, dtype=float)
+    roots = scheme.amplification(cfls[:, None], np.asarray(kdx)[None, :])
+    exact = -cfls[:, None] * np.asarray(kdx)[None, :]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        phase_ratio = np.where(exact != 0, np.angle(roots[..., 0]) / exact, 1.0)
+    return xr.Dataset(
+        {
+            "modulus": (["CFL", "kdx"], np.abs(roots).max(axis=-1)),
+            "phase_ratio": (["CFL", "kdx"], phase_ratio),
+        },
+        coords={"CFL": cfls, "kdx": kdx},
+        attrs={"method": scheme.name},
+    )
+
+@functools.lru_cache(maxsize=None)
+def _limit(name, cfl_max, tol):
+    cfls = np.linspace(0.0, cfl_max, 2001)
+    unstable = max_amplification(name, cfls) > 1 + TOLERANCE
+    if not unstable.any():
+        return np.inf
+    first = int(np.argmax(unstable))
+    lo, hi = cfls[first - 1], cfls[first]
+    while hi - lo > tol:
+        mid = 0.5 * (lo + hi)
+        if max_amplification(name, mid) > 1 + TOLERANCE:
+            hi = mid
+        else:
+            lo = mid
+    return lo
+
+def stability_limit(method, cfl_max=10.0, tol=1e-6):
+    """Mayor CFL estable hallado numéricamente (np.inf si es estable hasta `cfl_max`).
+
+    Recorre una malla de CFL en una sola evaluación vectorizada y refina el
+    primer cruce de |λ| = 1 por bisección.
+    """
+    return _limit(get_scheme(method).name, float(cfl_max), float(tol))
+
+def check_stability(method, cfl, steps=None):
+    """Evalúa si una configuración es estable antes de ejecutarla.
+
+    Returns:
+        dict: stable (bool), max_amplification, limit (CFL máximo) y growth
+        (factor de crecimiento del peor modo tras `steps` pasos, si se indica).
+    """
+    gain = float(max_amplification(method, cfl))
+    with np.errstate(over="ignore"):
+        growth = float(np.float64(gain) ** steps) if steps is not None else None
+    return {
+        "stable": gain <= 1 + TOLERANCE,
+        "max_amplification": gain,
+        "limit": float(stability_limit(method)),
+        "growth": growth,
+    }
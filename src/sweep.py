@@ -0,0 +1,189 @@
+import itertools
+import numpy as np
+import pandas as pd
+import xarray as xr
+from .physics import gauss, rectg
+from .schemes import get_scheme
+from .data_handling import SCHEMA_VERSION, SweepWriter
+from .diagnostics import METRICS, compute_metrics, metric_variables
+from . import instrumentation
+
+PROFILES = ("gauss", "rectg")
+
+def parse_values(text, cast=float):
+    """Interpreta una lista 'a,b,c' o un rango inclusivo 'ini:fin:paso'."""
+    text = str(text).strip()
+    if ":" in text:
+        parts = text.split(":")
+        if len(parts) != 3:
+            raise ValueError(f"Rango no válido: '{text}'. Usar 'ini:fin:paso'.")
+        start, stop, step = (float(p) for p in parts)
+        if step <= 0:
+            raise ValueError(f"El paso del rango debe ser positivo: '{text}'.")
+        n = int(np.floor((stop - start) / step + 1e-9)) + 1
+        return [cast(start + i * step) for i in range(n)]
+    return [cast(v) for v in text.split(",") if v.strip()]
+
+def parse_sweep(spec):
+    """Interpreta 'parametro=valores' (p. ej. 'dt=30:60:5' o 'nr=2,10')."""
+    name, sep, values = spec.partition("=")
+    name = name.strip()
+    if not sep or name not in ("dt", "nr"):
+        raise ValueError(f"Barrido no válido: '{spec}'. Usar 'dt=...' o 'nr=...'.")
+    return name, parse_values(values)
+
+def build_members(dts, nrs, profiles):
+    """Combina (dt, nr, perfil) en una lista de miembros del ensamble.
+
+    El perfil rectangular no depende de nr, así que aporta un solo miembro
+    por dt (con nr = NaN).
+    """
+    members = []
+    for profile, dt in itertools.product(profiles, dts):
+        if profile not in PROFILES:
+            raise ValueError("Perfil no válido. Usar 'gauss' o 'rectg'.")
+        for nr in (nrs if profile == "gauss" else [np.nan]):
+            members.append({"dt": float(dt), "nr": float(nr), "profile": profile})
+    return members
+
+def _profile_field(x, t, members, u, dx, Nx):
+    """Evalúa el perfil de cada miembro sobre x y tiempos t de forma (miembros, ...)."""
+    nr = np.array([m["nr"] for m in members]).reshape((-1,) + (1,) * (np.ndim(t) - 1))
+    is_gauss = np.array([m["profile"] == "gauss" for m in members]).reshape(nr.shape)
+    field = np.zeros(np.broadcast_shapes(np.shape(t), np.shape(x)))
+    if is_gauss.any():
+        gauss_field = gauss(x, t, np.where(is_gauss, nr, 1.0), u, dx, Nx)
+        field = np.where(is_gauss, gauss_field, field)
+    if (~is_gauss).any():
+        field = np.where(is_gauss, field, rectg(x, t, u, dx, Nx))
+    return field
+
+def _sweep_grid(members, u, dx, total_steps, save_every):
+    """Pasos guardados, tiempos (miembros, pasos) y coordenadas por miembro de un barrido."""
+    dts = np.array([m["dt"] for m in members])
+    steps = np.arange(0, total_steps, save_every)
+    coords = {
+        "dt": dts,
+        "nr": np.array([m["nr"] for m in members]),
+        "profile": np.array([m["profile"] for m in members]),
+        "CFL": u * dts / dx,
+    }
+    return steps, dts[:, None] * steps[None, :], coords
+
+def _sweep_attrs(method, u, dx, Nx):
+    return {
+        "simulation_parameters": f"U={u}, Nx={Nx}, DX={dx}",
+        "method": get_scheme(method).name,
+        "data_type": "sweep",
+        "schema_version": SCHEMA_VERSION,
+        "dx": dx,
+    }
+
+def _integrate(method, members, u, dx, Nx, total_steps, save_every, analytical, dtype, accumulate,
+               backend, sink, block_steps):
+    """Avanza el ensamble y entrega a `sink.write` bloques de `block_steps` pasos guardados.
+
+    Cada bloque lleva los campos (miembros, k, Nx) y sus diagnósticos,
+    calculados contra la solución exacta de ese bloque solamente, así que la
+    memoria no depende de la duración de la corrida.
+    """
+    steps, times, coords = _sweep_grid(members, u, dx, total_steps, save_every)
+    x = np.arange(Nx) * dx
+    scheme = get_scheme(method)(coords["CFL"], Nx, dtype, backend)
+    block = np.empty((len(members), min(block_steps, len(steps)), Nx), dtype=dtype)
+
+    def flush(start, k):
+        with instrumentation.stage("analytical_solution", frames=len(members) * k):
+            exact = _profile_field(x, times[:, start:start + k, None], members, u, dx, Nx)
+        fields = {"conc_unids": block[:, :k]}
+        if analytical:
+            fields["conc_analytical"] = exact.astype(dtype, copy=False)
+        with instrumentation.stage("diagnostics", frames=len(members) * k):
+            metrics = compute_metrics(block[:, :k], exact, dx, accumulate)
+        sink.write(start, fields, metrics)
+
+    block[:, 0] = scheme.initialize(_profile_field(x, np.zeros((len(members), 1)), members, u, dx, Nx))
+    k, start = 1, 0
+    for i in range(1, len(steps)):
+        if k == block.shape[1]:
+            flush(start, k)
+            k, start = 0, i
+        with instrumentation.stage("simulate", steps=len(members) * save_every):
+            block[:, k] = scheme.step_n(save_every)
+        k += 1
+    flush(start, k)
+
+class _SweepArrays:
+    """Destino en memoria de `_integrate`: junta los bloques en arreglos (miembros, pasos, ...)."""
+
+    def __init__(self, members, n_steps):
+        self.shape = (members, n_steps)
+        self.values = {}
+
+    def write(self, start, fields, series=None):
+        for name, data in {**fields, **(series or {})}.items():
+            if name not in self.values:
+                self.values[name] = np.empty(self.shape + data.shape[2:], dtype=data.dtype)
+            self.values[name][:, start:start + data.shape[1]] = data
+
+def run_sweep(method, members, u, dx, Nx=101, total_steps=None, save_every=1, analytical=True,
+              dtype="float64", accumulate="float64", backend="numpy", block_steps=64):
+    """Avanza todos los miembros del ensamble juntos como un arreglo (miembros, Nx).
+
+    Cada miembro tiene su propio CFL (U*dt/dx), que se transmite por
+    broadcasting dentro del esquema. Solo se guarda uno de cada `save_every` pasos.
+    Los diagnósticos (`diagnostics.METRICS`) se calculan para todo el
+    ensamble, un bloque de `block_steps` pasos guardados a la vez; con
+    `analytical=False` el campo analítico no se incluye en el resultado.
+    `dtype` es la precisión del esquema y de los campos guardados;
+    `accumulate`, la de las sumas de los diagnósticos (que se comparan contra
+    la solución exacta en float64). Con `backend='jit'` los `save_every`
+    pasos entre guardados corren en un solo llamado compilado, con los
+    miembros repartidos entre hilos. Para corridas largas, `write_sweep`
+    escribe los mismos datos en disco sin guardar el historial en memoria.
+    Returns:
+        xarray.Dataset: Campo numérico (y analítico) con dimensiones
+        (member, step, X), series de diagnóstico (member, step) y
+        coordenadas dt, nr, profile y CFL por miembro.
+    """
+    total_steps = Nx if total_steps is None else total_steps
+    steps, times, coords = _sweep_grid(members, u, dx, total_steps, save_every)
+    sink = _SweepArrays(len(members), len(steps))
+    _integrate(method, members, u, dx, Nx, total_steps, save_every, analytical, dtype, accumulate,
+               backend, sink, block_steps)
+
+    data_vars = {name: (["member", "step", "X"], sink.values.pop(name))
+                 for name in ("conc_unids", "conc_analytical") if name in sink.values}
+    data_vars.update(metric_variables(sink.values, ["member", "step"]))
+    time = pd.Timestamp('2020-01-01') + pd.to_timedelta(times.ravel(), unit='s')
+    return xr.Dataset(
+        data_vars,
+        coords={
+            "member": np.arange(len(members)),
+            "step": steps,
+            "X": np.arange(Nx),
+            **{name: ("member", values) for name, values in coords.items()},
+            "time": (["member", "step"], np.asarray(time).reshape(times.shape)),
+        },
+        attrs=_sweep_attrs(method, u, dx, Nx),
+    )
+
+def write_sweep(filename, method, members, u, dx, Nx=101, total_steps=None, save_every=1,
+                analytical=True, dtype="float64", accumulate="float64", backend="numpy",
+                output_dir="outputs/data", policy=None, block_steps=64):
+    """Como `run_sweep`, pero escribe cada bloque en un NetCDF (`SweepWriter`) al calcularlo.
+
+    La memoria queda acotada a un bloque de (miembros, `block_steps`, Nx)
+    para cualquier duración de la corrida.
+    Returns:
+        SweepWriter: Escritor ya cerrado (ruta y `report()`).
+    """
+    total_steps = Nx if total_steps is None else total_steps
+    steps, times, coords = _sweep_grid(members, u, dx, total_steps, save_every)
+    fields = ("conc_unids", "conc_analytical") if analytical else ("conc_unids",)
+    with SweepWriter(filename, Nx, dx, steps, times, coords, output_dir,
+                     attrs=_sweep_attrs(method, u, dx, Nx), policy=policy, fields=fields,
+                     series=METRICS) as writer:
+        _integrate(method, members, u, dx, Nx, total_steps, save_every, analytical, dtype,
+                   accumulate, backend, writer, block_steps)
+    return writer
@@ -1,7 +1,10 @@
+import os
 import matplotlib.pyplot as plt
 #from mpl_toolkits.mplot3d import Axes3D
 from matplotlib.colors import BoundaryNorm, LinearSegmentedColormap
+from matplotlib.cm import ScalarMappable
 import numpy as np
+from . import instrumentation
 
 def setup_plot_style():
     """Configura estilos globales para las figuras."""
@@ -49,66 +52,181 @@ def plot_1d_timeseries(ds, positions, save_path=None):
     # Implementar según necesidades
     pass
 
+class _Renderer:
+    """Base de los renderizadores reutilizables: estilo, niveles y salida del cuadro."""
+
+    def __init__(self, metodo, val_lim=25, profile="gauss"):
+        # Configuración de estilos
+        setup_plot_style()
+        self.nlevel = setup_custom_levels()
+        self.cmap = create_custom_colormap()
+        self.norm = BoundaryNorm(boundaries=self.nlevel, ncolors=256)
+        self.val_lim = val_lim
+        self.profile = profile
+        if 'anal' in metodo: self.meto1 = 'Analytical'
+        else: self.meto1 = metodo[:-12]
+
+    def _clip(self, data):
+        """Filtra valores fuera de los límites (sin modificar el dataset de entrada)."""
+        return np.where((data > self.val_lim) | (data < -self.val_lim), np.nan, data)
+
+    def _set_title(self, ti, dt, CFL):
+        """Título con parámetros de simulación."""
+        self.title.set_text(f"{self.meto1} (Profile: {self.profile})\ndt: {dt}, CFL: {CFL:.2f}\nt: {ti*dt} seg.")
+
+    def to_array(self, dpi=200):
+        """Renderiza el cuadro actual en memoria, sin pasar por disco.
+
+        Returns:
+            numpy.ndarray: Imagen RGBA (alto, ancho, 4) en uint8. Es una vista
+            del buffer del lienzo, válida hasta el próximo dibujo.
+        """
+        with instrumentation.stage("render_rasterize"):
+            self.fig.set_dpi(dpi)
+            self.fig.canvas.draw()
+            return np.asarray(self.fig.canvas.buffer_rgba())
+
+    def save(self, save_path, dpi=200):
+        """Guarda el cuadro actual."""
+        with instrumentation.stage("render_save", frames=1):
+            self.fig.savefig(save_path, dpi=dpi) #bbox_inches='tight')
+        if instrumentation.is_enabled():
+            instrumentation.count("render_save", bytes=os.path.getsize(save_path))
+
+    def close(self):
+        plt.close(self.fig)
+
+class SurfaceRenderer(_Renderer):
+    """Renderizador 3D reutilizable para animaciones cuadro a cuadro.
+
+    Construye una sola vez la figura, los ejes, la barra de colores, el
+    colormap y los niveles; en cada cuadro solo reemplaza la superficie y
+    actualiza el título.
+    Args:
+        metodo (str): Nombre del método numérico usado.
+        val_lim (float): Límite para los valores de concentración.
+        profile (str): Perfil inicial (se muestra en el título).
+    """
+
+    def __init__(self, metodo, val_lim=25, profile="gauss"):
+        super().__init__(metodo, val_lim, profile)
+        # Crear figura 3D
+        self.fig = plt.figure(figsize=(5,6))
+        ax = self.ax = self.fig.add_subplot(111, projection='3d')
+        # Configuración de la vista 3D
+        ax.view_init(elev=25, azim=-100)
+        ax.set_box_aspect([1.6, 1.1, 1])
+        # Configuración de ejes y límites
+        ax.set_zlim(-val_lim, val_lim)
+        ax.set_xlim(-1, 100)
+        ax.set_ylim(-250,250)
+        ax.set_xlabel('X')
+        ax.set_yticks([])
+        # Etiquetas y estilo
+        ax.xaxis._axinfo["grid"].update({'color': 'k', 'linestyle': ':', 'alpha': 0.2, 'linewidth': .5})
+        ax.zaxis._axinfo["grid"].update({'color': '.5', 'linestyle': '-.', 'alpha': 0.1, 'linewidth': .39})
+        # Barra de colores
+        self.fig.colorbar(ScalarMappable(norm=self.norm, cmap=self.cmap), ax=ax, shrink=0.5, alpha=0.9,
+                          label='Conc. Unids', ticks=self.nlevel[::2])
+        self.title = ax.set_title('', y=0.87, fontsize=12)
+        # Estilo de fondos 3D
+        ax.zaxis.set_pane_color((0.7, 0.7, 0.7, 1.0))  # Plano YZ
+        ax.yaxis.set_pane_color((0.9, 0.9, 0.91, 1.0)) # Plano XY
+        self._surf = None
+        self._grid = None
+
+    @instrumentation.timed("render_draw")
+    def draw(self, ds_t0, ti, dt, CFL):
+        """Dibuja un cuadro: reemplaza la superficie y actualiza el título."""
+        # Obtener coordenadas y datos
+        lon = ds_t0.X.values
+        lat = ds_t0.Y.values
+        if self._grid is None or self._grid[0].shape != (len(lat), len(lon)):
+            self._grid = np.meshgrid(lon, lat)
+        data = self._clip(ds_t0["conc_unids"].values)
+        # Graficar superficie
+        if self._surf is not None:
+            self._surf.remove()
+        self._surf = self.ax.plot_surface(self._grid[0], self._grid[1], data, cmap=self.cmap,
+                                          norm=self.norm, edgecolor='.1', alpha=0.9, linewidth=0.2)
+        self._set_title(ti, dt, CFL)
+        return self.fig
+
+class FieldRenderer(_Renderer):
+    """Renderizador reutilizable de mapas (x, y) para simulaciones 2-D reales.
+
+    Misma interfaz que `SurfaceRenderer`. La malla de colores se crea en el
+    primer cuadro y después solo se actualizan sus valores, así que también
+    sirve para campos de 1000x1000.
+    """
+
+    def __init__(self, metodo, val_lim=25, profile="cone"):
+        super().__init__(metodo, val_lim, profile)
+        # Márgenes amplios arriba y abajo, como la figura 3D: `crop_frame` los recorta
+        self.fig, self.ax = plt.subplots(figsize=(6, 8.5))
+        self.fig.subplots_adjust(left=0.12, right=0.9, bottom=0.26, top=0.7)
+        self.ax.set_xlabel('X')
+        self.ax.set_ylabel('Y')
+        self.ax.set_aspect('equal')
+        self.fig.colorbar(ScalarMappable(norm=self.norm, cmap=self.cmap), ax=self.ax, shrink=0.8,
+                          label='Conc. Unids', ticks=self.nlevel[::2])
+        self.title = self.ax.set_title('', fontsize=11)
+        self._mesh = None
+
+    @instrumentation.timed("render_draw")
+    def draw(self, ds_t, ti, dt, CFL):
+        """Dibuja un cuadro (Y, X): actualiza los valores de la malla y el título."""
+        data = self._clip(ds_t["conc_unids"].values)
+        if self._mesh is None or self._mesh.get_array().shape != data.shape:
+            if self._mesh is not None:
+                self._mesh.remove()
+            self._mesh = self.ax.pcolormesh(ds_t.X.values, ds_t.Y.values, data, cmap=self.cmap,
+                                            norm=self.norm, shading='nearest')
+        else:
+            self._mesh.set_array(data)
+        self._set_title(ti, dt, CFL)
+        return self.fig
+
+def make_renderer(metodo, profile="gauss", two_d=False, val_lim=25):
+    """Renderizador adecuado al archivo: mapa 2-D o superficie 3D del campo 1-D."""
+    cls = FieldRenderer if two_d else SurfaceRenderer
+    return cls(metodo, val_lim, profile)
+
+def plot_2d_field(ds_t, metodo, ti, dt, CFL, val_lim=25, save_path=None, profile="cone"):
+    """Genera y guarda el mapa (x, y) de un cuadro de una simulación 2-D.
+
+    Args:
+        ds_t (xarray.Dataset): Dataset (Y, X) de un tiempo (p. ej. `FrameReader.frame`).
+    Los demás argumentos son los de `plot_3d_surface`.
+    """
+    renderer = FieldRenderer(metodo, val_lim, profile)
+    renderer.draw(ds_t, ti, dt, CFL)
+    if save_path:
+        renderer.save(save_path)
+        renderer.close()
+    else:
+        plt.show()
+
+@instrumentation.timed()
 def plot_3d_surface(ds_t0, metodo, ti, dt, CFL, val_lim=25, save_path=None, profile="gauss"):
     """Genera y guarda un gráfico 3D de la superficie de concentración.    
     Args:
-        ds_t0 (xarray.Dataset): Dataset con los datos de concentración.
+        ds_t0 (xarray.Dataset): Dataset (Y, X) con los datos de concentración
+            (ver `data_handling.extrude_y` para datasets compactos).
         metodo (str): Nombre del método numérico usado.
         ti (int): Índice de tiempo a visualizar.
         dt (float): Paso de tiempo.
         CFL (float): Número CFL de la simulación.
         val_lim (float): Límite para los valores de concentración.
         save_path (str, optional): Ruta para guardar la figura. Si es None, no guarda.
+    Para series largas de cuadros conviene reutilizar un `SurfaceRenderer`.
     """
-    # Configuración de estilos
-    setup_plot_style()
-    nlevel = setup_custom_levels()
-    custom_cmap = create_custom_colormap()
-    # Crear figura 3D
-    fig = plt.figure(figsize=(5,6))
-    ax = fig.add_subplot(111, projection='3d')
-    # Obtener coordenadas y datos
-    lon = ds_t0.X.values
-    lat = ds_t0.Y.values
-    lon_grid, lat_grid = np.meshgrid(lon, lat)
-    data = ds_t0["conc_unids"].values    
-    # Filtrar valores fuera de los límites
-    data[data > val_lim] = np.nan
-    data[data < -val_lim] = np.nan    
-    # Configuración de la vista 3D
-    ax.view_init(elev=25, azim=-100)
-    ax.set_box_aspect([1.6, 1.1, 1])    
-    # Graficar superficie
-    norm = BoundaryNorm(boundaries=nlevel, ncolors=256)
-    surf = ax.plot_surface(lon_grid, lat_grid, data, cmap=custom_cmap, norm=norm, 
-                           edgecolor='.1', alpha=0.9, linewidth=0.2)    
-    # Configuración de ejes y límites
-    ax.set_zlim(-val_lim, val_lim)
-    ax.set_xlim(-1, 100)
-    ax.set_ylim(-250,250)
-    ax.set_xlabel('X')
-    ax.set_yticks([])   
-    
-    # Etiquetas y estilo
-    ax.xaxis._axinfo["grid"].update({'color': 'k', 'linestyle': ':', 'alpha': 0.2, 'linewidth': .5})
-    ax.zaxis._axinfo["grid"].update({'color': '.5', 'linestyle': '-.', 'alpha': 0.1, 'linewidth': .39})
-    # Barra de colores
-    fig.colorbar(surf, ax=ax, shrink=0.5, label='Conc. Unids', ticks=nlevel[::2])
- 
-    # Título con parámetros de simulación
-    if 'anal' in metodo: meto1='Analytical'
-    else: meto1=metodo[:-12]
-    title = f"{meto1} (Profile: {profile})\ndt: {dt}, CFL: {CFL:.2f}\nt: {ti*dt} seg."
-    
-    ax.set_title(title, y=0.87, fontsize=12)
-    
-    # Estilo de fondos 3D
-    ax.zaxis.set_pane_color((0.7, 0.7, 0.7, 1.0))  # Plano YZ
-    ax.yaxis.set_pane_color((0.9, 0.9, 0.91, 1.0)) # Plano XY
+    renderer = SurfaceRenderer(metodo, val_lim, profile)
+    renderer.draw(ds_t0, ti, dt, CFL)
     
     # Guardar figura si se especifica ruta
     if save_path:
-        fig.savefig(save_path, dpi=200,) #bbox_inches='tight')
-        plt.close(fig)
+        renderer.save(save_path)
+        renderer.close()
     else:
         plt.show()
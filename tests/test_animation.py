@@ -0,0 +1,127 @@
+import shutil
+import numpy as np
+import pytest
+from PIL import Image
+from src.animation import crop_frame, encode_gif, encode_ffmpeg
+
+def _frames(n, height=40, width=30):
+    """Cuadros RGBA sintéticos distintos entre sí"""
+    for i in range(n):
+        frame = np.zeros((height, width, 4), dtype=np.uint8)
+        frame[..., 3] = 255
+        frame[:, i % width, 0] = 255
+        yield frame
+
+def test_crop_frame_matches_pil_crop():
+    """El recorte por slicing coincide con Image.crop y no copia datos"""
+    frame = next(_frames(1, height=43))
+    cropped = crop_frame(frame, espacio=5)
+    img = Image.fromarray(frame)
+    expected = np.asarray(img.crop((0, 43 // 5, 30, 4 * 43 // 5)))
+    assert np.array_equal(cropped, expected)
+    assert np.shares_memory(cropped, frame)
+
+def test_encode_gif_from_generator(tmp_path):
+    """El GIF se escribe consumiendo un generador de cuadros"""
+    path = tmp_path / "anim.gif"
+    assert encode_gif(_frames(5), path, duration=40) == 5
+    with Image.open(path) as gif:
+        assert gif.n_frames == 5
+        assert gif.size == (30, 40)
+    with pytest.raises(ValueError):
+        encode_gif(iter([]), tmp_path / "empty.gif")
+
+def test_encode_gif_writes_incrementally(tmp_path):
+    """Cada cuadro llega al archivo antes de pedir el siguiente (memoria acotada)"""
+    path = tmp_path / "anim.gif"
+    sizes = []
+    def frames():
+        for frame in _frames(4):
+            sizes.append(path.stat().st_size if path.exists() else 0)
+            yield frame
+    assert encode_gif(frames(), path, duration=40) == 4
+    assert sizes[1] < sizes[2] < sizes[3]
+    with Image.open(path) as gif:
+        gif.seek(2)
+        assert gif.info["duration"] == 40
+        assert np.array_equal(np.asarray(gif.convert("RGB")), list(_frames(3))[2][..., :3])
+
+def test_encode_gif_repeated_frames(tmp_path):
+    """Un cuadro repetido se escribe igual (solo cambia el rectángulo modificado)"""
+    first, second = _frames(2)
+    path = tmp_path / "anim.gif"
+    assert encode_gif([first, first, second], path) == 3
+    with Image.open(path) as gif:
+        assert gif.n_frames == 3
+        for i, expected in enumerate([first, first, second]):
+            gif.seek(i)
+            assert np.array_equal(np.asarray(gif.convert("RGB")), expected[..., :3])
+
+@pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="ffmpeg no disponible")
+def test_encode_ffmpeg_mp4(tmp_path):
+    """ffmpeg recibe los cuadros por stdin y produce un video"""
+    path = tmp_path / "anim.mp4"
+    assert encode_ffmpeg(_frames(5, height=41, width=31), path) == 5
+    assert path.stat().st_size > 0
+
+def test_resolve_engine_fallback(monkeypatch):
+    """Sin binarios externos se cae a Pillow con salida GIF"""
+    from src.animation import resolve_engine
+    monkeypatch.setenv("PATH", "")
+    assert resolve_engine("pillow") == ("pillow", "gif")
+    assert resolve_engine("imagemagick") == ("pillow", "gif")
+    assert resolve_engine("pillow", "mp4") == ("pillow", "gif")
+    with pytest.raises(ValueError):
+        resolve_engine("avconv")
+
+def test_imagemagick_command(tmp_path, monkeypatch):
+    """El motor ImageMagick recibe delay en centésimas, loop y los cuadros en orden"""
+    from src.animation import encode_imagemagick
+    log = tmp_path / "args.txt"
+    fake = tmp_path / "magick"
+    fake.write_text(f'#!/bin/sh\necho "$@" > {log}\n')
+    fake.chmod(0o755)
+    monkeypatch.setenv("PATH", str(tmp_path))
+    assert encode_imagemagick(["a.png", "b.png"], "out.gif", duration=50) == 2
+    assert log.read_text().split() == ["-delay", "5", "-loop", "0", "a.png", "b.png", "out.gif"]
+
+def test_parallel_crop_keeps_order(tmp_path):
+    """El recorte en paralelo conserva el orden y coincide con el recorte serie"""
+    from p03_make_animation import crop_image, crop_images
+    paths = []
+    for i, frame in enumerate(_frames(6)):
+        path = tmp_path / f"3D{i:03d}.png"
+        Image.fromarray(frame).save(path)
+        paths.append(str(path))
+    parallel = crop_images(paths[::-1], espacio=4, max_workers=3)
+    serial = [crop_image(p, espacio=4) for p in paths]
+    assert [np.asarray(a).tolist() for a in parallel] == [np.asarray(b).tolist() for b in serial]
+
+def test_render_frames_title_uses_file_cfl(tmp_path, monkeypatch):
+    """El CFL del título sale del atributo del archivo (en 2-D depende del campo de velocidad)"""
+    import netCDF4
+    import p01_run_simulation as p01
+    from src import animation
+    monkeypatch.setattr(p01, "DATA_DIR", str(tmp_path))
+    name = p01.run_simulation_2d(25.0, None, "cone", "rotation", Nx=16, total_steps=2)
+    path = str(tmp_path / f"{name}_numerical.nc")
+    with netCDF4.Dataset(path) as nc:
+        cfl = float(nc.CFL_number)
+    assert cfl != p01.U * 25.0 / p01.DX
+    drawn = []
+
+    class Recorder:
+        def draw(self, ds, ti, dt, CFL):
+            drawn.append(CFL)
+
+        def to_array(self, dpi):
+            return np.zeros((10, 4, 4), dtype=np.uint8)
+
+        def close(self):
+            pass
+
+    monkeypatch.setattr(animation, "make_renderer", lambda *args: Recorder())
+    assert len(list(animation.render_frames(path, "Upwind 2D split", 25.0, profile="cone"))) == 2
+    assert drawn == [cfl, cfl]
+    assert list(animation.render_frames(path, "Upwind 2D split", 25.0, CFL=2.0, profile="cone"))
+    assert drawn[-1] == 2.0
@@ -0,0 +1,38 @@
+import json
+from benchmarks import run as bench
+
+def test_discover_expands_parameters():
+    """Cada combinación de parámetros es un caso; el filtro usa el nombre completo"""
+    cases = bench.discover(r"TimeEulerBackwardStep\.time_step$")
+    assert [c.params["Nx"] for c in cases] == [10 ** 2, 10 ** 3, 10 ** 4, 10 ** 5, 10 ** 6]
+    assert all(c.name == "bench_steppers.TimeEulerBackwardStep.time_step" for c in cases)
+
+def test_setup_not_implemented_skips_case():
+    """Un NotImplementedError en setup omite la combinación (p. ej. Crank-Nicolson con 'jit')"""
+    from benchmarks.bench_steppers import TimeSchemes
+    case = bench.Case("bench_steppers.TimeSchemes.time_step_n", TimeSchemes, "time_step_n",
+                      {"method": "Crank-Nicolson", "Nx": 100, "backend": "jit"})
+    assert bench.run_case(case) is None
+
+def test_run_save_and_compare(tmp_path):
+    """Una corrida se guarda en JSON y la comparación marca regresiones por umbral"""
+    results = bench.run(r"TimeEulerBackwardStep", min_time=0.0, repeat=1, verbose=False)
+    assert len(results["results"]) == 10
+    # Los `track_*` guardan el valor devuelto con su unidad
+    from benchmarks.bench_io import TimeSaveLoad
+    track = bench.run_case(bench.Case("bench_io.TimeSaveLoad.track_bytes", TimeSaveLoad, "track_bytes",
+                                      {"complevel": 0, "shape": (11, 11)}))
+    assert track["unit"] == "bytes" and track["value"] > 11 * 11 * 8
+    results["results"].append(track)
+    path = bench.save(results, str(tmp_path / "base.json"))
+    base = bench.load(path)
+    assert base["environment"]["commit"]
+
+    slower = json.loads(json.dumps(base))
+    for record in slower["results"]:
+        if record["unit"] == "seconds":
+            record["min"] *= 2
+    rows = bench.compare(base, slower, threshold=1.2)
+    assert len(rows) == len(base["results"])
+    assert {mark for _, _, _, _, mark in rows} == {"+", ""}  # tiempos duplicados, bytes iguales
+    assert all(mark == "" for _, _, _, _, mark in bench.compare(base, base))
@@ -0,0 +1,61 @@
+import os
+import shutil
+import numpy as np
+import xarray as xr
+import p01_run_simulation as p01
+from src import cache as cache_module
+from src.cache import RunCache, run_key, code_files
+
+def test_run_key_canonical():
+    """Parámetros equivalentes dan la misma clave y cualquier cambio la altera"""
+    params = {'method': 'RK4', 'dt': 30, 'Nx': 101, 'nr': np.float64(10.0)}
+    assert run_key(params) == run_key({'Nx': 101.0, 'nr': 10.0, 'dt': 30.0, 'method': 'RK4'})
+    assert run_key(params) != run_key(dict(params, dt=30.5))
+    assert run_key({'nr': np.nan}) == run_key({'nr': None})
+
+def test_code_version_covers_driver_and_src(tmp_path, monkeypatch):
+    """Editar el script de simulación o cualquier módulo de src/ cambia la clave"""
+    files = code_files()
+    assert "p01_run_simulation.py" in files and "src/data_handling.py" in files
+    for name in files:
+        os.makedirs(tmp_path / os.path.dirname(name), exist_ok=True)
+        shutil.copyfile(os.path.join(cache_module.BASE_DIR, name), tmp_path / name)
+    monkeypatch.setattr(cache_module, "BASE_DIR", str(tmp_path))
+    params = {'method': 'RK4', 'dt': 30}
+    before = run_key(params)
+    for name in ("p01_run_simulation.py", "src/data_handling.py"):
+        with open(tmp_path / name, "a") as f:
+            f.write("\n# cambio\n")
+        assert run_key(params) != before
+        before = run_key(params)
+
+def test_run_simulation_cache_hit(tmp_path, monkeypatch):
+    """Una corrida repetida se copia desde la caché con contenido idéntico"""
+    monkeypatch.setattr(p01, "DATA_DIR", str(tmp_path / "data"))
+    cache = RunCache(str(tmp_path / "cache"))
+    name = p01.run_simulation(30.0, 10.0, "Matsuno", "gauss", Nx=64, cache=cache)
+    path = os.path.join(tmp_path / "data", f"{name}_numerical.nc")
+    with xr.open_dataset(path) as ds:
+        expected = ds.conc_unids.values
+    os.remove(path)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("no debería recalcular")
+    monkeypatch.setattr(p01, "simulate", fail)
+    assert p01.run_simulation(30.0, 10.0, "Matsuno", "gauss", Nx=64, cache=cache) == name
+    with xr.open_dataset(path) as ds:
+        assert np.array_equal(ds.conc_unids.values, expected)
+    assert cache.entries()[0]["hits"] >= 1
+
+def test_lru_eviction(tmp_path):
+    """Al superar el tamaño máximo se desalojan las entradas menos usadas"""
+    cache = RunCache(str(tmp_path / "cache"), max_bytes=2500)
+    for i in range(3):
+        f = tmp_path / f"run{i}.bin"
+        f.write_bytes(b"x" * 1000)
+        cache.put(f"k{i}", {"data": str(f)})
+        if i == 1:
+            cache.get("k0")  # k0 pasa a ser la más reciente
+    keys = {m["key"] for m in cache.entries()}
+    assert keys == {"k0", "k2"}
+    assert cache.size() <= 2500
@@ -0,0 +1,82 @@
+import os
+import numpy as np
+import p01_run_simulation as p01
+from src.catalog import Catalog
+
+def test_writers_register_runs(tmp_path, monkeypatch):
+    """Las corridas escritas quedan indexadas y se encuentran por parámetros"""
+    monkeypatch.setattr(p01, "DATA_DIR", str(tmp_path))
+    name = p01.run_simulation(30.0, 10.0, "Matsuno", "gauss", Nx=64, total_steps=20, save_every=5)
+    sweep = p01.run_sweep_simulation("RK4", [30.0, 40.0], [10.0], ["gauss"], Nx=64, total_steps=10)
+
+    with Catalog(str(tmp_path)) as catalog:
+        run = catalog.find(method="Matsuno", data_type="numerical", dt=30, nr=10, profile="gauss")
+        assert [r["path"] for r in run] == [os.path.join(tmp_path, f"{name}_numerical.nc")]
+        assert (run[0]["nx"], run[0]["n_times"], run[0]["t_end"]) == (64, 4, 450.0)
+        assert catalog.find_one(method="Runge-Kutta", data_type="sweep") == \
+            os.path.join(tmp_path, f"{sweep}.nc")
+        assert catalog.find(method="Matsuno", dt=30.5) == []
+        assert len(catalog.find(dx=500)) == 3
+
+def test_rebuild_and_stale_entries(tmp_path, monkeypatch):
+    """Un catálogo nuevo indexa los archivos existentes y olvida los borrados"""
+    monkeypatch.setattr(p01, "DATA_DIR", str(tmp_path))
+    name = p01.run_simulation(40.0, 2.0, "EB", "gauss", Nx=32, total_steps=8)
+    os.remove(tmp_path / "catalog.sqlite")
+
+    with Catalog(str(tmp_path)) as catalog:
+        assert len(catalog.find(method="Euler Backward", nr=2.0)) == 2
+        os.remove(tmp_path / f"{name}_analytical.nc")
+        assert [r["data_type"] for r in catalog.find(dt=np.float64(40.0))] == ["numerical"]
+        assert catalog._db.execute("SELECT COUNT(*) FROM runs").fetchone()[0] == 1
+
+def test_lookup_by_grid_size(tmp_path, monkeypatch):
+    """p02 y p03 encuentran corridas de cualquier Nx y eligen una con --nx"""
+    import p02_generate_plots as p02
+    import p03_make_animation as p03
+    monkeypatch.setattr(p01, "DATA_DIR", str(tmp_path / "data"))
+    monkeypatch.setattr(p02, "DATA_DIR", str(tmp_path / "data"))
+    monkeypatch.setattr(p03, "OUTPUTS_DIR", str(tmp_path))
+    small = p01.run_simulation(30.0, 10.0, "RK4", "gauss", Nx=32, total_steps=4)
+    large = p01.run_simulation(30.0, 10.0, "RK4", "gauss", Nx=64, total_steps=6)
+
+    assert p02.find_data_file(30.0, "gauss", 10.0, "RK4", Nx=32) == \
+        str(tmp_path / "data" / f"{small}_numerical.nc")
+    assert p02.find_data_file(30.0, "gauss", 10.0, "RK4") is not None
+    assert p02.find_data_file(30.0, "gauss", 10.0, "RK4", Nx=101) is None
+    fig_dir = str(tmp_path / "figures" / "RK4")
+    rendered = p02.render_file(str(tmp_path / "data" / f"{large}_numerical.nc"), fig_dir, "RK4",
+                               "gauss", 30.0)
+    assert p03.find_image_sequence("RK4", 30.0, "gauss", 10.0, Nx=64) == rendered
+    assert p03.animation_name("RK4", 30.0, "gauss", 10.0, Nx=64).endswith("_nx64_numerical_cropped.gif")
+
+def test_2d_runs_by_velocity(tmp_path, monkeypatch):
+    """Corridas 2-D de igual dt, perfil y Nx se distinguen por campo de velocidad y Ny"""
+    import sqlite3
+    import p02_generate_plots as p02
+    import p03_make_animation as p03
+    monkeypatch.setattr(p01, "DATA_DIR", str(tmp_path))
+    monkeypatch.setattr(p02, "DATA_DIR", str(tmp_path))
+    rotation = p01.run_simulation_2d(25.0, None, "cone", "rotation", Nx=16, total_steps=3)
+    uniform = p01.run_simulation_2d(25.0, None, "cone", "uniform", Nx=16, Ny=12, total_steps=3)
+
+    method = p02.run_method("Euler Backward", "rotation")
+    assert method == "Upwind 2D split"
+    assert p02.find_data_file(25.0, "cone", method=method, Nx=16, velocity="rotation") == \
+        str(tmp_path / f"{rotation}_numerical.nc")
+    assert p02.find_data_file(25.0, "cone", method=method, Ny=12) == \
+        str(tmp_path / f"{uniform}_numerical.nc")
+    assert p02.find_data_file(25.0, "cone", method="Euler Backward") is None
+    assert p03.animation_name(method, 25.0, "cone", Nx=16, velocity="rotation") == \
+        "Upwind2Dsplit_rotation_dt25.0_profilecone_nx16_numerical_cropped.gif"
+
+    # Un catálogo de una versión anterior (sin esas columnas) se migra al abrirlo
+    os.remove(tmp_path / "catalog.sqlite")
+    with sqlite3.connect(tmp_path / "catalog.sqlite") as db:
+        db.execute("CREATE TABLE runs (path TEXT PRIMARY KEY, method TEXT, method_key TEXT, "
+                   "data_type TEXT, profile TEXT, dt REAL, nr REAL, dx REAL, u REAL, nx INTEGER, "
+                   "cfl REAL, n_times INTEGER, t_start REAL, t_end REAL, size INTEGER, "
+                   "mtime REAL, schema_version INTEGER)")
+    db.close()
+    with Catalog(str(tmp_path)) as catalog:
+        assert [r["velocity"] for r in catalog.find(data_type="numerical", Ny=16)] == ["rotation"]
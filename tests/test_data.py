@@ -1,5 +1,9 @@
+import os
+import pytest
 import xarray as xr
-from src.data_handling import create_dataset
+import numpy as np
+from src.data_handling import (create_dataset, save_dataset, StreamingWriter, load_dataset,
+                               extrude_y, EncodingPolicy, FrameReader, SCHEMA_VERSION)
 from src.physics import gauss, euler_backward_step
 
 def test_dataset_structure(sample_parameters):
@@ -13,3 +17,102 @@ def test_dataset_structure(sample_parameters):
     
     assert "conc_unids" in ds
     assert ds.dims["time"] == 10
+    assert ds.conc_unids.dims == ("time", "X")
+
+def test_streaming_writer_roundtrip(sample_parameters, tmp_path):
+    """Verifica que el escritor incremental produce el mismo contenido que create_dataset"""
+    p = sample_parameters
+    X = [e * p['dx'] for e in range(p['Nx'])]
+    T = [e * p['dt'] for e in range(10)]
+    M = [[gauss(x, t, p['nr'], p['u'], p['dx'], p['Nx']) for x in X] for t in T]
+
+    with StreamingWriter("stream", p['Nx'], p['dx'], output_dir=tmp_path, buffer_steps=3) as writer:
+        for field, t in zip(M, T):
+            writer.append(field, t)
+    ds = load_dataset("stream", output_dir=tmp_path)
+    expected = create_dataset(M, p['Nx'], p['dx'], T)
+
+    assert np.array_equal(ds.conc_unids.values, expected.conc_unids.values)
+    assert np.array_equal(ds.time.values, expected.time.values)
+
+def test_legacy_file_compact_and_extruded_view():
+    """Verifica la carga compacta de archivos (time, Y, X) y la vista Y sin copia"""
+    data_dir = os.path.join(os.path.dirname(__file__), "..", "outputs", "data")
+    name = "EulerBackward_dt30.0_CFL0.6_dx500_profilegauss_nr10.0_numerical"
+    legacy = xr.open_dataset(os.path.join(data_dir, f"{name}.nc"))
+    ds = load_dataset(name, output_dir=data_dir)
+    view = extrude_y(ds)
+
+    assert ds.conc_unids.dims == ("time", "X")
+    assert ds.attrs["schema_version"] == SCHEMA_VERSION
+    assert np.array_equal(view.conc_unids.values, legacy.conc_unids.values)
+    # Con los datos ya en memoria la vista no copia
+    ds.load()
+    assert np.shares_memory(extrude_y(ds).conc_unids.values, ds.conc_unids.values)
+
+def test_quantized_encoding_error_bound(sample_parameters, tmp_path):
+    """Verifica la cota de error de la cuantización y el registro de la política"""
+    p = sample_parameters
+    X = np.arange(p['Nx']) * p['dx']
+    T = np.arange(20) * p['dt']
+    M = gauss(X, T[:, None], p['nr'], p['u'], p['dx'], p['Nx'])
+    policy = EncodingPolicy(complevel=9, chunk_time=4, quantize=1e-3)
+
+    save_dataset(create_dataset(M, p['Nx'], p['dx'], T), "quant", tmp_path, policy=policy)
+    ds = load_dataset("quant", output_dir=tmp_path)
+
+    assert np.abs(ds.conc_unids.values - M).max() <= 1e-3
+    assert ds.attrs["quantization_error_bound"] == 1e-3
+    assert ds.conc_unids.encoding["chunksizes"] == (4, p['Nx'])
+
+def test_frame_reader_reads_single_frames():
+    """Verifica la lectura cuadro a cuadro (también de archivos antiguos) sobre un único buffer"""
+    data_dir = os.path.join(os.path.dirname(__file__), "..", "outputs", "data")
+    name = "EulerBackward_dt30.0_CFL0.6_dx500_profilegauss_nr10.0_numerical"
+    expected = load_dataset(name, output_dir=data_dir).conc_unids.values
+
+    with FrameReader(os.path.join(data_dir, f"{name}.nc")) as frames:
+        first = frames.read(0)
+        assert len(frames) == expected.shape[0]
+        assert np.array_equal(frames.frame(3).conc_unids.values, expected[3])
+        assert frames.read(7) is first
+        assert np.array_equal(extrude_y(frames.frame(5)).conc_unids.values[1], expected[5])
+
+def test_extrude_y_stays_lazy(sample_parameters, tmp_path):
+    """La vista Y de un archivo abierto no lo carga: solo se lee lo seleccionado"""
+    p = sample_parameters
+    M = np.random.default_rng(0).random((30, p['Nx']))
+    save_dataset(create_dataset(M, p['Nx'], p['dx'], np.arange(30) * p['dt']), "lazy", tmp_path)
+    with xr.open_dataset(tmp_path / "lazy.nc") as ds:
+        view = extrude_y(ds)
+        assert view.conc_unids.shape == (30, 2, p['Nx'])
+        assert np.array_equal(view.conc_unids.isel(time=4).values, np.stack([M[4], M[4]]))
+        assert not ds.conc_unids.variable._in_memory
+        assert np.array_equal(view.conc_unids[2:6, 1, ::3].values, M[2:6, ::3])
+
+@pytest.mark.parametrize("policy", [EncodingPolicy(dtype="float32"), EncodingPolicy(quantize=1e-3)],
+                         ids=["float32", "quantized"])
+def test_frame_reader_keeps_file_precision(sample_parameters, tmp_path, policy):
+    """Los cuadros float32 y cuantizados se leen en float32, sin pasar por float64"""
+    p = sample_parameters
+    M = np.random.default_rng(1).random((8, p['Nx']))
+    save_dataset(create_dataset(M, p['Nx'], p['dx'], np.arange(8) * p['dt']), "prec", tmp_path,
+                 policy=policy)
+    with FrameReader(str(tmp_path / "prec.nc")) as frames:
+        assert frames.read(3).dtype == np.float32
+        assert np.abs(frames.read(3) - M[3]).max() <= 1e-3
+
+def test_frame_reader_fills_masked_in_place(sample_parameters, tmp_path):
+    """Los valores fuera de rango de la cuantización se leen como NaN dentro del mismo buffer"""
+    p = sample_parameters
+    M = np.random.default_rng(2).random((4, p['Nx']))
+    M[2, 5] = 1e3  # fuera del rango ±32767*scale_factor
+    save_dataset(create_dataset(M, p['Nx'], p['dx'], np.arange(4) * p['dt']), "mask", tmp_path,
+                 policy=EncodingPolicy(quantize=1e-3))
+    with FrameReader(str(tmp_path / "mask.nc")) as frames:
+        buffer = frames.read(0)
+        frame = frames.read(2)
+        assert frame is buffer
+        assert np.isnan(frame[5]) and np.isnan(frame).sum() == 1
+        assert np.abs(np.delete(frame, 5) - np.delete(M[2], 5)).max() <= 1e-3
+        assert not np.isnan(frames.read(3)).any()
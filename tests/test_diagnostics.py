@@ -0,0 +1,92 @@
+import os
+import numpy as np
+import xarray as xr
+import p01_run_simulation as p01
+from src.diagnostics import METRICS, DiagnosticsStage, compute_metrics
+from src.sweep import build_members, run_sweep
+
+def test_metrics_match_reference_loop():
+    """Las reducciones vectorizadas coinciden con un cálculo paso a paso"""
+    rng = np.random.default_rng(0)
+    C, A = rng.normal(size=(2, 3, 5, 40))
+    metrics = compute_metrics(C, A, 500)
+
+    assert set(metrics) == set(METRICS)
+    for i in range(3):
+        for j in range(5):
+            e = C[i, j] - A[i, j]
+            assert np.isclose(metrics["err_l1"][i, j], np.mean(np.abs(e)))
+            assert np.isclose(metrics["err_l2"][i, j], np.sqrt(np.mean(e ** 2)))
+            assert np.isclose(metrics["err_linf"][i, j], np.max(np.abs(e)))
+            assert np.isclose(metrics["mass"][i, j], np.sum(C[i, j]) * 500)
+            assert np.isclose(metrics["variance"][i, j], np.sum(C[i, j] ** 2) * 500)
+            assert metrics["peak"][i, j] == C[i, j].max()
+            assert metrics["peak_position"][i, j] == np.argmax(C[i, j]) * 500.0
+
+def test_stage_flushes_in_blocks():
+    """La etapa en línea entrega bloques consecutivos con el índice correcto"""
+    received = []
+    stage = DiagnosticsStage(lambda times: np.zeros((len(times), 8)), 8, 1.0,
+                             lambda start, metrics: received.append((start, metrics["peak"])),
+                             block_size=4)
+    for n in range(10):
+        stage.record(np.full(8, float(n)), n)
+    stage.flush()
+    assert [start for start, _ in received] == [0, 4, 8]
+    assert np.array_equal(np.concatenate([peak for _, peak in received]), np.arange(10.0))
+
+def test_float32_accumulation_keeps_field_precision(tmp_path, monkeypatch):
+    """--accumulate float32 sobre una corrida float64 solo redondea las reducciones"""
+    rng = np.random.default_rng(1)
+    A = rng.random((4, 64))
+    C = A + 1e-7 * rng.normal(size=A.shape)  # errores muy por debajo del ulp float32 de C
+    exact, single = compute_metrics(C, A, 500), compute_metrics(C, A, 500, np.float32)
+    for key in METRICS:
+        assert single[key].dtype == np.float32
+        assert np.allclose(single[key], exact[key], rtol=1e-5, atol=0)
+
+    stage = DiagnosticsStage(lambda times: A[:len(times)], 64, 500, lambda start, metrics: None,
+                             dtype=np.float32)
+    stage.record(C[0].astype(np.float32), 0.0)
+    assert stage._buffer.dtype == np.float32
+
+    names = {}
+    for accumulate in ("float64", "float32"):
+        monkeypatch.setattr(p01, "DATA_DIR", str(tmp_path / accumulate))
+        names[accumulate] = p01.run_simulation(30.0, 10.0, "RK4", "gauss", Nx=64, total_steps=40,
+                                               accumulate=accumulate, write_analytical=False)
+    with xr.open_dataset(tmp_path / "float64" / f"{names['float64']}_numerical.nc") as ref, \
+            xr.open_dataset(tmp_path / "float32" / f"{names['float32']}_numerical.nc") as low:
+        for key in METRICS:
+            assert np.allclose(low[key].values, ref[key].values, rtol=1e-5, atol=1e-12)
+
+def test_run_stores_diagnostics_without_analytical(tmp_path, monkeypatch):
+    """Las series del archivo numérico coinciden con las calculadas a partir de ambos archivos"""
+    monkeypatch.setattr(p01, "DATA_DIR", str(tmp_path / "full"))
+    name = p01.run_simulation(30.0, 10.0, "Matsuno", "gauss", Nx=64, total_steps=150, save_every=2)
+    with xr.open_dataset(tmp_path / "full" / f"{name}_numerical.nc") as num, \
+            xr.open_dataset(tmp_path / "full" / f"{name}_analytical.nc") as ana:
+        expected = compute_metrics(num.conc_unids.values, ana.conc_unids.values, p01.DX)
+        for key, values in expected.items():
+            assert np.allclose(num[key].values, values)
+        assert num.err_l2.attrs["units"] == METRICS["err_l2"]["units"]
+
+    monkeypatch.setattr(p01, "DATA_DIR", str(tmp_path / "lean"))
+    p01.run_simulation(30.0, 10.0, "Matsuno", "gauss", Nx=64, total_steps=150, save_every=2,
+                       write_analytical=False)
+    assert not os.path.exists(tmp_path / "lean" / f"{name}_analytical.nc")
+    with xr.open_dataset(tmp_path / "lean" / f"{name}_numerical.nc") as lean:
+        for key, values in expected.items():
+            assert np.allclose(lean[key].values, values)
+
+def test_sweep_diagnostics_without_analytical():
+    """El barrido calcula las series por miembro y puede omitir el campo analítico"""
+    members = build_members([30.0, 45.0], [5.0], ["gauss", "rectg"])
+    full = run_sweep("Euler Backward", members, 10, 500, Nx=64, save_every=4)
+    lean = run_sweep("Euler Backward", members, 10, 500, Nx=64, save_every=4, analytical=False)
+
+    assert "conc_analytical" not in lean
+    assert lean.err_linf.dims == ("member", "step")
+    expected = compute_metrics(full.conc_unids.values, full.conc_analytical.values, 500)
+    assert np.allclose(lean.err_linf.values, expected["err_linf"])
+    assert np.allclose(full.mass.values, expected["mass"])
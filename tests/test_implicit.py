@@ -0,0 +1,39 @@
+import numpy as np
+import pytest
+from src.implicit import crank_nicolson_solver, get_solver
+
+def _dense_crank_nicolson(cfl, Nx):
+    a = 0.25 * cfl
+    A = np.eye(Nx)
+    idx = np.arange(Nx)
+    A[idx, (idx + 1) % Nx] += a
+    A[idx, (idx - 1) % Nx] -= a
+    return A
+
+@pytest.mark.parametrize("kind", ["banded", "fft"])
+@pytest.mark.parametrize("cfl", [0.5, 4.0])
+def test_solver_matches_dense(kind, cfl):
+    """Verifica los solvers cíclico y circulante contra una resolución densa"""
+    if kind == "banded":
+        pytest.importorskip("scipy")
+    Nx = 101
+    rhs = np.random.default_rng(1).standard_normal((3, Nx))
+    expected = np.linalg.solve(_dense_crank_nicolson(cfl, Nx), rhs.T).T
+    solver = crank_nicolson_solver(cfl, Nx, kind)
+
+    assert np.allclose(solver.solve(rhs), expected, atol=1e-12)
+    assert np.allclose(solver.solve(rhs[0]), expected[0], atol=1e-12)
+
+def test_factorization_is_cached():
+    """Verifica que la factorización se reutiliza para el mismo (CFL, Nx)"""
+    assert crank_nicolson_solver(1.5, 64, "fft") is crank_nicolson_solver(1.5, 64, "fft")
+    assert crank_nicolson_solver(1.5, 64, "fft") is not crank_nicolson_solver(1.2, 64, "fft")
+
+@pytest.mark.parametrize("kind", ["banded", "fft"])
+@pytest.mark.parametrize("coefs", [(-0.5, 1.0, -0.5), (0.5, 0.0, -0.5)], ids=["filas-suman-cero", "diagonal-nula"])
+def test_singular_system_raises(kind, coefs):
+    """Un sistema singular lanza LinAlgError en lugar de devolver NaN"""
+    if kind == "banded":
+        pytest.importorskip("scipy")
+    with pytest.raises(np.linalg.LinAlgError):
+        get_solver(*coefs, 16, kind)
@@ -0,0 +1,61 @@
+import json
+import time
+import pytest
+import p01_run_simulation as p01
+from src import instrumentation
+
+@pytest.fixture
+def enabled():
+    instrumentation.reset()
+    instrumentation.enable()
+    yield
+    instrumentation.disable()
+    instrumentation.reset()
+
+def test_disabled_records_nothing():
+    """Apagada, `stage` es un contexto vacío compartido y no se acumula nada"""
+    instrumentation.reset()
+    assert not instrumentation.is_enabled()
+    assert instrumentation.stage("a") is instrumentation.stage("b", steps=3)
+    with instrumentation.stage("a", steps=3):
+        pass
+    instrumentation.count("a", bytes=10)
+    assert instrumentation.report()["stages"] == {}
+
+def test_stages_counters_and_rates(enabled):
+    """Las etapas suman llamadas, tiempo y contadores, y derivan pasos/s"""
+    @instrumentation.timed()
+    def work():
+        with instrumentation.stage("inner", steps=50):
+            time.sleep(0.01)
+
+    work()
+    work()
+    instrumentation.count("inner", bytes=1000)
+    stages = instrumentation.report()["stages"]
+    assert list(stages) == ["work", "inner"]
+    inner = stages["inner"]
+    assert inner["calls"] == 2 and inner["steps"] == 100 and inner["bytes"] == 1000
+    assert stages["work"]["seconds"] >= inner["seconds"] >= 0.02
+    assert inner["steps_per_second"] == pytest.approx(100 / inner["seconds"])
+    assert inner["peak_rss_bytes"] > 0
+    assert "inner" in instrumentation.format_report()
+
+def test_write_report_json(enabled, tmp_path):
+    """El reporte se guarda como JSON legible"""
+    with instrumentation.stage("x", frames=4):
+        pass
+    path = instrumentation.write_report(tmp_path / "sub" / "profile.json")
+    with open(path) as f:
+        data = json.load(f)
+    assert data["stages"]["x"]["frames"] == 4
+    assert data["max_rss_bytes"] > 0
+
+def test_run_simulation_breakdown(enabled, tmp_path, monkeypatch):
+    """Una corrida instrumentada desglosa simulación, diagnósticos y escritura"""
+    monkeypatch.setattr(p01, "DATA_DIR", str(tmp_path))
+    p01.run_simulation(30.0, 10.0, "RK4", "gauss", Nx=64, total_steps=40, save_every=4)
+    stages = instrumentation.report()["stages"]
+    assert stages["simulate"]["steps"] == 40
+    assert stages["netcdf_write"]["bytes"] > 0
+    assert {"run_simulation", "analytical_solution", "diagnostics"} <= set(stages)
@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+from src import kernels
+from src.schemes import get_scheme
+
+JIT_SCHEMES = ["Euler Backward", "Leapfrog", "Leapfrog4", "Matsuno", "RK4"]
+
+@pytest.mark.parametrize("dtype", ["float64", "float32"])
+@pytest.mark.parametrize("cfl", [0.5, np.array([0.2, 0.5, 0.7])], ids=["single", "batched"])
+@pytest.mark.parametrize("method", JIT_SCHEMES)
+def test_jit_matches_numpy(method, cfl, dtype):
+    """Los núcleos compilados reproducen bit a bit al backend NumPy, paso a paso y en bloques"""
+    pytest.importorskip("numba")
+    Nx = 101
+    C0 = np.exp(-((np.arange(Nx) - 50) / 5.0) ** 2) * np.ones((np.size(cfl), 1))
+    results = {}
+    for backend in ("numpy", "jit"):
+        scheme = get_scheme(method)(cfl, Nx, dtype, backend)
+        assert scheme.backend == backend
+        scheme.initialize(C0.squeeze())
+        states = [scheme.step().copy() for _ in range(2)]
+        states += [scheme.step_n(n).copy() for n in (7, 3, 5)]
+        results[backend] = (states, scheme.state())
+    for expected, actual in zip(*(results[b][0] for b in ("numpy", "jit"))):
+        assert actual.dtype == np.dtype(dtype)
+        assert np.array_equal(actual, expected)
+    numpy_state, jit_state = results["numpy"][1], results["jit"][1]
+    assert numpy_state.keys() == jit_state.keys()
+    assert all(np.array_equal(numpy_state[k], jit_state[k]) for k in numpy_state)
+
+def test_jit_restore_continues_exactly():
+    """Un estado guardado con un backend se reanuda con el otro sin diferencias"""
+    pytest.importorskip("numba")
+    C0 = np.exp(-((np.arange(64) - 32) / 4.0) ** 2)
+    reference = get_scheme("Leapfrog")(0.6, 64)
+    reference.initialize(C0)
+    state = (reference.step_n(10), reference.state())[1]
+    expected = reference.step_n(11).copy()
+    resumed = get_scheme("Leapfrog")(0.6, 64, backend="jit")
+    resumed.restore(state)
+    assert np.array_equal(resumed.step_n(11), expected)
+
+def test_sweep_jit_matches_numpy():
+    """El barrido con núcleos compilados da el mismo dataset que con NumPy"""
+    pytest.importorskip("numba")
+    from src.sweep import build_members, run_sweep
+    members = build_members([30.0, 45.0, 60.0], [10.0], ["gauss"])
+    numpy_ds = run_sweep("RK4", members, 10, 500, Nx=64, save_every=4)
+    jit_ds = run_sweep("RK4", members, 10, 500, Nx=64, save_every=4, backend="jit")
+    assert np.array_equal(numpy_ds.conc_unids.values, jit_ds.conc_unids.values)
+
+def test_backend_fallback_without_numba(monkeypatch):
+    """Sin numba 'jit' cae a NumPy con un aviso; un backend desconocido es un error"""
+    monkeypatch.setattr(kernels, "numba", None)
+    with pytest.warns(RuntimeWarning, match="numba"):
+        scheme = get_scheme("RK4")(0.5, 32, backend="jit")
+    assert scheme.backend == "numpy"
+    assert not kernels.jit_available()
+    with pytest.raises(ValueError, match="Backend"):
+        get_scheme("RK4")(0.5, 32, backend="cuda")
+
+def test_crank_nicolson_uses_numpy():
+    """Crank-Nicolson no tiene núcleo compilado y se queda en NumPy"""
+    pytest.importorskip("numba")
+    assert get_scheme("CN")(0.5, 32, backend="jit").backend == "numpy"
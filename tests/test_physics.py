@@ -1,5 +1,7 @@
+import pytest
 import numpy as np
-from src.physics import gauss, euler_backward_step
+from src.physics import gauss, euler_backward_step, EulerBackwardStepper, analytical_solution, analytical_blocks
+from src.kernels import jit_available
 
 def test_gauss(sample_parameters):
     """Verifica que gauss() devuelve valores positivos y el máximo en 51*dx"""
@@ -18,3 +20,59 @@ def test_euler_backward_conservation(sample_parameters):
     Cnp1 = euler_backward_step(Cn, p['u'], p['dt'], p['dx'], p['Nx'])
     
     assert np.isclose(Cn.sum(), Cnp1.sum(), rtol=1e-3)
+
+def _euler_backward_loop(Cn, u, dt, dx, Nx):
+    """Implementación original celda a celda, usada como referencia."""
+    Cnp1 = np.zeros_like(Cn, dtype=float)
+    for j in range(Nx):
+        Cnp1[j] = Cn[j] - (u * dt / dx) * (Cn[j] - Cn[j-1])
+    return Cnp1
+
+def test_euler_backward_matches_loop(sample_parameters):
+    """Verifica que la versión vectorizada es idéntica bit a bit al bucle original"""
+    p = sample_parameters
+    Cn = np.random.default_rng(0).standard_normal(p['Nx'])
+    expected = _euler_backward_loop(Cn, p['u'], p['dt'], p['dx'], p['Nx'])
+    result = euler_backward_step(Cn, p['u'], p['dt'], p['dx'], p['Nx'])
+
+    assert np.array_equal(result, expected)
+
+def test_stepper_step_n(sample_parameters):
+    """Verifica que step_n reproduce n pasos individuales sin modificar la entrada"""
+    p = sample_parameters
+    Cn = np.array([gauss(e*p['dx'], 0, p['nr'], p['u'], p['dx'], p['Nx'])
+                  for e in range(p['Nx'])])
+    C0 = Cn.copy()
+    expected = Cn
+    for _ in range(25):
+        expected = _euler_backward_loop(expected, p['u'], p['dt'], p['dx'], p['Nx'])
+    stepper = EulerBackwardStepper(p['u'], p['dt'], p['dx'], p['Nx'])
+
+    assert np.array_equal(stepper.step_n(Cn, 25), expected)
+    assert np.array_equal(Cn, C0)
+
+@pytest.mark.skipif(not jit_available(), reason="numba no está instalado")
+@pytest.mark.parametrize("n", [24, 25])
+def test_stepper_step_n_jit(sample_parameters, n):
+    """Con backend='jit' los n pasos corren en un llamado compilado con el mismo resultado"""
+    p = sample_parameters
+    Cn = np.array([gauss(e*p['dx'], 0, p['nr'], p['u'], p['dx'], p['Nx'])
+                  for e in range(p['Nx'])])
+    expected = EulerBackwardStepper(p['u'], p['dt'], p['dx'], p['Nx']).step_n(Cn, n).copy()
+    stepper = EulerBackwardStepper(p['u'], p['dt'], p['dx'], p['Nx'], backend="jit")
+    assert np.array_equal(stepper.step_n(Cn, n), expected)
+
+def test_analytical_solution_field(sample_parameters):
+    """Verifica que el campo (Nt, Nx) vectorizado coincide con la evaluación punto a punto"""
+    p = sample_parameters
+    X = np.arange(p['Nx']) * p['dx']
+    T = np.arange(12) * p['dt']
+    expected = np.array([[analytical_solution(x, t, p['u'], p['dx'], p['Nx'], "gauss", p['nr'])
+                          for x in X] for t in T])
+    field = analytical_solution(X, T, p['u'], p['dx'], p['Nx'], "gauss", p['nr'])
+    blocks = [block for _, block in analytical_blocks(X, T, p['u'], p['dx'], p['Nx'],
+                                                      "gauss", p['nr'], block_size=5)]
+
+    assert field.shape == (12, p['Nx'])
+    assert np.array_equal(field, expected)
+    assert np.array_equal(np.concatenate(blocks), expected)
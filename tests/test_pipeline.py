@@ -0,0 +1,88 @@
+import os
+import shutil
+import pytest
+from src.pipeline import Task, topological_order, run, summary
+
+def _copy_graph(tmp_path, seed_text="semilla"):
+    """a <- semilla, b <- a (depende de a), c <- semilla (independiente)"""
+    seed = tmp_path / "seed.txt"
+    if not seed.exists():
+        seed.write_text(seed_text)
+    def copy(name, src, deps=()):
+        dst = str(tmp_path / f"{name}.txt")
+        return Task(name, shutil.copyfile, {"src": str(src), "dst": dst}, deps, [dst])
+    return [copy("b", tmp_path / "a.txt", ["a"]), copy("a", seed), copy("c", seed)]
+
+def test_topological_order_and_errors():
+    """Las dependencias quedan antes; ciclos, repetidos y dependencias desconocidas son errores"""
+    tasks = [Task("c", print, deps=["b"]), Task("b", print, deps=["a"]), Task("a", print)]
+    assert [t.name for t in topological_order(tasks)] == ["a", "b", "c"]
+    with pytest.raises(ValueError, match="Ciclo"):
+        topological_order([Task("a", print, deps=["b"]), Task("b", print, deps=["a"])])
+    with pytest.raises(ValueError, match="inexistentes"):
+        topological_order([Task("a", print, deps=["z"])])
+    with pytest.raises(ValueError, match="repetida"):
+        topological_order([Task("a", print), Task("a", print)])
+
+def test_parallel_run_skips_up_to_date(tmp_path):
+    """Con un pool las tareas corren respetando dependencias; lo vigente se omite después"""
+    stamps = str(tmp_path / "stamps")
+    status = run(_copy_graph(tmp_path), workers=2, stamp_dir=stamps, verbose=False)
+    assert status == {"a": "done", "b": "done", "c": "done"}
+    assert (tmp_path / "b.txt").read_text() == "semilla"
+    assert summary(run(_copy_graph(tmp_path), stamp_dir=stamps, verbose=False)) == {"skipped": 3}
+
+    # Una salida borrada repite esa tarea y las que dependen de ella
+    os.remove(tmp_path / "a.txt")
+    status = run(_copy_graph(tmp_path), stamp_dir=stamps, verbose=False)
+    assert status == {"a": "done", "b": "done", "c": "skipped"}
+    # Parámetros distintos invalidan el sello aunque las salidas existan
+    tasks = _copy_graph(tmp_path)
+    tasks[2].params = {"version": 2}
+    assert run(tasks, stamp_dir=stamps, verbose=False)["c"] == "done"
+
+def test_failure_blocks_dependents_only(tmp_path):
+    """Una tarea fallida bloquea a sus dependientes; las independientes terminan"""
+    tasks = _copy_graph(tmp_path)
+    tasks[1].kwargs["src"] = str(tmp_path / "no_existe.txt")
+    status = run(tasks, workers=2, stamp_dir=str(tmp_path / "stamps"), verbose=False)
+    assert status == {"a": "failed", "b": "blocked", "c": "done"}
+
+def test_pipeline_end_to_end(tmp_path, monkeypatch):
+    """p04 arma simulate -> render -> animate por configuración y la segunda corrida no repite nada"""
+    import p01_run_simulation as p01
+    import p04_run_pipeline as p04
+    monkeypatch.setattr(p01, "OUTPUTS_DIR", str(tmp_path))
+    monkeypatch.setattr(p01, "DATA_DIR", str(tmp_path / "data"))
+    configs = p01.build_configs(["Euler Backward", "RK4"], [30.0], [10.0], ["gauss"], [32])
+    tasks = p04.build_tasks(configs, total_steps=4, save_every=2)
+    assert len(tasks) == 6
+    assert [t.name.split(":")[0] for t in topological_order(tasks)][:3] == ["simulate", "render", "animate"]
+    assert len(p04.build_tasks(configs, stream=True, data_types=("numerical", "analytical"))) == 6
+    assert len(p04.build_tasks(configs, until="simulate")) == 2
+
+    stamps = str(tmp_path / "stamps")
+    assert summary(run(tasks, stamp_dir=stamps, verbose=False)) == {"done": 6}
+    assert sorted(os.listdir(tmp_path / "animations")) == [
+        "EulerBackward_dt30.0_profilegauss_nr10.0_nx32_numerical_cropped.gif",
+        "RK4_dt30.0_profilegauss_nr10.0_nx32_numerical_cropped.gif"]
+    assert summary(run(tasks, stamp_dir=stamps, verbose=False)) == {"skipped": 6}
+
+def test_batched_sweep_tasks(tmp_path, monkeypatch):
+    """--batched: una tarea por método y Nx con todos los miembros en un solo archivo"""
+    import p01_run_simulation as p01
+    import p04_run_pipeline as p04
+    monkeypatch.setattr(p01, "DATA_DIR", str(tmp_path / "data"))
+    tasks = p04.build_sweep_tasks(["Euler Backward", "RK4"], [30.0, 40.0], [2.0, 10.0], ["gauss"],
+                                  [32], total_steps=4)
+    assert [t.name for t in tasks] == [
+        "sweep:EulerBackward_sweep_dt30.0-40.0_dx500_profilegauss_4members_nx32",
+        "sweep:RK4_sweep_dt30.0-40.0_dx500_profilegauss_4members_nx32"]
+
+    stamps = str(tmp_path / "stamps")
+    assert summary(run(tasks, stamp_dir=stamps, verbose=False)) == {"done": 2}
+    assert all(os.path.exists(t.outputs[0]) for t in tasks)
+    assert summary(run(tasks, stamp_dir=stamps, verbose=False)) == {"skipped": 2}
+    # Otro miembro cambia la clave del barrido completo
+    wider = p04.build_sweep_tasks(["RK4"], [30.0, 40.0], [2.0, 10.0], ["gauss"], [32], total_steps=8)
+    assert wider[0].name == tasks[1].name and wider[0].key() != tasks[1].key()
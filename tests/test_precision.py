@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+import xarray as xr
+import p01_run_simulation as p01
+from src.data_handling import EncodingPolicy
+from src.diagnostics import compute_metrics
+from src.sweep import build_members, run_sweep
+
+@pytest.mark.parametrize("method", ["Euler Backward", "Leapfrog", "Crank-Nicolson", "RK4"])
+def test_float32_drift_vs_float64(method):
+    """Cuantifica la deriva de una corrida larga en simple precisión respecto a doble"""
+    members = build_members([30.0, 45.0], [10.0], ["gauss"])
+    reference = run_sweep(method, members, 10, 500, Nx=101, total_steps=5001, save_every=500)
+    single = run_sweep(method, members, 10, 500, Nx=101, total_steps=5001, save_every=500,
+                       dtype="float32")
+
+    assert single.conc_unids.dtype == np.float32
+    assert single.conc_analytical.dtype == np.float32
+    assert single.mass.dtype == np.float64
+    # Amplitud 10: deriva del campo < 1e-4 relativa tras 5000 pasos
+    assert np.abs(single.conc_unids.values - reference.conc_unids.values).max() < 1e-3
+    mass0 = reference.mass.isel(step=0)
+    assert (np.abs(single.mass - reference.mass) / mass0).max() < 1e-5
+    assert np.allclose(single.err_l2, reference.err_l2, atol=1e-4)
+
+def test_float64_accumulation_of_float32_field():
+    """Las sumas en float64 de un campo float32 no pierden precisión con Nx grande"""
+    rng = np.random.default_rng(1)
+    C = rng.uniform(0, 10, size=(4, 200_000)).astype(np.float32)
+    exact = C.astype(np.float64).sum(axis=-1) * 500
+
+    accumulated = compute_metrics(C, np.zeros_like(C), 500)
+    single = compute_metrics(C, np.zeros_like(C), 500, dtype="float32")
+    assert np.allclose(accumulated["mass"], exact, rtol=1e-12, atol=0)
+    assert single["mass"].dtype == np.float32
+    assert np.allclose(single["mass"], exact, rtol=1e-5)
+
+def test_float32_run_writes_single_precision(tmp_path, monkeypatch):
+    """Una corrida float32 guarda en float32 con su propio nombre de archivo"""
+    monkeypatch.setattr(p01, "DATA_DIR", str(tmp_path))
+    name = p01.run_simulation(30.0, 10.0, "RK4", "gauss", Nx=64, total_steps=40,
+                              policy=EncodingPolicy(dtype="float32"), dtype="float32")
+    double = p01.run_simulation(30.0, 10.0, "RK4", "gauss", Nx=64, total_steps=40)
+    assert name == f"{double}_float32"
+    with xr.open_dataset(tmp_path / f"{name}_numerical.nc") as ds, \
+            xr.open_dataset(tmp_path / f"{double}_numerical.nc") as ref:
+        assert ds.conc_unids.dtype == np.float32
+        assert ds.attrs["compute_dtype"] == "float32"
+        assert np.allclose(ds.err_linf, ref.err_linf, atol=1e-4)
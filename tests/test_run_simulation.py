@@ -0,0 +1,63 @@
+import os
+import numpy as np
+import xarray as xr
+import p01_run_simulation as p01
+
+def test_parallel_matches_serial(tmp_path, monkeypatch):
+    """Verifica que el pool de procesos produce los mismos archivos que la corrida serial"""
+    parallel_dir, serial_dir = tmp_path / "parallel", tmp_path / "serial"
+    monkeypatch.setattr(p01, "DATA_DIR", str(parallel_dir))
+    configs = p01.build_configs(["Euler Backward", "Matsuno"], [30.0], [10.0], ["gauss"], [101, 64])
+    names = p01.run_parallel(configs, workers=2)
+
+    assert len(names) == 4
+    monkeypatch.setattr(p01, "DATA_DIR", str(serial_dir))
+    serial = p01.run_simulation(30.0, 10.0, "Matsuno", "gauss", Nx=64)
+    assert serial == names[3]
+    serial_ds = xr.open_dataset(os.path.join(serial_dir, f"{serial}_numerical.nc"))
+    parallel_ds = xr.open_dataset(os.path.join(parallel_dir, f"{names[3]}_numerical.nc"))
+    assert np.array_equal(serial_ds.conc_unids.values, parallel_ds.conc_unids.values)
+    assert np.allclose(serial_ds.err_linf.values, parallel_ds.err_linf.values)
+
+def test_restart_matches_uninterrupted_run(tmp_path, monkeypatch):
+    """Una corrida interrumpida y reanudada desde el checkpoint da el mismo archivo"""
+    import pytest
+    from src.data_handling import StreamingWriter
+    monkeypatch.setattr(p01, "CHECKPOINT_DIR", str(tmp_path / "checkpoints"))
+    monkeypatch.setattr(p01, "DATA_DIR", str(tmp_path / "reference"))
+    name = p01.run_simulation(30.0, 10.0, "Leapfrog", "gauss", Nx=64, total_steps=50, save_every=3)
+    with xr.open_dataset(tmp_path / "reference" / f"{name}_numerical.nc") as ds:
+        expected = ds.load()
+
+    # Simula una caída en el paso 35 (después del checkpoint del paso 30)
+    monkeypatch.setattr(p01, "DATA_DIR", str(tmp_path / "restart"))
+    append = StreamingWriter.append
+    def crash(self, field, t):
+        if t >= 35 * 30.0 and "numerical" in self.path:
+            raise KeyboardInterrupt
+        append(self, field, t)
+    monkeypatch.setattr(StreamingWriter, "append", crash)
+    with pytest.raises(KeyboardInterrupt):
+        p01.run_simulation(30.0, 10.0, "Leapfrog", "gauss", Nx=64, total_steps=50, save_every=3,
+                           checkpoint_every=10)
+    monkeypatch.setattr(StreamingWriter, "append", append)
+
+    p01.run_simulation(30.0, 10.0, "Leapfrog", "gauss", Nx=64, total_steps=50, save_every=3,
+                       checkpoint_every=10, restart=True)
+    with xr.open_dataset(tmp_path / "restart" / f"{name}_numerical.nc") as ds:
+        assert np.array_equal(ds.time.values, expected.time.values)
+        assert np.array_equal(ds.conc_unids.values, expected.conc_unids.values)
+        assert np.array_equal(ds.err_l2.values, expected.err_l2.values)
+    assert not os.listdir(tmp_path / "checkpoints")  # se elimina al terminar
+
+def test_run_simulation_2d(tmp_path, monkeypatch):
+    """La corrida 2-D escribe campos (time, Y, X) y rechaza un Courant inestable"""
+    import pytest
+    monkeypatch.setattr(p01, "DATA_DIR", str(tmp_path))
+    name = p01.run_simulation_2d(25.0, None, "cone", "rotation", Nx=32, Ny=24, total_steps=10)
+    with xr.open_dataset(tmp_path / f"{name}_numerical.nc") as ds:
+        assert ds.conc_unids.shape == (10, 24, 32)
+        assert ds.attrs["method"] == "Upwind 2D split"
+    assert (tmp_path / f"{name}_analytical.nc").exists()
+    with pytest.raises(ValueError, match="Courant"):
+        p01.run_simulation_2d(100.0, None, "cone", "rotation", Nx=32)
@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+from src.physics import gauss, euler_backward_step
+from src.schemes import get_scheme, available_schemes
+
+def test_registry_aliases():
+    """Verifica que los nombres usados en la CLI resuelven al esquema correcto"""
+    assert get_scheme("Euler Backward") is get_scheme("EulerBackward")
+    assert get_scheme("LFo4").name == "Leapfrog4"
+    assert len(available_schemes()) == 6
+    with pytest.raises(ValueError):
+        get_scheme("Adams-Bashforth")
+
+def test_euler_backward_scheme_matches_step(sample_parameters):
+    """Verifica que el esquema registrado reproduce euler_backward_step"""
+    p = sample_parameters
+    Cn = np.array([gauss(e*p['dx'], 0, p['nr'], p['u'], p['dx'], p['Nx'])
+                  for e in range(p['Nx'])])
+    scheme = get_scheme("Euler Backward")(p['u'] * p['dt'] / p['dx'], p['Nx'])
+    scheme.initialize(Cn)
+    expected = Cn
+    for _ in range(10):
+        expected = euler_backward_step(expected, p['u'], p['dt'], p['dx'], p['Nx'])
+
+    assert np.array_equal(scheme.step_n(10), expected)
+
+@pytest.mark.parametrize("name", available_schemes())
+def test_schemes_conserve_mass_and_stay_bounded(name):
+    """Verifica conservación de masa y estabilidad por debajo del CFL límite"""
+    Nx = 128
+    x = np.arange(Nx)
+    C0 = 10 * np.exp(-((x - 64) / 10.0) ** 2)
+    cls = get_scheme(name)
+    scheme = cls(min(0.5, cls.stability_limit), Nx)
+    scheme.initialize(C0)
+    C = scheme.step_n(4 * Nx)
+
+    assert np.isclose(C.sum(), C0.sum(), rtol=1e-10)
+    assert np.abs(C).max() < 12
+
+@pytest.mark.parametrize("method", ["Leapfrog", "Leapfrog4", "RK4", "Crank-Nicolson"])
+def test_state_restore_continues_exactly(method):
+    """Restaurar state() en un esquema nuevo continúa la integración de forma idéntica"""
+    Nx, cfl = 50, 0.5
+    C0 = np.exp(-0.5 * ((np.arange(Nx) - 25) / 4.0) ** 2)
+    scheme = get_scheme(method)(cfl, Nx)
+    scheme.initialize(C0)
+    scheme.step_n(7)
+    state = scheme.state()
+    expected = scheme.step_n(5).copy()
+
+    other = get_scheme(method)(cfl, Nx)
+    other.restore(state)
+    assert other.nstep == 7
+    assert np.array_equal(other.step_n(5), expected)
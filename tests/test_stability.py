@@ -0,0 +1,40 @@
+import numpy as np
+import pytest
+from src.schemes import get_scheme, available_schemes
+from src.stability import amplification_grid, check_stability, max_amplification, stability_limit
+
+@pytest.mark.parametrize("method", available_schemes())
+def test_numerical_limit_matches_declared(method):
+    """El límite hallado por Von Neumann coincide con `stability_limit` del esquema"""
+    declared = get_scheme(method).stability_limit
+    found = stability_limit(method)
+    if np.isinf(declared):
+        assert np.isinf(found)
+    else:
+        assert found == pytest.approx(declared, abs=1e-3)
+
+@pytest.mark.parametrize("method", available_schemes())
+def test_amplification_matches_one_step(method):
+    """El factor λ del modo físico es lo que el esquema hace con un modo de Fourier"""
+    Nx, m, cfl = 64, 5, 0.4
+    kdx = 2 * np.pi * m / Nx
+    mode = np.exp(1j * kdx * np.arange(Nx))
+    lam = get_scheme(method).amplification(cfl, kdx)[0]
+    out = []
+    for part in (np.real, np.imag):
+        scheme = get_scheme(method)(cfl, Nx)
+        # Los esquemas de dos niveles arrancan desde el nivel n-1 del modo físico
+        scheme.restore({"nstep": 1, "current": part(mode), "previous": part(mode / lam)})
+        out.append(scheme.step().copy())
+    assert np.allclose((out[0] + 1j * out[1]) / mode, lam)
+
+def test_grid_and_check():
+    """La malla (CFL, kΔx) se evalúa de una vez y la revisión detecta inestabilidad"""
+    grid = amplification_grid("RK4", np.linspace(0.1, 3.0, 30))
+    assert grid.modulus.shape == (30, len(grid.kdx))
+    assert (grid.modulus.sel(CFL=grid.CFL[grid.CFL < 2.8]) <= 1 + 1e-9).all()
+    assert np.allclose(max_amplification("EB", [0.5, 1.0, 1.2]), [1.0, 1.0, 1.4])
+    check = check_stability("Leapfrog4", 0.8, steps=100)
+    assert not check["stable"] and check["growth"] > 1e10
+    assert check_stability("Crank-Nicolson", 50.0)["stable"]
+    assert check_stability("EB", 3.0, steps=10 ** 6)["growth"] == np.inf
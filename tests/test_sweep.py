@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+import xarray as xr
+from src.schemes import get_scheme
+from src.sweep import build_members, parse_values, run_sweep, write_sweep
+
+def test_parse_values():
+    """Verifica rangos inclusivos y listas separadas por comas"""
+    assert parse_values("30:60:5") == [30, 35, 40, 45, 50, 55, 60]
+    assert parse_values("2,10") == [2.0, 10.0]
+    assert parse_values("gauss,rectg", str) == ["gauss", "rectg"]
+
+def test_build_members():
+    """Verifica que rectg aporta un único miembro por dt"""
+    members = build_members([30, 40], [2, 10], ["gauss", "rectg"])
+    assert len(members) == 6
+    assert sum(m["profile"] == "rectg" for m in members) == 2
+
+@pytest.mark.parametrize("method", ["Euler Backward", "Leapfrog", "Crank-Nicolson"])
+def test_sweep_matches_individual_runs(method):
+    """Verifica que el lote reproduce cada corrida individual"""
+    members = build_members([30, 50], [10], ["gauss", "rectg"])
+    ds = run_sweep(method, members, u=10, dx=500, Nx=101, total_steps=20)
+
+    for i, m in enumerate(members):
+        scheme = get_scheme(method)(10 * m["dt"] / 500, 101)
+        scheme.initialize(ds.conc_unids.values[i, 0])
+        assert np.allclose(scheme.step_n(19), ds.conc_unids.values[i, -1], atol=1e-12)
+    assert ds.conc_unids.dims == ("member", "step", "X")
+
+def test_write_sweep_matches_in_memory(tmp_path):
+    """El barrido escrito por bloques coincide con el resultado en memoria"""
+    members = build_members([30, 50], [5, 10], ["gauss", "rectg"])
+    ds = run_sweep("RK4", members, u=10, dx=500, Nx=64, total_steps=50, save_every=3, block_steps=4)
+    writer = write_sweep("barrido", "RK4", members, u=10, dx=500, Nx=64, total_steps=50,
+                         save_every=3, output_dir=str(tmp_path), block_steps=5)
+
+    with xr.open_dataset(writer.path) as disk:
+        assert set(disk.data_vars) == set(ds.data_vars)
+        for name in ds.data_vars:
+            assert disk[name].dims == ds[name].dims
+            assert np.allclose(disk[name].values, ds[name].values, equal_nan=True)
+        for name in ("dt", "nr", "CFL", "profile", "time"):
+            assert np.array_equal(disk[name].values, ds[name].values, equal_nan=name == "nr")
+        assert disk.attrs["data_type"] == "sweep"
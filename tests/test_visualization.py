@@ -5,3 +5,27 @@ def test_custom_colormap():
     """Verifica que el colormap personalizado tiene línea negra"""
     cmap = create_custom_colormap()
     assert cmap(0.5) == (0, 0, 0, 1)  # RGBA para negro en el centro
+
+def test_surface_renderer_reuse(tmp_path):
+    """Reutilizar la figura entre cuadros da la misma imagen que una figura nueva"""
+    import numpy as np
+    import xarray as xr
+    from matplotlib.image import imread
+    from src.visualization import SurfaceRenderer
+    matplotlib.use("Agg")
+
+    def frame(shift):
+        conc = np.roll(np.exp(-0.5 * ((np.arange(20) - 10) / 2.0) ** 2) * 20, shift)
+        return xr.Dataset({"conc_unids": (["Y", "X"], np.vstack([conc, conc]))},
+                          coords={"X": np.arange(20), "Y": [-0.5, 0.5]})
+
+    reused = SurfaceRenderer("test")
+    reused.draw(frame(0), 0, 30.0, 0.6)
+    reused.draw(frame(5), 1, 30.0, 0.6)
+    reused.save(tmp_path / "reused.png", dpi=50)
+    reused.close()
+    fresh = SurfaceRenderer("test")
+    fresh.draw(frame(5), 1, 30.0, 0.6)
+    fresh.save(tmp_path / "fresh.png", dpi=50)
+    fresh.close()
+    assert np.array_equal(imread(tmp_path / "reused.png"), imread(tmp_path / "fresh.png"))